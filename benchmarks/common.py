@@ -0,0 +1,202 @@
+"""
+Utilidades compartidas por los benchmarks: medios sintéticos (lavfi),
+medición con percentiles, informe JSON y comparación contra una línea base.
+"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+DEFAULT_TOLERANCE = 0.15  # +15% sobre la línea base = regresión
+PERCENTILES = (50, 90, 95, 99)
+
+
+# ----------------------------------------------------------------------
+# Synthetic media
+# ----------------------------------------------------------------------
+def ffmpeg_exe():
+    # Import diferido: ffmpeg_utils está en el árbol de la app
+    from src.infrastructure.ffmpeg_utils import FFmpegUtils
+    return FFmpegUtils.get_ffmpeg_path()
+
+
+def synth_video(media_dir, width, height, seconds=10, fps=30, gop=30, audio=True):
+    """
+    testsrc2 + sine as H.264/AAC. Generated once per parameter set and reused
+    from `media_dir` afterwards.
+    """
+    os.makedirs(media_dir, exist_ok=True)
+    name = f"testsrc_{width}x{height}_{fps}fps_{seconds}s_g{gop}{'_a' if audio else ''}.mp4"
+    path = os.path.join(media_dir, name)
+    if os.path.exists(path):
+        return path
+
+    cmd = [ffmpeg_exe(), '-v', 'error', '-y',
+           '-f', 'lavfi', '-i', f'testsrc2=size={width}x{height}:rate={fps}:duration={seconds}']
+    if audio:
+        cmd += ['-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate=44100:duration={seconds}']
+    cmd += ['-c:v', 'libx264', '-preset', 'ultrafast', '-g', str(gop), '-pix_fmt', 'yuv420p']
+    if audio:
+        cmd += ['-c:a', 'aac', '-ac', '2', '-shortest']
+    part = path + ".part.mp4"
+    cmd.append(part)
+    subprocess.check_call(cmd)
+    os.replace(part, path)
+    return path
+
+
+def synth_audio(media_dir, seconds=30):
+    """Stereo sine as WAV (no video stream)."""
+    os.makedirs(media_dir, exist_ok=True)
+    path = os.path.join(media_dir, f"sine_{seconds}s.wav")
+    if not os.path.exists(path):
+        part = path + ".part.wav"
+        subprocess.check_call([
+            ffmpeg_exe(), '-v', 'error', '-y',
+            '-f', 'lavfi', '-i', f'sine=frequency=440:sample_rate=44100:duration={seconds}',
+            '-ac', '2', part])
+        os.replace(part, path)
+    return path
+
+
+# ----------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------
+def summarize(samples_ms, **extra):
+    """Percentile summary of a list of millisecond samples."""
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    result = {
+        "unit": "ms",
+        "n": int(arr.size),
+        "mean": round(float(arr.mean()), 4) if arr.size else None,
+        "min": round(float(arr.min()), 4) if arr.size else None,
+        "max": round(float(arr.max()), 4) if arr.size else None,
+    }
+    for p in PERCENTILES:
+        result[f"p{p}"] = round(float(np.percentile(arr, p)), 4) if arr.size else None
+    if extra:
+        result["extra"] = extra
+    return result
+
+
+def measure(fn, iterations, warmup=2):
+    """Calls fn(i) `iterations` times after `warmup` calls. Returns ms per call."""
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    for i in range(iterations):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def machine_info():
+    info = {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        import psutil
+        info["ram_mb"] = psutil.virtual_memory().total // (1024 * 1024)
+    except Exception:
+        pass
+    return info
+
+
+def build_report(suite, results, config=None):
+    return {
+        "suite": suite,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "config": config or {},
+        "results": results,
+    }
+
+
+# ----------------------------------------------------------------------
+# Baseline
+# ----------------------------------------------------------------------
+def baseline_path(suite):
+    return os.path.join(BASELINE_DIR, f"{suite}.json")
+
+
+def save_baseline(report, path=None):
+    path = path or baseline_path(report["suite"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def compare_to_baseline(report, baseline, tolerance=DEFAULT_TOLERANCE, metrics=("p50", "p95")):
+    """
+    Returns a list of regressions: cases whose metric grew more than
+    `tolerance` over the baseline. Cases missing on either side are skipped.
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for name, current in report["results"].items():
+        base = base_results.get(name)
+        if not base:
+            continue
+        for metric in metrics:
+            cur_v, base_v = current.get(metric), base.get(metric)
+            if cur_v is None or not base_v:
+                continue
+            ratio = cur_v / base_v
+            if ratio > 1.0 + tolerance:
+                regressions.append({"case": name, "metric": metric, "baseline": base_v,
+                                    "current": cur_v, "ratio": round(ratio, 3)})
+    return regressions
+
+
+def finish(report, args):
+    """
+    Common CLI tail: write report, optionally store it as baseline, compare
+    against the stored baseline. Returns the process exit code.
+    """
+    path = args.baseline or baseline_path(report["suite"])
+    if os.path.exists(path) and not args.save_baseline:
+        with open(path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("machine", {}).get("cpu_count") != report["machine"].get("cpu_count"):
+            print("WARNING: baseline was recorded on a different machine", file=sys.stderr)
+        report["regressions"] = compare_to_baseline(report, baseline, args.tolerance)
+    else:
+        report["regressions"] = []
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.save_baseline:
+        print(f"Baseline saved: {save_baseline(report, path)}", file=sys.stderr)
+        return 0
+
+    for r in report["regressions"]:
+        print(f"REGRESSION {r['case']} {r['metric']}: {r['baseline']} -> {r['current']} ms "
+              f"(x{r['ratio']})", file=sys.stderr)
+    return 1 if report["regressions"] else 0
+
+
+def add_common_arguments(parser):
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Baseline file (default: benchmarks/baselines/<suite>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a case counts as a regression")
+    parser.add_argument("--media-dir", default=os.path.join(os.path.expanduser("~"), ".rocky", "bench_media"),
+                        help="Where synthetic media is generated and reused")
+    parser.add_argument("--quick", action="store_true", help="Reduced matrix for CI smoke runs")
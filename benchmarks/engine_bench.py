@@ -0,0 +1,162 @@
+"""
+Micro-benchmarks del core (rocky_core).
+
+    python -m benchmarks.engine_bench [--quick] [--save-baseline]
+
+Casos:
+  evaluate/<res>/<source>/<layers>L/<transform>  RockyEngine.evaluate por frame
+  render_audio/<tracks>T                         bloques de 1 s (x tiempo real)
+  decode/<res>/sequential, decode/<res>/seek     VideoSource.get_frame
+  waveform/<seconds>s                            VideoSource.get_waveform
+  resample_audio/<seconds>s                      RockyEngine.resample_audio
+"""
+import argparse
+import random
+import sys
+
+import numpy as np
+import rocky_core
+
+from .common import (add_common_arguments, build_report, finish, measure, summarize,
+                     synth_audio, synth_video)
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "2160p": (3840, 2160)}
+LAYER_COUNTS = (1, 2, 4, 8, 16)
+FPS = 30.0
+
+# (scale_x, scale_y, rotation, opacity)
+TRANSFORMS = {
+    "identity": (1.0, 1.0, 0.0, 1.0),
+    "scaled": (0.5, 0.5, 0.0, 1.0),
+    "rotated": (0.8, 0.8, 15.0, 1.0),
+    "blend": (1.0, 1.0, 0.0, 0.5),
+}
+
+
+def _layer_engine(width, height, layers, transform, source_factory):
+    engine = rocky_core.RockyEngine()
+    engine.set_fps(FPS)
+    engine.set_resolution(width, height)
+    sx, sy, rot, opacity = TRANSFORMS[transform]
+    for n in range(layers):
+        engine.add_track(rocky_core.VIDEO)
+        clip = engine.add_clip(n, f"layer{n}", 0, 100000, 0.0, source_factory(n))
+        clip.transform.scale_x = sx
+        clip.transform.scale_y = sy
+        clip.transform.rotation = rot
+        # Desplazar capas escaladas para que no se tapen exactamente
+        clip.transform.x = (n % 4) * 0.05 * width if sx < 1.0 else 0.0
+        clip.opacity = opacity
+    return engine
+
+
+def bench_evaluate(args, results):
+    resolutions = ["720p", "1080p"] if args.quick else list(RESOLUTIONS)
+    layer_counts = (1, 4) if args.quick else LAYER_COUNTS
+    frames = 10 if args.quick else args.frames
+
+    for res in resolutions:
+        width, height = RESOLUTIONS[res]
+        video_path = synth_video(args.media_dir, width, height, audio=False)
+        sources = {
+            "color": lambda n: rocky_core.ColorSource(40 + n * 12 % 200, 80, 160, 255),
+            # Un VideoSource por capa: cada capa tiene su propio decodificador
+            "video": lambda n: rocky_core.VideoSource(video_path),
+        }
+        for source_name, factory in sources.items():
+            for layers in layer_counts:
+                for transform in TRANSFORMS:
+                    if args.quick and transform not in ("identity", "rotated"):
+                        continue
+                    engine = _layer_engine(width, height, layers, transform, factory)
+                    samples = measure(lambda i: engine.evaluate(i / FPS), frames)
+                    name = f"evaluate/{res}/{source_name}/{layers}L/{transform}"
+                    results[name] = summarize(samples)
+                    print(f"{name}: p50 {results[name]['p50']:.2f} ms", file=sys.stderr)
+
+
+def bench_render_audio(args, results):
+    wav = synth_audio(args.media_dir, seconds=30)
+    for tracks in ((1, 4) if args.quick else (1, 4, 8)):
+        engine = rocky_core.RockyEngine()
+        engine.set_fps(FPS)
+        for n in range(tracks):
+            engine.add_track(rocky_core.AUDIO)
+            engine.add_clip(n, f"a{n}", 0, int(30 * FPS), 0.0, rocky_core.VideoSource(wav))
+        chunks = 10 if args.quick else 25
+        samples = measure(lambda i: engine.render_audio(float(i % 28), 1.0), chunks, warmup=1)
+        mean_s = np.mean(samples) / 1000.0
+        name = f"render_audio/{tracks}T"
+        results[name] = summarize(samples, realtime_factor=round(1.0 / max(mean_s, 1e-9), 1))
+        print(f"{name}: x{results[name]['extra']['realtime_factor']} realtime", file=sys.stderr)
+
+
+def bench_decode(args, results):
+    for res in (["1080p"] if args.quick else ["1080p", "2160p"]):
+        width, height = RESOLUTIONS[res]
+        path = synth_video(args.media_dir, width, height, seconds=10, audio=False)
+
+        src = rocky_core.VideoSource(path)
+        frames = 30 if args.quick else 150
+        seq = measure(lambda i: src.get_frame(i / FPS, width, height), frames, warmup=1)
+        results[f"decode/{res}/sequential"] = summarize(seq, decode_fps=round(1000.0 / np.mean(seq), 1))
+
+        rng = random.Random(1234)  # Semilla fija: misma secuencia de seeks en cada ejecución
+        duration = src.get_duration()
+        times = [rng.uniform(0.0, max(0.0, duration - 0.1)) for _ in range(60)]
+        src = rocky_core.VideoSource(path)
+        seek = measure(lambda i: src.get_frame(times[i % len(times)], width, height),
+                       10 if args.quick else 40, warmup=1)
+        results[f"decode/{res}/seek"] = summarize(seek)
+        print(f"decode/{res}: seq p50 {results[f'decode/{res}/sequential']['p50']:.2f} ms, "
+              f"seek p50 {results[f'decode/{res}/seek']['p50']:.2f} ms", file=sys.stderr)
+
+
+def bench_waveform(args, results):
+    seconds = 30
+    path = synth_audio(args.media_dir, seconds=seconds)
+    points = seconds * 200  # Misma densidad que WaveformWorker
+    # Fuente nueva en cada iteración: get_waveform recorre el fichero entero
+    samples = measure(lambda i: rocky_core.VideoSource(path).get_waveform(points),
+                      3 if args.quick else 8, warmup=1)
+    results[f"waveform/{seconds}s"] = summarize(samples)
+
+
+def bench_resample(args, results):
+    for seconds in (10, 600):
+        data = np.random.default_rng(0).standard_normal(seconds * 44100 * 2).astype(np.float32)
+        samples = measure(lambda i: rocky_core.RockyEngine.resample_audio(data, 4000),
+                          5 if args.quick else 20)
+        results[f"resample_audio/{seconds}s"] = summarize(samples)
+
+
+SUITES = {
+    "evaluate": bench_evaluate,
+    "render_audio": bench_render_audio,
+    "decode": bench_decode,
+    "waveform": bench_waveform,
+    "resample": bench_resample,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.engine_bench",
+                                     description="rocky_core micro-benchmarks")
+    add_common_arguments(parser)
+    parser.add_argument("--frames", type=int, default=30, help="Frames timed per evaluate case")
+    parser.add_argument("--only", nargs="*", choices=list(SUITES), help="Run a subset of the suites")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, bench in SUITES.items():
+        if args.only and name not in args.only:
+            continue
+        bench(args, results)
+
+    report = build_report("engine", results, {"quick": args.quick, "frames": args.frames,
+                                             "only": args.only})
+    return finish(report, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
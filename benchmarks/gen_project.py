@@ -0,0 +1,81 @@
+"""
+Generador de proyectos .rocky sintéticos grandes.
+
+    python -m benchmarks.gen_project 100000 big.rocky [--tracks 16] [--seed 0]
+
+Pistas alternas vídeo/audio, clips consecutivos con huecos y solapes
+(crossfades), fades y nodos de opacidad aleatorios. Las rutas de medios son
+ficticias: el proyecto es para medir modelo/UI, no para reproducirlo.
+"""
+import argparse
+import random
+import sys
+
+from src.infrastructure import project_io
+from src.ui.models import FadeType, TimelineClip, TimelineModel, TrackType
+
+TRACK_HEIGHT = 80
+
+
+def generate_model(clip_count, tracks=8, seed=0, fps=30.0):
+    """Returns a TimelineModel with `clip_count` clips spread over `tracks` tracks."""
+    rng = random.Random(seed)
+    model = TimelineModel()
+    for t in range(tracks):
+        model.track_types.append(TrackType.VIDEO if t % 2 == 0 else TrackType.AUDIO)
+        model.track_heights.append(TRACK_HEIGHT)
+
+    cursors = [0] * tracks
+    fade_types = list(FadeType)
+    for n in range(clip_count):
+        track = n % tracks
+        duration = rng.randint(int(fps), int(fps * 10))
+        gap = rng.choice((0, 0, 0, rng.randint(1, int(fps * 2)), -rng.randint(1, int(fps))))
+        start = max(0, cursors[track] + gap)
+
+        clip = TimelineClip(f"clip_{n:06d}", start, duration, track)
+        clip.file_path = f"media/source_{n % 500:03d}.mp4"
+        clip.source_offset_frames = rng.randint(0, int(fps * 30))
+        clip.source_duration_frames = clip.source_offset_frames + duration + rng.randint(0, int(fps * 60))
+        if gap < 0:
+            # Solape con el clip anterior: crossfade como el que crea la UI
+            clip.fade_in_frames = min(-gap, duration)
+        elif rng.random() < 0.2:
+            clip.fade_in_frames = rng.randint(1, duration // 3)
+        if rng.random() < 0.2:
+            clip.fade_out_frames = rng.randint(1, duration // 3)
+        clip.fade_in_type = rng.choice(fade_types)
+        clip.fade_out_type = rng.choice(fade_types)
+        if rng.random() < 0.1:
+            clip.opacity_nodes = [[rng.randint(0, duration), round(rng.random(), 3), 0] for _ in range(3)]
+        clip.opacity_level = rng.choice((1.0, 1.0, 1.0, 0.8, 0.5))
+
+        model.clips.append(clip)
+        cursors[track] = start + duration
+
+    model.layout_revision += 1
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.gen_project",
+                                     description="Generate a large synthetic .rocky project")
+    parser.add_argument("clips", type=int, help="Number of clips")
+    parser.add_argument("output", help="Project file to write")
+    parser.add_argument("--tracks", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    model = generate_model(args.clips, args.tracks, args.seed)
+    # Mismo formato que RockyApp.save_project (.json -> exportación JSON)
+    if args.output.lower().endswith(".json"):
+        project_io.export_json(model.to_dict(), args.output)
+    else:
+        project_io.save(model.to_dict(), args.output)
+    print(f"{args.clips} clips, {args.tracks} tracks, {model.get_max_frame()} frames -> {args.output}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
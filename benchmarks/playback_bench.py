@@ -0,0 +1,345 @@
+"""
+Simulación headless de la reproducción.
+
+    python -m benchmarks.playback_bench [--seconds 10] [--layers 3] [--quick]
+
+Usa los mismos AudioWorker/VideoWorker y el mismo cálculo de reloj maestro
+(playback_clock_frame) que RockyApp, con un QCoreApplication (sin display) y
+un dispositivo de audio simulado que consume muestras a ritmo real en
+periodos fijos, igual que una tarjeta de sonido.
+
+Métricas:
+  latency      request_frame -> frame entregado al hilo principal (ms)
+  drift        tiempo del frame mostrado - tiempo del audio que suena (ms)
+  dropped      frames del rango reproducido que nunca llegaron a mostrarse
+  underruns    periodos del dispositivo sin muestras suficientes
+"""
+import argparse
+import collections
+import sys
+import threading
+import time
+
+import numpy as np
+import rocky_core
+from PySide6.QtCore import QCoreApplication, QMutex, QObject, QTimer, Slot
+
+from src.infrastructure.export.engine_factory import populate_engine
+from src.infrastructure.workers.playback import AudioWorker, VideoWorker, playback_clock_frame
+from src.ui.models import TimelineClip, TimelineModel, TrackType
+
+from .common import add_common_arguments, build_report, finish, summarize, synth_video
+
+SAMPLE_RATE = 44100
+BYTES_PER_FRAME = 8  # float32 estéreo intercalado, como AudioPlayer
+TICK_MS = 16         # Mismo intervalo que playback_timer
+
+
+class SimulatedAudioSink:
+    """Stands in for QAudioSink: only resume/suspend are used by AudioWorker."""
+
+    def __init__(self):
+        self.active = False
+
+    def resume(self):
+        self.active = True
+
+    def suspend(self):
+        self.active = False
+
+
+class SimulatedAudioPlayer:
+    """
+    Drop-in for AudioPlayer without an audio device.
+
+    A device thread drains `period_ms` of samples per period on a monotonic
+    schedule. Like a real sink, the clock (processed time) keeps running when
+    the buffer is empty: the missing samples are played as silence and
+    counted as an underrun.
+    """
+
+    def __init__(self, period_ms=10, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.period_frames = int(sample_rate * period_ms / 1000)
+        self.period_s = self.period_frames / sample_rate
+        self.buffer = bytearray()
+        self.lock = threading.Lock()
+        self.sink = SimulatedAudioSink()
+
+        self.processed_frames = 0   # Reloj del dispositivo (incluye silencio)
+        self.content_frames = 0     # Muestras reales reproducidas
+        self.underruns = 0
+        self.silence_frames = 0
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._device_loop, daemon=True)
+        self._thread.start()
+
+    # --- AudioPlayer interface -------------------------------------------
+    def write_samples(self, samples_np):
+        if samples_np is not None:
+            with self.lock:
+                self.buffer.extend(samples_np.tobytes())
+
+    def clear_buffer(self):
+        with self.lock:
+            self.buffer.clear()
+
+    def get_buffer_duration_ms(self):
+        with self.lock:
+            count = len(self.buffer) // BYTES_PER_FRAME
+        return (count / self.sample_rate) * 1000.0
+
+    def get_processed_us(self):
+        with self.lock:
+            return int(self.processed_frames * 1_000_000 / self.sample_rate)
+
+    # --- Device ------------------------------------------------------------
+    def _device_loop(self):
+        deadline = time.perf_counter()
+        while not self._stop.is_set():
+            deadline += self.period_s
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if not self.sink.active:
+                deadline = time.perf_counter()
+                continue
+            # Sin dormir cuando el hilo llega tarde: se recuperan los periodos
+            # atrasados, el reloj de un dispositivo real no espera a Python.
+            self._consume_period()
+
+    def _consume_period(self):
+        wanted = self.period_frames * BYTES_PER_FRAME
+        with self.lock:
+            available = min(len(self.buffer), wanted)
+            del self.buffer[:available]
+            got = available // BYTES_PER_FRAME
+            self.content_frames += got
+            self.processed_frames += self.period_frames
+            if got < self.period_frames:
+                self.underruns += 1
+                self.silence_frames += self.period_frames - got
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(1.0)
+
+
+class TimedEngine:
+    """
+    Proxy handed to VideoWorker: records which timestamp each evaluate()
+    rendered so frames can be matched when frame_ready arrives (frame_ready
+    only carries the image).
+    """
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.rendered = collections.deque()
+
+    def evaluate(self, timestamp):
+        frame = self._engine.evaluate(timestamp)
+        self.rendered.append(timestamp)
+        return frame
+
+    def __getattr__(self, name):
+        return getattr(self._engine, name)
+
+
+class PlaybackSession(QObject):
+    """Replays RockyApp.toggle_play/on_playback_tick against the simulated clock."""
+
+    def __init__(self, model, engine, fps, seconds, rate=1.0):
+        super().__init__()
+        self.model = model
+        self.fps = fps
+        self.seconds = seconds
+        self.rate = rate
+
+        self.player = SimulatedAudioPlayer()
+        self.engine = TimedEngine(engine)
+        self.engine_lock = QMutex()
+        self.audio_worker = AudioWorker(engine, self.player, model)
+        self.video_worker = VideoWorker(self.engine, self.engine_lock)
+        # Conexión automática (en cola): se mide la entrega en el hilo principal,
+        # igual que _broadcast_frame en la aplicación.
+        self.video_worker.frame_ready.connect(self.on_frame)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(TICK_MS / max(0.1, rate)))
+        self.timer.timeout.connect(self.on_tick)
+
+        self.requested = {}
+        self.latencies_ms = []
+        self.drift_ms = []
+        self.presented = set()
+        self.first_frame_ms = None
+        self.last_frame = 0.0
+
+    def start(self):
+        self.audio_worker.start()
+        self.video_worker.start()
+
+        self.model.blueline.playback_rate = self.rate
+        self.model.blueline.playing = True
+        self.playback_start_frame = self.model.blueline.playhead_frame
+        self.playback_start_audio_time = self.player.get_processed_us()
+        self.start_time = self.playback_start_frame / self.fps
+        self.started = time.perf_counter()
+
+        self.audio_worker.start_playback(self.start_time, self.fps, self.rate)
+        self.timer.start()
+
+    def clock_frame(self):
+        return playback_clock_frame(self.playback_start_frame, self.playback_start_audio_time,
+                                    self.player.get_processed_us(), self.fps, self.rate)
+
+    @Slot()
+    def on_tick(self):
+        current_frame = self.clock_frame()
+        if current_frame - self.playback_start_frame >= self.seconds * self.fps * self.rate:
+            self.stop()
+            return
+        self.last_frame = current_frame
+        timestamp = current_frame / self.fps
+        self.requested.setdefault(timestamp, time.perf_counter())
+        self.video_worker.request_frame(timestamp)
+
+    @Slot(object)
+    def on_frame(self, frame):
+        now = time.perf_counter()
+        if not self.engine.rendered:
+            return
+        timestamp = self.engine.rendered.popleft()
+        requested = self.requested.pop(timestamp, None)
+        if requested is not None:
+            self.latencies_ms.append((now - requested) * 1000.0)
+        if self.first_frame_ms is None:
+            self.first_frame_ms = (now - self.started) * 1000.0
+        self.presented.add(int(timestamp * self.fps + 1e-6))
+
+        # Lo que suena ahora: solo las muestras reales (no el silencio de un underrun)
+        heard = self.start_time + (self.player.content_frames / SAMPLE_RATE) * self.rate
+        self.drift_ms.append((timestamp - heard) * 1000.0)
+
+    def stop(self):
+        self.timer.stop()
+        self.model.blueline.playing = False
+        self.audio_worker.stop_playback()
+        for worker in (self.audio_worker, self.video_worker):
+            worker.running = False
+            worker.requestInterruption()
+            worker.wait(2000)
+        self.player.close()
+        QCoreApplication.instance().quit()
+
+    def results(self):
+        first = int(self.playback_start_frame)
+        expected = set(range(first, int(self.last_frame) + 1))
+        dropped = len(expected - self.presented)
+        drift = np.abs(np.asarray(self.drift_ms)) if self.drift_ms else np.zeros(1)
+        frame_ms = 1000.0 / self.fps
+        return {
+            "expected_frames": len(expected),
+            "presented_frames": len(self.presented & expected),
+            "dropped_frames": dropped,
+            "dropped_pct": round(100.0 * dropped / max(1, len(expected)), 2),
+            "late_frames": int(np.sum(drift > frame_ms)),
+            "first_frame_ms": round(self.first_frame_ms or 0.0, 2),
+            "underruns": self.player.underruns,
+            "underrun_ms": round(1000.0 * self.player.silence_frames / SAMPLE_RATE, 1),
+            "drift_mean_ms": round(float(np.mean(self.drift_ms)) if self.drift_ms else 0.0, 2),
+        }
+
+
+def build_project(args):
+    """Synthetic multi-track project: stacked video layers plus audio tracks."""
+    width, height = args.source
+    media = synth_video(args.media_dir, width, height, seconds=max(10, int(args.seconds) + 2),
+                        audio=True)
+    total = int((args.seconds + 1) * args.fps)
+
+    model = TimelineModel()
+    for n in range(args.layers):
+        model.track_types.append(TrackType.VIDEO)
+        model.track_heights.append(60)
+        clip = TimelineClip(f"layer{n}", 0, total, n)
+        clip.file_path = media
+        clip.source_offset_frames = n * 7  # Cada capa en un punto distinto del fichero
+        if n > 0:
+            # Picture-in-picture: las capas superiores escaladas y desplazadas
+            clip.transform.scale_x = clip.transform.scale_y = 0.5 / n
+            clip.transform.x = 0.1 * n * args.preview[0]
+        model.add_clip(clip)
+    for n in range(args.audio_tracks):
+        model.track_types.append(TrackType.AUDIO)
+        model.track_heights.append(60)
+        clip = TimelineClip(f"audio{n}", 0, total, args.layers + n)
+        clip.file_path = media
+        model.add_clip(clip)
+    return model
+
+
+def _size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.playback_bench",
+                                     description="Headless real-time playback simulation")
+    add_common_arguments(parser)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Playback duration")
+    parser.add_argument("--layers", type=int, default=3, help="Video tracks")
+    parser.add_argument("--audio-tracks", type=int, default=2)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--rate", type=float, default=1.0, help="Playback rate")
+    parser.add_argument("--source", type=_size, default=(1920, 1080), help="Synthetic media size WxH")
+    parser.add_argument("--preview", type=_size, default=(960, 528),
+                        help="Engine resolution during playback (viewer size, multiple of 16)")
+    parser.add_argument("--max-dropped-pct", type=float, default=None,
+                        help="Fail if more frames than this percentage are dropped")
+    parser.add_argument("--max-underruns", type=int, default=None,
+                        help="Fail if the audio device starves more often than this")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.seconds = min(args.seconds, 5.0)
+        args.layers = min(args.layers, 2)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+
+    model = build_project(args)
+    engine = rocky_core.RockyEngine()
+    engine.set_fps(args.fps)
+    engine.set_resolution(*args.preview)
+    populate_engine(engine, model, args.fps)
+
+    session = PlaybackSession(model, engine, args.fps, args.seconds, args.rate)
+    QTimer.singleShot(0, session.start)
+    app.exec()
+
+    stats = session.results()
+    name = f"playback/{args.preview[1]}p/{args.layers}V{args.audio_tracks}A"
+    results = {
+        f"{name}/latency": summarize(session.latencies_ms, **stats),
+        f"{name}/drift": summarize(np.abs(np.asarray(session.drift_ms)).tolist()),
+    }
+    print(f"{name}: dropped {stats['dropped_frames']}/{stats['expected_frames']}, "
+          f"underruns {stats['underruns']}, drift mean {stats['drift_mean_ms']} ms", file=sys.stderr)
+
+    config = {k: getattr(args, k) for k in ("seconds", "layers", "audio_tracks", "fps", "rate",
+                                            "source", "preview", "quick")}
+    report = build_report("playback", results, config)
+    code = finish(report, args)
+
+    if args.max_dropped_pct is not None and stats["dropped_pct"] > args.max_dropped_pct:
+        print(f"FAIL: dropped {stats['dropped_pct']}% > {args.max_dropped_pct}%", file=sys.stderr)
+        code = 1
+    if args.max_underruns is not None and stats["underruns"] > args.max_underruns:
+        print(f"FAIL: {stats['underruns']} underruns > {args.max_underruns}", file=sys.stderr)
+        code = 1
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Escalado del modelo y del painter del timeline con proyectos de 1k-100k clips.
+
+    python -m benchmarks.timeline_bench [--sizes 1000 10000 100000] [--budget-ms 16.7]
+
+Operaciones (las mismas funciones que usa la UI):
+  paint       TimelinePainter.render sobre un QImage del tamaño del viewport
+  playhead    tick de reproducción: mover el playhead y repintar solo su dirty
+              rect desde la capa estática cacheada (render_cached)
+  hit_test    SimpleTimeline.find_clip_at
+  drag        SimpleTimeline._drag_clip_move + _handle_auto_crossfade (soltar)
+  split       SimpleTimeline.split_clip
+  max_frame   TimelineModel.get_max_frame
+  save/load   project_io.save(to_dict) / from_dict(project_io.load), como save/load_project
+  save_json/load_json  exportación/importación JSON (indent=4, el formato anterior)
+
+Las operaciones interactivas deben caber en un frame (p95 <= --budget-ms);
+save/load tienen su propio límite (--io-budget-ms). En extra.scaling va la
+pendiente log-log entre el tamaño menor y el mayor (1.0 = lineal en clips).
+"""
+import argparse
+import contextlib
+import math
+import os
+import random
+import sys
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEvent, QPointF, QRect, Qt
+from PySide6.QtGui import QImage, QMouseEvent, QPainter
+from PySide6.QtWidgets import QApplication
+
+from src.infrastructure import project_io
+from src.ui.models import TimelineModel, TrackType
+from src.ui.timeline.simple_timeline import SimpleTimeline
+
+from .common import add_common_arguments, build_report, finish, measure, summarize
+from .gen_project import generate_model
+
+INTERACTIVE_OPS = ("paint", "playhead", "hit_test", "drag", "split", "max_frame")
+IO_OPS = ("save", "load", "save_json", "load_json")
+VIEWPORT = (1920, 640)
+WAVEFORM_POINTS = 400
+
+
+def _mouse_event(x, y):
+    pos = QPointF(x, y)
+    return QMouseEvent(QEvent.Type.MouseMove, pos, pos, Qt.MouseButton.LeftButton,
+                       Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+
+
+def _add_runtime_caches(model, rng):
+    """Waveforms are not saved with the project, but the painter draws them."""
+    for clip in model.clips:
+        if model.track_types[clip.track_index] == TrackType.AUDIO:
+            clip.waveform = [rng.random() for _ in range(WAVEFORM_POINTS * 2)]
+
+
+def bench_size(clip_count, args, results):
+    rng = random.Random(clip_count)
+    model = generate_model(clip_count, args.tracks, seed=clip_count)
+    _add_runtime_caches(model, rng)
+
+    timeline = SimpleTimeline(model)
+    timeline.repaint_timer.stop()
+    timeline.resize(VIEWPORT[0], sum(model.track_heights))
+    max_frame = model.get_max_frame()
+    max_x = int(timeline.frameToProjectedX(max_frame))
+    heavy = clip_count >= 100000
+    prefix = f"timeline/{clip_count}"
+
+    # --- paint ------------------------------------------------------------
+    width, height = VIEWPORT[0], sum(model.track_heights)
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    scrolls = [rng.randint(0, max(0, max_x - width)) for _ in range(64)]
+
+    def paint(i):
+        scroll_x = scrolls[i % len(scrolls)]
+        painter = QPainter(image)
+        painter.translate(-scroll_x, 0)
+        timeline.painter.render(painter, QRect(scroll_x, 0, width, height))
+        painter.end()
+
+    results[f"{prefix}/paint"] = summarize(measure(paint, 5 if heavy else 20))
+
+    # --- playhead (capa estática cacheada + dirty rect) -----------------------
+    view = QRect(scrolls[0], 0, width, height)
+    painter_obj = timeline.painter
+    fps = timeline.get_fps()
+    start_frame = timeline.screenXToFrame(view.left() + width / 4)
+
+    def playhead(i):
+        old = painter_obj.playhead_rect(model.blueline.playhead_frame)
+        model.blueline.set_playhead_frame(start_frame + i * fps / 60.0)
+        dirty = old.united(painter_obj.playhead_rect(model.blueline.playhead_frame))
+        painter = QPainter(image)
+        painter.translate(-view.left(), 0)
+        painter.setClipRect(dirty)
+        painter_obj.render_cached(painter, view)
+        painter.end()
+
+    results[f"{prefix}/playhead"] = summarize(measure(playhead, 60 if heavy else 240))
+
+    # --- hit_test -----------------------------------------------------------
+    points = [(rng.uniform(0, max_x), rng.uniform(0, height)) for _ in range(256)]
+    results[f"{prefix}/hit_test"] = summarize(
+        measure(lambda i: timeline.find_clip_at(*points[i % len(points)]), 50 if heavy else 200))
+
+    # --- drag (mover + soltar con auto-crossfade) ----------------------------
+    track_y = timeline._get_track_y_positions()
+
+    def drag(i):
+        clip = model.clips[rng.randrange(len(model.clips))]
+        x = timeline.frameToProjectedX(clip.start_frame) + rng.uniform(-200, 200)
+        y = track_y[clip.track_index] + 10
+        timeline.drag_offset_x = 0
+        timeline.dragging_clip = clip
+        timeline._drag_clip_move(_mouse_event(max(0.0, x), y))
+        timeline.dragging_clip = None
+        timeline._handle_auto_crossfade(clip)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results[f"{prefix}/drag"] = summarize(measure(drag, 20 if heavy else 100))
+
+    # --- split --------------------------------------------------------------
+    def split(i):
+        clip = model.clips[rng.randrange(len(model.clips))]
+        timeline.split_clip(clip, clip.start_frame + clip.duration_frames // 2)
+
+    results[f"{prefix}/split"] = summarize(measure(split, 20 if heavy else 100))
+    results[f"{prefix}/max_frame"] = summarize(
+        measure(lambda i: model.get_max_frame(), 20 if heavy else 100))
+
+    # --- save / load ----------------------------------------------------------
+    fd, path = tempfile.mkstemp(suffix=".rocky")
+    os.close(fd)
+    json_path = path + ".json"
+    try:
+        def save(i):
+            project_io.save(model.to_dict(), path)
+
+        def load(i):
+            TimelineModel.from_dict(project_io.load(path))
+
+        def save_json(i):
+            project_io.export_json(model.to_dict(), json_path)
+
+        def load_json(i):
+            TimelineModel.from_dict(project_io.load(json_path))
+
+        iterations = 2 if heavy else 5
+        for op, fn, file_path in (("save", save, path), ("load", load, None),
+                                  ("save_json", save_json, json_path), ("load_json", load_json, None)):
+            samples = measure(fn, iterations, warmup=1)
+            extra = {"bytes": os.path.getsize(file_path)} if file_path else {}
+            results[f"{prefix}/{op}"] = summarize(samples, **extra)
+    finally:
+        for p in (path, json_path):
+            if os.path.exists(p):
+                os.remove(p)
+
+    timeline.deleteLater()
+    for op in INTERACTIVE_OPS + IO_OPS:
+        print(f"{prefix}/{op}: p95 {results[f'{prefix}/{op}']['p95']:.2f} ms", file=sys.stderr)
+
+
+def scaling(results, sizes):
+    """Log-log slope of p50 between the smallest and largest project size."""
+    lo, hi = min(sizes), max(sizes)
+    slopes = {}
+    if lo == hi:
+        return slopes
+    for op in INTERACTIVE_OPS + IO_OPS:
+        a = results[f"timeline/{lo}/{op}"]["p50"]
+        b = results[f"timeline/{hi}/{op}"]["p50"]
+        if a and b:
+            slopes[op] = round(math.log(b / a) / math.log(hi / lo), 2)
+    return slopes
+
+
+def check_budgets(results, args):
+    violations = []
+    for name, summary in results.items():
+        op = name.rsplit("/", 1)[-1]
+        limit = args.budget_ms if op in INTERACTIVE_OPS else args.io_budget_ms
+        if summary["p95"] > limit:
+            violations.append({"case": name, "p95": summary["p95"], "budget_ms": limit})
+    return violations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.timeline_bench",
+                                     description="Timeline model/painter scaling benchmark")
+    add_common_arguments(parser)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--tracks", type=int, default=8)
+    parser.add_argument("--budget-ms", type=float, default=1000.0 / 60.0,
+                        help="Frame budget for interactive operations (p95)")
+    parser.add_argument("--io-budget-ms", type=float, default=1000.0,
+                        help="Budget for save/load (p95)")
+    parser.add_argument("--no-budget", action="store_true", help="Report only, never fail on budgets")
+    args = parser.parse_args(argv)
+    sizes = [s for s in args.sizes if s <= 10000] if args.quick else args.sizes
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    results = {}
+    for size in sizes:
+        bench_size(size, args, results)
+
+    report = build_report("timeline", results, {"sizes": sizes, "tracks": args.tracks,
+                                               "budget_ms": args.budget_ms,
+                                               "io_budget_ms": args.io_budget_ms})
+    report["scaling"] = scaling(results, sizes)
+    report["budget_violations"] = check_budgets(results, args)
+    code = finish(report, args)
+
+    for v in report["budget_violations"]:
+        print(f"OVER BUDGET {v['case']}: p95 {v['p95']} ms > {v['budget_ms']:.1f} ms", file=sys.stderr)
+    if report["budget_violations"] and not args.no_budget:
+        code = 1
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
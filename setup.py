@@ -65,6 +65,11 @@ functions_module = Extension(
         'src/core/media_source.cpp',
         'src/core/clip.cpp',
         'src/core/engine.cpp',
+        'src/core/exporter.cpp',
+        'src/core/yuv_converter.cpp',
+        'src/core/stats.cpp',
+        'src/core/trace.cpp',
+        'src/core/probe.cpp',
         'src/core/ofx/host.cpp', # Added to build
         # Platform & Hardware Detection
         'src/platform/common/platform_detector.cpp',
@@ -1,10 +1,15 @@
 #include "engine.h"
+#include "exporter.h"
+#include "stats.h"
+#include "trace.h"
+#include "probe.h"
 #include "../platform/common/platform_detector.h"
 #include "../hardware/optimizer.h"
 #include "../infrastructure/config/runtime_config.h"
 #include "../infrastructure/logging/logger.h"
 #include "../core/ofx/host.h"
 #include <pybind11/stl.h>
+#include <pybind11/functional.h>
 
 PYBIND11_MODULE(rocky_core, m) {
     // Exception Handler
@@ -118,11 +123,28 @@ PYBIND11_MODULE(rocky_core, m) {
         .def(py::init<uint8_t, uint8_t, uint8_t, uint8_t>(), py::arg("r"), py::arg("g"), py::arg("b"), py::arg("a") = 255);
 
     py::class_<VideoSource, MediaSource, std::shared_ptr<VideoSource>>(m, "VideoSource")
-        .def(py::init<std::string>())
+        .def(py::init<std::string, int>(), py::arg("path"), py::arg("decoder_threads") = 0)
         .def("get_width", &VideoSource::getWidth)
         .def("get_height", &VideoSource::getHeight)
         .def("get_rotation", &VideoSource::getRotation)
-        .def("get_waveform", &VideoSource::getWaveform, py::call_guard<py::gil_scoped_release>());
+        .def("is_intra_only", &VideoSource::isIntraOnly,
+             "True when every frame decodes on its own (seeks decode one frame).")
+        .def("get_waveform", &VideoSource::getWaveform, py::call_guard<py::gil_scoped_release>())
+        .def("get_keyframe_thumbnails", [](VideoSource& self, int w, int h, double minInterval) {
+            std::vector<std::pair<double, Frame>> thumbs;
+            {
+                py::gil_scoped_release release;
+                thumbs = self.getKeyframeThumbnails(w, h, minInterval);
+            }
+            py::list out;
+            for (auto& [t, f] : thumbs) {
+                py::array_t<uint8_t> img({f.height, f.width, f.channels});
+                std::copy(f.data.begin(), f.data.end(), img.mutable_data());
+                out.append(py::make_tuple(t, img));
+            }
+            return out;
+        }, py::arg("width"), py::arg("height"), py::arg("min_interval") = 0.0,
+           "Keyframe-only filmstrip pass: list of (seconds, HxWx3 uint8 RGB).");
 
     py::class_<ImageSource, MediaSource, std::shared_ptr<ImageSource>>(m, "ImageSource")
         .def(py::init<std::string>());
@@ -135,26 +157,113 @@ PYBIND11_MODULE(rocky_core, m) {
         .def_readwrite("fade_in_type", &Clip::fadeInType)
         .def_readwrite("fade_out_type", &Clip::fadeOutType)
         .def_readwrite("transform", &Clip::transform)
-        .def_readwrite("effects", &Clip::effects);
+        .def_readwrite("effects", &Clip::effects)
+        .def_readwrite("preview_source", &Clip::previewSource,
+                       "Video-only stand-in (e.g. proxy) for degraded playback; None = source.");
 
-    py::class_<RockyEngine>(m, "RockyEngine")
+    py::class_<RockyEngine, std::shared_ptr<RockyEngine>>(m, "RockyEngine")
         .def(py::init<>())
         .def("set_resolution", &RockyEngine::setResolution)
+        .def("set_preview_scale", &RockyEngine::setPreviewScale, py::arg("scale"))
+        .def("get_preview_scale", &RockyEngine::getPreviewScale)
         .def("set_fps", &RockyEngine::setFPS)
         .def("add_track", &RockyEngine::addTrack)
         .def("add_clip", &RockyEngine::addClip)
         .def("set_master_gain", &RockyEngine::setMasterGain)
         .def("evaluate", &RockyEngine::evaluate)
+        .def("evaluate_yuv", &RockyEngine::evaluateYUV, py::arg("time"), py::arg("pix_fmt") = "yuv420p")
         .def("render_audio", &RockyEngine::render_audio)
         .def("clear", &RockyEngine::clear)
+        .def("set_render_cache", &RockyEngine::setRenderCache,
+             py::arg("start_frame"), py::arg("end_frame"), py::arg("source"))
+        .def("clear_render_cache", &RockyEngine::clearRenderCache)
         .def_static("format_timecode", &RockyEngine::formatTimecode)
         .def_static("resample_audio", &RockyEngine::resampleAudio);
+
+    // In-process Export (libavcodec/libavformat)
+    py::class_<Exporter>(m, "Exporter")
+        .def(py::init<std::string, int, int, double, std::string, std::string,
+                      std::map<std::string, std::string>, int>(),
+             py::arg("path"), py::arg("width"), py::arg("height"), py::arg("fps"),
+             py::arg("codec"), py::arg("pix_fmt") = "yuv420p",
+             py::arg("options") = std::map<std::string, std::string>(),
+             py::arg("audio_bitrate") = 192000)
+        .def("run", &Exporter::run,
+             py::arg("engines"), py::arg("audio_engine"), py::arg("total_frames"),
+             py::arg("progress") = nullptr, py::arg("max_frames_in_flight") = 8,
+             py::arg("chunk_frames") = 8, py::arg("start_frame") = 0,
+             py::call_guard<py::gil_scoped_release>())
+        .def("cancel", &Exporter::cancel);
     
     // OpenFX Bindings
     m.def("load_ofx_plugin", [](std::string path) {
         return RockyOfxHost::getInstance().loadPlugin(path);
     });
 
+    // Per-stage instrumentation (process-wide, all engines and sources)
+    m.def("get_stats", []() {
+        const StatsSnapshot snap = EngineStats::instance().snapshot();
+        py::dict stages;
+        for (int i = 0; i < static_cast<int>(Stage::Count); ++i) {
+            py::dict entry;
+            entry["ms"] = snap.stageNs[i] / 1e6;
+            entry["calls"] = snap.stageCalls[i];
+            stages[EngineStats::name(static_cast<Stage>(i))] = entry;
+        }
+        py::dict result;
+        result["stages"] = stages;
+        for (int i = 0; i < static_cast<int>(Counter::Count); ++i)
+            result[EngineStats::name(static_cast<Counter>(i))] = snap.counters[i];
+        for (int i = 0; i < static_cast<int>(Gauge::Count); ++i)
+            result[EngineStats::name(static_cast<Gauge>(i))] = snap.gauges[i];
+        result["elapsed_s"] = snap.elapsedSeconds;
+        return result;
+    }, "Cumulative stage times (ms, summed over threads) and counters since the last reset_stats().");
+    m.def("reset_stats", []() { EngineStats::instance().reset(); });
+
+    // Span tracing (Chrome trace); the Python side merges and writes the JSON
+    m.def("trace_start", []() { TraceRecorder::instance().start(); });
+    m.def("trace_stop", []() { TraceRecorder::instance().stop(); });
+    m.def("trace_enabled", []() { return TraceRecorder::enabled(); });
+    m.def("trace_clock_us", []() { return EngineStats::nowNs() / 1000.0; },
+          "Clock used by the C++ spans, in microseconds.");
+    m.def("trace_collect", []() {
+        std::vector<TraceEvent> events = TraceRecorder::instance().collect();
+        py::list out;
+        for (const auto& e : events) {
+            // (name, detail, start_us, dur_us, tid)
+            out.append(py::make_tuple(e.name, e.detail, e.startNs / 1000.0,
+                                      (e.endNs - e.startNs) / 1000.0, e.tid));
+        }
+        return out;
+    }, "Returns and clears the buffered spans as (name, detail, start_us, dur_us, tid).");
+    m.def("trace_dropped", []() { return TraceRecorder::instance().dropped(); });
+
+    // Media probe (libavformat in-process, sin subprocess de ffprobe)
+    m.def("probe", [](std::string path) {
+        MediaInfo info;
+        {
+            py::gil_scoped_release release;
+            info = probeMedia(path);
+        }
+        if (!info.valid)
+            throw std::runtime_error("probe failed for " + path + ": " + info.error);
+        py::dict d;
+        d["width"] = info.width;
+        d["height"] = info.height;
+        d["fps"] = info.fps;
+        d["rotation"] = info.rotation;
+        d["duration"] = info.duration;
+        d["codec"] = info.codec;
+        d["pix_fmt"] = info.pixFmt;
+        d["has_video"] = info.hasVideo;
+        d["has_audio"] = info.hasAudio;
+        d["sample_rate"] = info.sampleRate;
+        d["channels"] = info.channels;
+        return d;
+    }, py::arg("path"),
+       "Container/stream metadata without decoding (GIL released). Raises RuntimeError if unreadable.");
+
     m.attr("VIDEO") = 1;
     m.attr("AUDIO") = 2;
 }
@@ -1,4 +1,5 @@
 #include "clip.h"
+#include "stats.h"
 
 Clip::Clip(std::string n, long s, long d, double o,
            std::shared_ptr<MediaSource> src, int ti)
@@ -50,7 +51,8 @@ float Clip::getOpacityAt(long absoluteFrame) {
   return std::max(0.0f, std::min(1.0f, currentOpacity));
 }
 
-Frame Clip::render(double time, int w, int h, double fps, long absoluteFrame) {
+Frame Clip::render(double time, int w, int h, double fps, long absoluteFrame,
+                   double previewScale) {
   // 1. Calculate local time
   double localTime = (double)(absoluteFrame - startFrame) / fps + sourceOffset;
 
@@ -66,12 +68,24 @@ Frame Clip::render(double time, int w, int h, double fps, long absoluteFrame) {
   // By fetching at native size, we avoid double-scaling or forced aspect-fit
   // inside the source. The transform logic below will handle fitting it to the
   // canvas.
-  int nativeW = source->getWidth();
-  int nativeH = source->getHeight();
-  Frame f = source->getFrame(localTime, nativeW, nativeH);
+  const std::shared_ptr<MediaSource> videoSource =
+      previewSource ? previewSource : source;
+  int nativeW = videoSource->getWidth();
+  int nativeH = videoSource->getHeight();
+  Frame f = videoSource->getFrame(localTime, nativeW, nativeH);
   if (f.data.empty())
     return f;
 
+  // Un proxy tiene menos píxeles que el original: se amplía para ocupar el
+  // mismo área del lienzo (la transformación está en píxeles del original)
+  double sizeScale = previewScale;
+  if (videoSource != source && nativeW > 0 && source->getWidth() > 0)
+    sizeScale *= static_cast<double>(source->getWidth()) / nativeW;
+
+  // Desde aquí: envolvente de opacidad + transformación (decode/scale se
+  // miden dentro de la fuente)
+  StageTimer transformTimer(Stage::Transform);
+
   // 3. Apply Opacity Envelope
   float finalAlphaMult = getOpacityAt(absoluteFrame);
   if (finalAlphaMult < 1.0f) {
@@ -110,6 +124,8 @@ Frame Clip::render(double time, int w, int h, double fps, long absoluteFrame) {
   // Safe Scales
   double sx = (std::abs(transform.scaleX) < 0.001) ? 0.001 : transform.scaleX;
   double sy = (std::abs(transform.scaleY) < 0.001) ? 0.001 : transform.scaleY;
+  sx *= sizeScale;
+  sy *= sizeScale;
 
   // Centers
   double srcCX = f.width * 0.5;
@@ -117,8 +133,8 @@ Frame Clip::render(double time, int w, int h, double fps, long absoluteFrame) {
 
   // Target Center on Canvas
   // CanvasCenter + Offset
-  double dstCX = (w * 0.5) + transform.x;
-  double dstCY = (h * 0.5) + transform.y;
+  double dstCX = (w * 0.5) + transform.x * previewScale;
+  double dstCY = (h * 0.5) + transform.y * previewScale;
 
   // Inverse Mapping Loop
   // We iterate over the DESTINATION pixels and find which SOURCE pixel maps to
@@ -34,6 +34,9 @@ struct Clip {
     long startFrame, durationFrames;
     double sourceOffset;
     std::shared_ptr<MediaSource> source;
+    // Vídeo alternativo para la preview (proxy durante reproducción degradada).
+    // Mismo tiempo que source; el audio sigue saliendo siempre de source.
+    std::shared_ptr<MediaSource> previewSource;
     int trackIndex;
     
     // Atributos extendidos del nucleo Java
@@ -51,5 +54,7 @@ struct Clip {
 
     float getFadeValue(FadeType type, double t, bool isFadeIn);
     float getOpacityAt(long absoluteFrame);
-    Frame render(double time, int w, int h, double fps, long absoluteFrame);
+    // previewScale: lienzo reducido (preview a 1/2, 1/4...) respecto al proyecto
+    Frame render(double time, int w, int h, double fps, long absoluteFrame,
+                 double previewScale = 1.0);
 };
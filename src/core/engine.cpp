@@ -1,4 +1,5 @@
 #include "engine.h"
+#include "stats.h"
 #include "ofx/host.h"
 
 #ifdef ENABLE_ACCELERATE
@@ -6,6 +7,11 @@
 #endif
 
 void RockyEngine::setResolution(int w, int h) { std::lock_guard<std::mutex> lock(mtx); width = w; height = h; }
+void RockyEngine::setPreviewScale(double scale) {
+    std::lock_guard<std::mutex> lock(mtx);
+    previewScale = std::max(0.05, std::min(1.0, scale));
+}
+double RockyEngine::getPreviewScale() { std::lock_guard<std::mutex> lock(mtx); return previewScale; }
 void RockyEngine::setFPS(double f) { std::lock_guard<std::mutex> lock(mtx); fps = f; }
 void RockyEngine::addTrack(int type) { std::lock_guard<std::mutex> lock(mtx); trackTypes.push_back(type); }
 void RockyEngine::setMasterGain(double gain) { std::lock_guard<std::mutex> lock(mtx); masterGain = gain; }
@@ -21,6 +27,24 @@ void RockyEngine::clear() {
     std::lock_guard<std::mutex> lock(mtx);
     clipTree.clear();
     trackTypes.clear();
+    renderCache.clear();
+}
+
+void RockyEngine::setRenderCache(long startFrame, long endFrame, std::shared_ptr<MediaSource> src) {
+    std::lock_guard<std::mutex> lock(mtx);
+    renderCache.erase(
+        std::remove_if(renderCache.begin(), renderCache.end(),
+                       [&](const RenderCacheEntry& e) {
+                           return e.startFrame < endFrame && startFrame < e.endFrame;
+                       }),
+        renderCache.end());
+    if (src && endFrame > startFrame)
+        renderCache.push_back({startFrame, endFrame, std::move(src)});
+}
+
+void RockyEngine::clearRenderCache() {
+    std::lock_guard<std::mutex> lock(mtx);
+    renderCache.clear();
 }
 
 /**
@@ -32,14 +56,104 @@ void RockyEngine::clear() {
  * @param time The project time in seconds.
  * @return py::array_t<uint8_t> A 4-channel (RGBA) NumPy array for Python consumption.
  */
+namespace {
+// Dueño del buffer de un array de evaluate(): al liberarse vuelve al pool
+struct PooledBuffer {
+    std::vector<uint8_t> data;
+    std::shared_ptr<FramePool> pool;
+};
+}
+
 py::array_t<uint8_t> RockyEngine::evaluate(double time) {
+    auto* holder = new PooledBuffer{{}, framePool};
+    int curW, curH;
+    {
+        // HEAVY WORK: Release GIL
+        py::gil_scoped_release release;
+        std::vector<uint8_t> recycled = framePool->acquire();
+        Frame frame = renderFrame(time, &recycled);
+        // Sin usar (p.ej. frame del pre-render): sigue disponible
+        framePool->release(std::move(recycled));
+        curW = frame.width;
+        curH = frame.height;
+        holder->data = std::move(frame.data);
+    }
+
+    // CREATE NUMPY ARRAY: ZERO-COPY
+    // py::array_t puede robar la propiedad de un buffer de C++ para evitar el memcpy final.
+    // La cápsula devuelve el std::vector al pool cuando Python ya no lo usa.
+    py::capsule free_when_done(holder, [](void* f) {
+        auto* h = reinterpret_cast<PooledBuffer*>(f);
+        h->pool->release(std::move(h->data));
+        delete h;
+    });
+
+    return py::array_t<uint8_t>(
+        {curH, curW, 4},                        // Shape
+        { (size_t)(curW * 4), (size_t)4, (size_t)1 }, // Strides
+        holder->data.data(),                    // Data pointer
+        free_when_done                          // Owner (capsule)
+    );
+}
+
+/**
+ * @brief Same composite as evaluate(), converted to planar YUV inside the core.
+ *
+ * Sending yuv420p/nv12 instead of RGBA cuts export pipe bandwidth by 2.67x and
+ * moves the colorspace conversion to a sliced, multi-threaded swscale stage.
+ */
+py::array_t<uint8_t> RockyEngine::evaluateYUV(double time, const std::string& pixFmt) {
+    const AVPixelFormat fmt = YuvConverter::parse(pixFmt);
+    if (!YuvConverter::isSupported(fmt))
+        throw std::invalid_argument("evaluate_yuv: unsupported pixel format '" + pixFmt + "'");
+
+    std::unique_ptr<std::vector<uint8_t>> buffer;
+    {
+        // HEAVY WORK: Release GIL
+        py::gil_scoped_release release;
+        Frame frame = renderFrame(time);
+        buffer = std::make_unique<std::vector<uint8_t>>(
+            YuvConverter::bufferSize(frame.width, frame.height, fmt));
+        yuvConverter.convertPacked(frame, fmt, buffer->data());
+    }
+
+    auto* ptr = buffer.release();
+    py::capsule free_when_done(ptr, [](void* f) {
+        delete reinterpret_cast<std::vector<uint8_t>*>(f);
+    });
+    return py::array_t<uint8_t>(
+        { (py::ssize_t)ptr->size() },
+        { (py::ssize_t)1 },
+        ptr->data(),
+        free_when_done
+    );
+}
+
+/**
+ * @brief Native compositing core shared by evaluate() and the in-process Exporter.
+ * Never touches Python objects, so it can run on any C++ thread.
+ */
+Frame RockyEngine::renderFrame(double time, std::vector<uint8_t>* recycled) {
+    TraceSpan span("render_frame");
     std::vector<std::shared_ptr<Clip>> visibleVideoClips;
     int curW, curH;
     double curFps;
+    double curScale;
+    std::shared_ptr<MediaSource> cachedSource;
+    long cachedStart = 0;
 
     {
         std::lock_guard<std::mutex> lock(mtx);
         const long targetFrameIndex = static_cast<long>(time * fps + 0.001);
+
+        // OPTIMIZACIÓN SENIOR: rango pre-renderizado -> un único decode intra
+        for (const auto& entry : renderCache) {
+            if (targetFrameIndex >= entry.startFrame && targetFrameIndex < entry.endFrame) {
+                cachedSource = entry.source;
+                cachedStart = entry.startFrame;
+                break;
+            }
+        }
         std::vector<std::shared_ptr<Clip>> activeClips = clipTree.query(targetFrameIndex);
         
         for (const auto& clip : activeClips) {
@@ -48,10 +162,30 @@ py::array_t<uint8_t> RockyEngine::evaluate(double time) {
                 visibleVideoClips.push_back(clip);
             }
         }
+        curScale = previewScale;
         curW = width;
         curH = height;
+        if (curScale < 1.0) {
+            // Dimensiones pares (yuv/scalers) y nunca vacías
+            curW = std::max(2, static_cast<int>(width * curScale) & ~1);
+            curH = std::max(2, static_cast<int>(height * curScale) & ~1);
+        }
         curFps = fps;
     }
+
+    EngineStats& stats = EngineStats::instance();
+    stats.increment(Counter::Frames);
+
+    if (cachedSource) {
+        const long targetFrameIndex = static_cast<long>(time * curFps + 0.001);
+        Frame cached = cachedSource->getFrame(
+            static_cast<double>(targetFrameIndex - cachedStart) / curFps, curW, curH);
+        if (cached.width == curW && cached.height == curH && !cached.data.empty()) {
+            stats.increment(Counter::RenderCacheHits);
+            return cached;
+        }
+        // Fichero ilegible: componer normalmente
+    }
     
     // Sort by track index ASCENDING (Background [0] first, Foreground [N] last)
     // Painter's Algorithm: Draw bottom layers first, then overlay top layers.
@@ -64,9 +198,15 @@ py::array_t<uint8_t> RockyEngine::evaluate(double time) {
     const size_t totalPixelBytes = static_cast<size_t>(curW * curH * 4);
     
     // 1. LOCAL CANVAS (Thread Safety)
-    // We use a local vector here to ensure that multiple calls to evaluate() 
+    // We use a local frame here to ensure that multiple calls to evaluate() 
     // (e.g. from Preview and Export threads) don't collide on a shared buffer.
-    std::vector<uint8_t> localCanvas(totalPixelBytes);
+    Frame canvas(0, 0, 4);
+    canvas.width = curW;
+    canvas.height = curH;
+    if (recycled && recycled->capacity() >= totalPixelBytes)
+        canvas.data.swap(*recycled); // Buffer del pool: sin reserva ni page faults
+    canvas.data.resize(totalPixelBytes);
+    std::vector<uint8_t>& localCanvas = canvas.data;
     
     // Fast Clear (Black Background)
     uint32_t* pixelPtr = reinterpret_cast<uint32_t*>(localCanvas.data());
@@ -81,15 +221,14 @@ py::array_t<uint8_t> RockyEngine::evaluate(double time) {
     futureFrames.reserve(visibleVideoClips.size());
     
     {
-        // HEAVY WORK: Release GIL
-        py::gil_scoped_release release;
         const long targetFrameIndex = static_cast<long>(time * curFps + 0.001);
 
         // STAGE A: Launch background renders
         for (auto& clip : visibleVideoClips) {
              futureFrames.push_back(std::async(std::launch::async, 
-                [clip, time, curW, curH, curFps, targetFrameIndex]() {
-                    return clip->render(time, curW, curH, curFps, targetFrameIndex);
+                [clip, time, curW, curH, curFps, targetFrameIndex, curScale]() {
+                    TraceSpan clipSpan("clip_render", TraceRecorder::enabled() ? clip->name : std::string());
+                    return clip->render(time, curW, curH, curFps, targetFrameIndex, curScale);
                 }
              ));
         }
@@ -101,19 +240,24 @@ py::array_t<uint8_t> RockyEngine::evaluate(double time) {
 
             // --- APPLY EFFECTS ---
             auto clip = visibleVideoClips[i];
-            for (const auto& effect : clip->effects) {
-                if (effect.enabled) {
-                    RockyOfxHost::getInstance().executePluginRender(
-                        effect.pluginPath, 
-                        currentLayer.data.data(),
-                        currentLayer.data.data(),
-                        currentLayer.width, 
-                        currentLayer.height
-                    );
+            if (!clip->effects.empty()) {
+                StageTimer effectTimer(Stage::Effect);
+                for (const auto& effect : clip->effects) {
+                    if (effect.enabled) {
+                        RockyOfxHost::getInstance().executePluginRender(
+                            effect.pluginPath, 
+                            currentLayer.data.data(),
+                            currentLayer.data.data(),
+                            currentLayer.width, 
+                            currentLayer.height
+                        );
+                    }
                 }
             }
             // ---------------------
 
+            StageTimer blendTimer(Stage::Blend);
+
             const uint8_t* src = currentLayer.data.data();
             uint8_t* dst = localCanvas.data();
             
@@ -144,28 +288,33 @@ py::array_t<uint8_t> RockyEngine::evaluate(double time) {
         }
     }
 
-    // CREATE NUMPY ARRAY: ZERO-COPY
-    // py::array_t puede robar la propiedad de un buffer de C++ para evitar el memcpy final.
-    // Usamos py::capsule para que Python se encargue de liberar el std::vector cuando ya no se use.
-    auto* ptr = new std::vector<uint8_t>(std::move(localCanvas));
-    py::capsule free_when_done(ptr, [](void* f) {
-        delete reinterpret_cast<std::vector<uint8_t>*>(f);
-    });
-
-    return py::array_t<uint8_t>(
-        {curH, curW, 4},                        // Shape
-        { (size_t)(curW * 4), (size_t)4, (size_t)1 }, // Strides
-        ptr->data(),                            // Data pointer
-        free_when_done                          // Owner (capsule)
-    );
+    return canvas;
 }
 
 py::array_t<float> RockyEngine::render_audio(double startTime, double duration) {
+    std::vector<float> mixedAudio;
+    {
+        // HEAVY WORK: Release GIL
+        py::gil_scoped_release release;
+        mixedAudio = mixAudio(startTime, duration);
+    }
+
+    py::array_t<float> result(mixedAudio.size());
+    std::copy(mixedAudio.begin(), mixedAudio.end(), result.mutable_data());
+    return result;
+}
+
+/**
+ * @brief Native audio mix (interleaved stereo float @ 44.1kHz). No Python access.
+ */
+std::vector<float> RockyEngine::mixAudio(double startTime, double duration) {
+    TraceSpan span("mix_audio");
     std::vector<std::shared_ptr<Clip>> audioClips;
     double curFps;
     double curMasterGain;
     const int targetSampleRate = 44100;
-    const int totalSamples = static_cast<int>(duration * targetSampleRate);
+    // lround: static_cast truncation dropped a sample on many chunk lengths
+    const int totalSamples = static_cast<int>(std::lround(duration * targetSampleRate));
 
     {
         std::lock_guard<std::mutex> lock(mtx);
@@ -183,16 +332,17 @@ py::array_t<float> RockyEngine::render_audio(double startTime, double duration)
     }
     
     std::vector<float> mixedAudio(totalSamples * 2, 0.0f);
+    EngineStats& stats = EngineStats::instance();
+    stats.increment(Counter::AudioChunks);
+    int64_t mixNs = 0; // Sin el decode: getAudioSamples lo mide como AudioDecode
     
     {
-        // HEAVY WORK: Release GIL
-        py::gil_scoped_release release;
-        
         for (const auto& clip : audioClips) {
             auto videoSrc = std::dynamic_pointer_cast<VideoSource>(clip->source);
             if (videoSrc) {
                 double localStart = (startTime - (clip->startFrame / curFps)) + clip->sourceOffset;
                 std::vector<float> samples = videoSrc->getAudioSamples(localStart, duration);
+                const int64_t mixStart = EngineStats::nowNs();
                 
                 size_t mixCount = std::min(mixedAudio.size(), samples.size());
                 if (mixCount > 0) {
@@ -206,10 +356,12 @@ py::array_t<float> RockyEngine::render_audio(double startTime, double duration)
                     }
 #endif
                 }
+                mixNs += EngineStats::nowNs() - mixStart;
             }
         }
         
         // Final pass: Master Gain & Soft Limiter
+        const int64_t masterStart = EngineStats::nowNs();
         if (!mixedAudio.empty()) {
             float masterGainF = static_cast<float>(curMasterGain);
 #ifdef ENABLE_ACCELERATE
@@ -228,11 +380,11 @@ py::array_t<float> RockyEngine::render_audio(double startTime, double duration)
                 }
             }
         }
+        mixNs += EngineStats::nowNs() - masterStart;
     }
+    stats.addTime(Stage::Mix, mixNs);
     
-    py::array_t<float> result(mixedAudio.size());
-    std::copy(mixedAudio.begin(), mixedAudio.end(), result.mutable_data());
-    return result;
+    return mixedAudio;
 }
 
 std::string RockyEngine::formatTimecode(double frame, double fps) {
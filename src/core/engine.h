@@ -2,27 +2,79 @@
 #include "common.h"
 #include "clip.h"
 #include "interval_tree.h"
+#include "yuv_converter.h"
 #include <mutex>
 #include <future>
 #include <thread>
 
+// Lienzos RGBA de evaluate(): cuando NumPy suelta el array, el buffer vuelve
+// aquí y el siguiente frame lo reutiliza (sin malloc + page faults de ~8 MB
+// por frame 1080p). Compartido por puntero: el array puede sobrevivir al motor.
+class FramePool {
+    std::mutex mtx;
+    std::vector<std::vector<uint8_t>> freeBuffers;
+    static constexpr size_t kMaxFree = 4;
+
+public:
+    std::vector<uint8_t> acquire() {
+        std::lock_guard<std::mutex> lock(mtx);
+        if (freeBuffers.empty())
+            return {};
+        std::vector<uint8_t> buf = std::move(freeBuffers.back());
+        freeBuffers.pop_back();
+        return buf;
+    }
+    void release(std::vector<uint8_t>&& buf) {
+        std::lock_guard<std::mutex> lock(mtx);
+        if (buf.capacity() > 0 && freeBuffers.size() < kMaxFree)
+            freeBuffers.push_back(std::move(buf));
+    }
+};
+
 class RockyEngine {
     std::vector<int> trackTypes;
     IntervalTree<std::shared_ptr<Clip>> clipTree;
     int width = 1280, height = 720;
+    // Preview degradada: el lienzo se compone a width*previewScale
+    double previewScale = 1.0;
     double fps = 30.0;
     double masterGain = 1.0;
     std::mutex mtx;
+    YuvConverter yuvConverter;
+    std::shared_ptr<FramePool> framePool = std::make_shared<FramePool>();
+
+    // Pre-render cache: rangos [startFrame, endFrame) ya compuestos en un fichero
+    // intra (mezzanine). Mientras existan, sustituyen a la composición de capas.
+    struct RenderCacheEntry {
+        long startFrame;
+        long endFrame;
+        std::shared_ptr<MediaSource> source;
+    };
+    std::vector<RenderCacheEntry> renderCache;
 
 public:
     void setResolution(int w, int h);
+    // 1.0 = resolución del proyecto; 0.5/0.25/0.125 para reproducción fluida
+    void setPreviewScale(double scale);
+    double getPreviewScale();
     void setFPS(double f);
     void addTrack(int type);
     void setMasterGain(double gain);
     std::shared_ptr<Clip> addClip(int trackIdx, std::string name, long start, long dur, double offset, std::shared_ptr<MediaSource> src);
     void clear();
+    // Replaces any cached range overlapping [startFrame, endFrame)
+    void setRenderCache(long startFrame, long endFrame, std::shared_ptr<MediaSource> src);
+    void clearRenderCache();
     py::array_t<uint8_t> evaluate(double time);
+    // Export: frame ya convertido a YUV planar (yuv420p/nv12/yuv422p), 1D y empaquetado
+    py::array_t<uint8_t> evaluateYUV(double time, const std::string& pixFmt);
     py::array_t<float> render_audio(double startTime, double duration);
+
+    // Núcleo nativo (sin Python): el llamador NO debe tener el GIL.
+    // Lo usan evaluate/render_audio y el Exporter in-process.
+    // recycled: buffer previo para el lienzo (se toma si tiene capacidad).
+    Frame renderFrame(double time, std::vector<uint8_t>* recycled = nullptr);
+    std::vector<float> mixAudio(double startTime, double duration);
     
     // UTILS (Migración desde Python para rendimiento extremo)
     static std::string formatTimecode(double frame, double fps);
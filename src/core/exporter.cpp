@@ -0,0 +1,391 @@
+#include "exporter.h"
+#include "trace.h"
+#include <chrono>
+#include <condition_variable>
+#include <stdexcept>
+#include <thread>
+
+static std::string avErrorString(int err) {
+    char buf[AV_ERROR_MAX_STRING_SIZE] = {0};
+    av_strerror(err, buf, sizeof(buf));
+    return std::string(buf);
+}
+
+Exporter::Exporter(std::string p, int w, int h, double f,
+                   std::string videoCodec, std::string pixFmt,
+                   std::map<std::string, std::string> options,
+                   int audioBitrateBps)
+    : path(std::move(p)), width(w), height(h), fps(f),
+      videoCodecName(std::move(videoCodec)), pixFmtName(std::move(pixFmt)),
+      videoOptions(std::move(options)), audioBitrate(audioBitrateBps) {}
+
+Exporter::~Exporter() { close(); }
+
+// ============================================================================
+// SETUP / TEARDOWN
+// ============================================================================
+
+void Exporter::open(bool withAudio) {
+    int ret = avformat_alloc_output_context2(&fmtCtx, nullptr, nullptr, path.c_str());
+    if (ret < 0 || !fmtCtx)
+        throw std::runtime_error("[Exporter] Unsupported output container: " + path);
+
+    const bool globalHeader = (fmtCtx->oformat->flags & AVFMT_GLOBALHEADER) != 0;
+
+    // --- VIDEO ---
+    const AVCodec* vcodec = avcodec_find_encoder_by_name(videoCodecName.c_str());
+    if (!vcodec)
+        throw std::runtime_error("[Exporter] Encoder not available: " + videoCodecName);
+
+    videoStream = avformat_new_stream(fmtCtx, nullptr);
+    videoCtx = avcodec_alloc_context3(vcodec);
+    const AVRational rate = av_d2q(fps, 100000);
+    videoCtx->width = width;
+    videoCtx->height = height;
+    videoCtx->framerate = rate;
+    videoCtx->time_base = av_inv_q(rate);
+    videoCtx->sample_aspect_ratio = AVRational{1, 1};
+    const AVPixelFormat pixFmt = av_get_pix_fmt(pixFmtName.c_str());
+    videoCtx->pix_fmt = (pixFmt == AV_PIX_FMT_NONE) ? AV_PIX_FMT_YUV420P : pixFmt;
+    if (globalHeader)
+        videoCtx->flags |= AV_CODEC_FLAG_GLOBAL_HEADER;
+
+    AVDictionary* opts = nullptr;
+    for (const auto& [key, value] : videoOptions) {
+        if (key == "q" || key == "qscale") {
+            // Equivalente a "-q:v N" en la CLI de ffmpeg
+            videoCtx->flags |= AV_CODEC_FLAG_QSCALE;
+            videoCtx->global_quality = static_cast<int>(FF_QP2LAMBDA * std::atof(value.c_str()));
+        } else {
+            av_dict_set(&opts, key.c_str(), value.c_str(), 0);
+        }
+    }
+    ret = avcodec_open2(videoCtx, vcodec, &opts);
+    const AVDictionaryEntry* unused = nullptr;
+    while ((unused = av_dict_get(opts, "", unused, AV_DICT_IGNORE_SUFFIX)))
+        std::cerr << "[Exporter] Ignored encoder option: " << unused->key << std::endl;
+    av_dict_free(&opts);
+    if (ret < 0)
+        throw std::runtime_error("[Exporter] Could not open " + videoCodecName + ": " + avErrorString(ret));
+
+    avcodec_parameters_from_context(videoStream->codecpar, videoCtx);
+    videoStream->time_base = videoCtx->time_base;
+    videoStream->avg_frame_rate = rate;
+
+    videoFrame = av_frame_alloc();
+    videoFrame->format = videoCtx->pix_fmt;
+    videoFrame->width = width;
+    videoFrame->height = height;
+    if (av_frame_get_buffer(videoFrame, 0) < 0)
+        throw std::runtime_error("[Exporter] Could not allocate video frame");
+
+    if (!YuvConverter::isSupported(videoCtx->pix_fmt)) {
+        swsCtx = sws_getContext(width, height, AV_PIX_FMT_RGBA, width, height,
+                                videoCtx->pix_fmt, SWS_BICUBIC, nullptr, nullptr, nullptr);
+        if (!swsCtx)
+            throw std::runtime_error("[Exporter] Unsupported pixel format: " + pixFmtName);
+    }
+
+    // --- AUDIO (AAC, 44.1kHz stereo) ---
+    if (withAudio) {
+        const AVCodec* acodec = avcodec_find_encoder(AV_CODEC_ID_AAC);
+        if (!acodec)
+            throw std::runtime_error("[Exporter] AAC encoder not available");
+
+        audioStream = avformat_new_stream(fmtCtx, nullptr);
+        audioCtx = avcodec_alloc_context3(acodec);
+        audioCtx->sample_fmt = AV_SAMPLE_FMT_FLTP;
+        audioCtx->sample_rate = kSampleRate;
+        audioCtx->bit_rate = audioBitrate;
+        av_channel_layout_default(&audioCtx->ch_layout, 2);
+        audioCtx->time_base = AVRational{1, kSampleRate};
+        if (globalHeader)
+            audioCtx->flags |= AV_CODEC_FLAG_GLOBAL_HEADER;
+
+        ret = avcodec_open2(audioCtx, acodec, nullptr);
+        if (ret < 0)
+            throw std::runtime_error("[Exporter] Could not open AAC encoder: " + avErrorString(ret));
+
+        avcodec_parameters_from_context(audioStream->codecpar, audioCtx);
+        audioStream->time_base = audioCtx->time_base;
+        audioFrameSize = audioCtx->frame_size > 0 ? audioCtx->frame_size : 1024;
+
+        audioFrame = av_frame_alloc();
+        audioFrame->format = audioCtx->sample_fmt;
+        audioFrame->sample_rate = kSampleRate;
+        audioFrame->nb_samples = audioFrameSize;
+        av_channel_layout_copy(&audioFrame->ch_layout, &audioCtx->ch_layout);
+        if (av_frame_get_buffer(audioFrame, 0) < 0)
+            throw std::runtime_error("[Exporter] Could not allocate audio frame");
+    }
+
+    // --- CONTAINER ---
+    if (!(fmtCtx->oformat->flags & AVFMT_NOFILE)) {
+        ret = avio_open(&fmtCtx->pb, path.c_str(), AVIO_FLAG_WRITE);
+        if (ret < 0)
+            throw std::runtime_error("[Exporter] Could not open output file: " + avErrorString(ret));
+    }
+    ret = avformat_write_header(fmtCtx, nullptr);
+    if (ret < 0)
+        throw std::runtime_error("[Exporter] Could not write header: " + avErrorString(ret));
+
+    packet = av_packet_alloc();
+    pendingAudio.clear();
+    audioSamplesMixed = 0;
+    audioSamplesEncoded = 0;
+}
+
+void Exporter::close() {
+    if (swsCtx) { sws_freeContext(swsCtx); swsCtx = nullptr; }
+    if (videoFrame) av_frame_free(&videoFrame);
+    if (audioFrame) av_frame_free(&audioFrame);
+    if (packet) av_packet_free(&packet);
+    if (videoCtx) avcodec_free_context(&videoCtx);
+    if (audioCtx) avcodec_free_context(&audioCtx);
+    if (fmtCtx) {
+        if (!(fmtCtx->oformat->flags & AVFMT_NOFILE) && fmtCtx->pb)
+            avio_closep(&fmtCtx->pb);
+        avformat_free_context(fmtCtx);
+        fmtCtx = nullptr;
+    }
+    videoStream = nullptr;
+    audioStream = nullptr;
+}
+
+// ============================================================================
+// ENCODING
+// ============================================================================
+
+void Exporter::sendFrame(AVCodecContext* ctx, AVStream* stream, AVFrame* frame) {
+    int ret = avcodec_send_frame(ctx, frame);
+    if (ret < 0 && ret != AVERROR_EOF)
+        throw std::runtime_error("[Exporter] Encoding failed: " + avErrorString(ret));
+
+    while (true) {
+        ret = avcodec_receive_packet(ctx, packet);
+        if (ret == AVERROR(EAGAIN) || ret == AVERROR_EOF)
+            break;
+        if (ret < 0)
+            throw std::runtime_error("[Exporter] Encoding failed: " + avErrorString(ret));
+
+        av_packet_rescale_ts(packet, ctx->time_base, stream->time_base);
+        packet->stream_index = stream->index;
+        ret = av_interleaved_write_frame(fmtCtx, packet); // Takes the packet reference
+        if (ret < 0)
+            throw std::runtime_error("[Exporter] Muxing failed: " + avErrorString(ret));
+    }
+}
+
+void Exporter::encodeVideo(const Frame& frame, int64_t pts) {
+    TraceSpan span("encode_video");
+    if (av_frame_make_writable(videoFrame) < 0)
+        throw std::runtime_error("[Exporter] Video frame not writable");
+
+    if (swsCtx) {
+        const uint8_t* srcPointers[4] = {frame.data.data(), nullptr, nullptr, nullptr};
+        const int srcStrides[4] = {frame.width * 4, 0, 0, 0};
+        sws_scale(swsCtx, srcPointers, srcStrides, 0, frame.height,
+                  videoFrame->data, videoFrame->linesize);
+    } else {
+        // Conversión por bandas en paralelo (yuv420p / nv12 / yuv422p)
+        yuvConverter.convert(frame, videoCtx->pix_fmt, videoFrame->data, videoFrame->linesize);
+    }
+
+    videoFrame->pts = pts;
+    sendFrame(videoCtx, videoStream, videoFrame);
+}
+
+void Exporter::encodeAudioFrame(const float* interleaved, int samples) {
+    if (av_frame_make_writable(audioFrame) < 0)
+        throw std::runtime_error("[Exporter] Audio frame not writable");
+
+    audioFrame->nb_samples = samples;
+    float* left = reinterpret_cast<float*>(audioFrame->data[0]);
+    float* right = reinterpret_cast<float*>(audioFrame->data[1]);
+    for (int i = 0; i < samples; ++i) {
+        left[i] = interleaved[i * 2];
+        right[i] = interleaved[i * 2 + 1];
+    }
+    audioFrame->pts = audioSamplesEncoded;
+    audioSamplesEncoded += samples;
+    sendFrame(audioCtx, audioStream, audioFrame);
+}
+
+/**
+ * Mixes audio in 1 s blocks until `untilSample` is covered and encodes every
+ * complete AAC frame. Memory stays constant regardless of program length.
+ */
+void Exporter::pumpAudio(RockyEngine& engine, int64_t untilSample, int64_t totalSamples) {
+    if (!audioCtx)
+        return;
+
+    untilSample = std::min(untilSample, totalSamples);
+    while (audioSamplesMixed < untilSample) {
+        const int64_t block = std::min<int64_t>(kSampleRate, totalSamples - audioSamplesMixed);
+        std::vector<float> chunk = engine.mixAudio(
+            audioStartTime + static_cast<double>(audioSamplesMixed) / kSampleRate,
+            static_cast<double>(block) / kSampleRate);
+        chunk.resize(static_cast<size_t>(block) * 2, 0.0f); // Guard FP truncation in mixAudio
+        pendingAudio.insert(pendingAudio.end(), chunk.begin(), chunk.end());
+        audioSamplesMixed += block;
+    }
+
+    size_t offset = 0;
+    const size_t frameFloats = static_cast<size_t>(audioFrameSize) * 2;
+    while (pendingAudio.size() - offset >= frameFloats) {
+        encodeAudioFrame(pendingAudio.data() + offset, audioFrameSize);
+        offset += frameFloats;
+    }
+    pendingAudio.erase(pendingAudio.begin(), pendingAudio.begin() + offset);
+}
+
+void Exporter::flushAudio() {
+    if (!audioCtx)
+        return;
+    if (!pendingAudio.empty()) {
+        encodeAudioFrame(pendingAudio.data(), static_cast<int>(pendingAudio.size() / 2));
+        pendingAudio.clear();
+    }
+    sendFrame(audioCtx, audioStream, nullptr);
+}
+
+// ============================================================================
+// DRIVER
+// ============================================================================
+
+bool Exporter::run(const std::vector<std::shared_ptr<RockyEngine>>& engines,
+                   std::shared_ptr<RockyEngine> audioEngine, long totalFrames,
+                   ProgressCallback progress, int maxFramesInFlight,
+                   int chunkFrames, long startFrame) {
+    if (engines.empty())
+        throw std::invalid_argument("[Exporter] At least one engine is required");
+    if (totalFrames <= 0)
+        return true;
+
+    cancelled = false;
+    try {
+        open(audioEngine != nullptr);
+        audioStartTime = static_cast<double>(startFrame) / fps;
+    } catch (...) {
+        close();
+        throw;
+    }
+
+    const long window = std::max(1, maxFramesInFlight);
+    const long chunk = std::max(1, chunkFrames);
+
+    // Reorder buffer: los hilos renderizan trozos contiguos, el muxer consume en orden.
+    std::mutex queueMtx;
+    std::condition_variable queueCv;
+    std::map<long, Frame> ready;
+    long nextEmit = 0;
+    long nextChunk = 0;
+    bool stop = false;
+    std::string workerError;
+
+    auto worker = [&](std::shared_ptr<RockyEngine> engine) {
+        try {
+            while (true) {
+                long first;
+                {
+                    std::lock_guard<std::mutex> lock(queueMtx);
+                    if (stop) return;
+                    first = nextChunk * chunk;
+                    if (first >= totalFrames) return;
+                    ++nextChunk;
+                }
+                const long last = std::min(first + chunk, totalFrames);
+                for (long i = first; i < last; ++i) {
+                    {
+                        // Ventana acotada: nunca más de `window` frames por delante del muxer
+                        std::unique_lock<std::mutex> lock(queueMtx);
+                        queueCv.wait(lock, [&] { return stop || i < nextEmit + window; });
+                        if (stop) return;
+                    }
+                    Frame frame = engine->renderFrame(static_cast<double>(startFrame + i) / fps);
+                    {
+                        std::lock_guard<std::mutex> lock(queueMtx);
+                        ready.emplace(i, std::move(frame));
+                    }
+                    queueCv.notify_all();
+                }
+            }
+        } catch (const std::exception& e) {
+            {
+                std::lock_guard<std::mutex> lock(queueMtx);
+                if (workerError.empty()) workerError = e.what();
+                stop = true;
+            }
+            queueCv.notify_all();
+        }
+    };
+
+    std::vector<std::thread> threads;
+    threads.reserve(engines.size());
+    for (const auto& engine : engines)
+        threads.emplace_back(worker, engine);
+
+    auto stopWorkers = [&]() {
+        {
+            std::lock_guard<std::mutex> lock(queueMtx);
+            stop = true;
+        }
+        queueCv.notify_all();
+        for (auto& t : threads)
+            if (t.joinable()) t.join();
+    };
+
+    const int64_t totalSamples = std::llround(totalFrames / fps * kSampleRate);
+    bool completed = true;
+
+    try {
+        for (long i = 0; i < totalFrames; ++i) {
+            Frame frame(0, 0);
+            {
+                std::unique_lock<std::mutex> lock(queueMtx);
+                auto isReady = [&] { return stop || cancelled || ready.count(i) > 0; };
+                while (!isReady())
+                    queueCv.wait_for(lock, std::chrono::milliseconds(100)); // cancel() no notifica
+                if (!workerError.empty())
+                    throw std::runtime_error(workerError);
+                if (cancelled) {
+                    completed = false;
+                    break;
+                }
+                auto node = ready.extract(i);
+                frame = std::move(node.mapped());
+                ++nextEmit;
+            }
+            queueCv.notify_all();
+
+            if (frame.width != width || frame.height != height)
+                throw std::runtime_error("[Exporter] Engine resolution does not match export resolution");
+
+            encodeVideo(frame, i);
+            if (audioEngine)
+                pumpAudio(*audioEngine, std::llround((i + 1) / fps * kSampleRate), totalSamples);
+
+            if (progress && (i % 5 == 0 || i == totalFrames - 1))
+                progress(i + 1, totalFrames);
+        }
+        stopWorkers();
+
+        if (completed) {
+            if (audioEngine) {
+                pumpAudio(*audioEngine, totalSamples, totalSamples);
+                flushAudio();
+            }
+            sendFrame(videoCtx, videoStream, nullptr);
+            int ret = av_write_trailer(fmtCtx);
+            if (ret < 0)
+                throw std::runtime_error("[Exporter] Could not write trailer: " + avErrorString(ret));
+        }
+    } catch (...) {
+        stopWorkers();
+        close();
+        throw;
+    }
+
+    close();
+    return completed;
+}
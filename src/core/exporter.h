@@ -0,0 +1,77 @@
+#pragma once
+#include "common.h"
+#include "engine.h"
+#include "yuv_converter.h"
+#include <atomic>
+#include <functional>
+#include <map>
+
+/**
+ * @brief In-process encoder/muxer (libavcodec + libavformat).
+ *
+ * Alternative to piping rawvideo into an ffmpeg child process: frames are
+ * composited by one or more RockyEngine instances, converted with swscale and
+ * encoded without ever crossing into Python. Options mirror the CLI flags of
+ * FFmpegUtils.get_export_config (see EncoderConfig.to_codec_options).
+ */
+class Exporter {
+public:
+    using ProgressCallback = std::function<void(long, long)>;
+
+    Exporter(std::string path, int width, int height, double fps,
+             std::string videoCodec, std::string pixFmt,
+             std::map<std::string, std::string> videoOptions,
+             int audioBitrate = 192000);
+    ~Exporter();
+
+    /**
+     * Renders and encodes `totalFrames` frames. Each engine is driven by its own
+     * thread over contiguous chunks. `audioEngine` (may be null = no audio) is
+     * mixed in 1 s blocks on the muxing thread; it must not be one of `engines`
+     * because VideoSource shares one demuxer between audio and video reads.
+     * `startFrame` offsets the rendered range (segment / smart-render exports).
+     * @return true when finished, false when cancelled. Throws on error.
+     */
+    bool run(const std::vector<std::shared_ptr<RockyEngine>>& engines,
+             std::shared_ptr<RockyEngine> audioEngine, long totalFrames,
+             ProgressCallback progress, int maxFramesInFlight = 8,
+             int chunkFrames = 8, long startFrame = 0);
+
+    void cancel() { cancelled = true; }
+
+private:
+    std::string path;
+    int width, height;
+    double fps;
+    std::string videoCodecName, pixFmtName;
+    std::map<std::string, std::string> videoOptions;
+    int audioBitrate;
+    static constexpr int kSampleRate = 44100;
+
+    std::atomic<bool> cancelled{false};
+
+    AVFormatContext* fmtCtx = nullptr;
+    AVCodecContext* videoCtx = nullptr;
+    AVCodecContext* audioCtx = nullptr;
+    AVStream* videoStream = nullptr;
+    AVStream* audioStream = nullptr;
+    AVFrame* videoFrame = nullptr;
+    AVFrame* audioFrame = nullptr;
+    AVPacket* packet = nullptr;
+    SwsContext* swsCtx = nullptr;   // Solo para formatos que YuvConverter no cubre
+    YuvConverter yuvConverter;
+
+    std::vector<float> pendingAudio; // Interleaved stereo, not yet encoded
+    int audioFrameSize = 1024;
+    int64_t audioSamplesMixed = 0;
+    int64_t audioSamplesEncoded = 0;
+    double audioStartTime = 0.0; // Program time of audio sample 0
+
+    void open(bool withAudio);
+    void close();
+    void encodeVideo(const Frame& frame, int64_t pts);
+    void pumpAudio(RockyEngine& engine, int64_t untilSample, int64_t totalSamples);
+    void flushAudio();
+    void encodeAudioFrame(const float* interleaved, int samples);
+    void sendFrame(AVCodecContext* ctx, AVStream* stream, AVFrame* frame);
+};
@@ -1,4 +1,5 @@
 #include "media_source.h"
+#include "stats.h"
 #include <libavutil/display.h>
 
 static std::mutex g_ff_mtx;
@@ -28,7 +29,7 @@ Frame ColorSource::getFrame(double /*localTime*/, int w, int h) {
 // VIDEO SOURCE IMPLEMENTATION (FFMPEG)
 // ============================================================================
 
-VideoSource::VideoSource(std::string p) : path(p) {
+VideoSource::VideoSource(std::string p, int decodeThreads) : path(p) {
   {
     std::lock_guard<std::mutex> lock(g_ff_mtx);
 
@@ -73,12 +74,22 @@ VideoSource::VideoSource(std::string p) : path(p) {
         fmt_ctx->streams[video_stream_idx]->codecpar->codec_id);
     if (v_codec) {
       codec_ctx = avcodec_alloc_context3(v_codec);
+      EngineStats::instance().adjust(Gauge::OpenDecoders, 1);
       avcodec_parameters_to_context(
           codec_ctx, fmt_ctx->streams[video_stream_idx]->codecpar);
 
       // Optimización de decodificación: Multihilo y flags de rendimiento
-      codec_ctx->thread_count = 0; // Auto-detectar núcleos
+      codec_ctx->thread_count =
+          decodeThreads > 0 ? decodeThreads : 0; // 0 = Auto-detectar núcleos
       codec_ctx->thread_type = FF_THREAD_FRAME | FF_THREAD_SLICE;
+
+      const AVCodecDescriptor *desc = avcodec_descriptor_get(v_codec->id);
+      intra_codec = desc && (desc->props & AV_CODEC_PROP_INTRA_ONLY);
+      if (intra_codec) {
+        // Con hilos por frame el decoder retiene N paquetes antes de
+        // devolver el primero: en scrub eso son N decodificaciones por seek
+        codec_ctx->thread_type = FF_THREAD_SLICE;
+      }
       codec_ctx->flags2 |= AV_CODEC_FLAG2_FAST;
 
       {
@@ -93,6 +104,7 @@ VideoSource::VideoSource(std::string p) : path(p) {
         fmt_ctx->streams[audio_stream_idx]->codecpar->codec_id);
     if (a_codec) {
       audio_codec_ctx = avcodec_alloc_context3(a_codec);
+      EngineStats::instance().adjust(Gauge::OpenDecoders, 1);
       avcodec_parameters_to_context(
           audio_codec_ctx, fmt_ctx->streams[audio_stream_idx]->codecpar);
       audio_codec_ctx->thread_count = 0;
@@ -120,10 +132,14 @@ VideoSource::~VideoSource() {
     av_frame_free(&audio_frame);
   if (pkt)
     av_packet_free(&pkt);
-  if (codec_ctx)
+  if (codec_ctx) {
     avcodec_free_context(&codec_ctx);
-  if (audio_codec_ctx)
+    EngineStats::instance().adjust(Gauge::OpenDecoders, -1);
+  }
+  if (audio_codec_ctx) {
     avcodec_free_context(&audio_codec_ctx);
+    EngineStats::instance().adjust(Gauge::OpenDecoders, -1);
+  }
   if (cached_swr)
     swr_free(&cached_swr);
   if (fmt_ctx)
@@ -181,6 +197,7 @@ Frame VideoSource::getFrame(double localTime, int w, int h) {
 
   if (last_frame && std::abs(localTime - last_time) < 0.001 && w == last_w &&
       h == last_h) {
+    EngineStats::instance().increment(Counter::FrameCacheHits);
     return *last_frame;
   }
 
@@ -188,21 +205,41 @@ Frame VideoSource::getFrame(double localTime, int w, int h) {
   if (!is_valid || !codec_ctx)
     return Frame(w, h);
 
+  EngineStats &stats = EngineStats::instance();
+  const int64_t decodeStart = EngineStats::nowNs();
+
   const AVRational timeBase = fmt_ctx->streams[video_stream_idx]->time_base;
   const int64_t targetPts =
       static_cast<int64_t>(localTime / av_q2d(timeBase) + 0.001);
 
+  const bool intra = isIntraOnly();
   if (localTime < last_time || localTime > last_time + 1.0) {
     if (avcodec_is_open(codec_ctx))
       avcodec_flush_buffers(codec_ctx);
     av_seek_frame(fmt_ctx, video_stream_idx, targetPts, AVSEEK_FLAG_BACKWARD);
+    stats.increment(Counter::Seeks);
   }
 
   while (av_read_frame(fmt_ctx, pkt) >= 0) {
     if (pkt->stream_index == video_stream_idx) {
+      if (pkt->flags & AV_PKT_FLAG_KEY) {
+        key_run++;
+      } else {
+        seen_nonkey = true;
+      }
+      // OPTIMIZACIÓN: Intra-only -> los paquetes anteriores al objetivo no
+      // hacen falta para decodificarlo; se descartan sin pasar por el decoder
+      // y el seek (o el avance corto) decodifica exactamente un frame.
+      if (intra && pkt->pts != AV_NOPTS_VALUE && pkt->pts < targetPts) {
+        stats.increment(Counter::PacketsSkipped);
+        av_packet_unref(pkt);
+        continue;
+      }
       if (avcodec_send_packet(codec_ctx, pkt) >= 0) {
         while (avcodec_receive_frame(codec_ctx, av_frame) >= 0) {
           if (av_frame->pts >= targetPts) {
+            recordStage(Stage::Decode, decodeStart, EngineStats::nowNs());
+            StageTimer scaleTimer(Stage::Scale);
             Frame outputFrame(w, h, 4);
             std::fill(outputFrame.data.begin(), outputFrame.data.end(), 0);
 
@@ -242,6 +279,7 @@ Frame VideoSource::getFrame(double localTime, int w, int h) {
     }
     av_packet_unref(pkt);
   }
+  recordStage(Stage::Decode, decodeStart, EngineStats::nowNs());
   return last_frame ? *last_frame : Frame(w, h);
 }
 
@@ -250,13 +288,17 @@ std::vector<float> VideoSource::getAudioSamples(double startTime,
   std::lock_guard<std::mutex> lock(mtx);
   if (!audio_codec_ctx || audio_stream_idx == -1)
     return {};
+  StageTimer decodeTimer(Stage::AudioDecode);
 
   const int target_channels = 2;
   const int target_sample_rate = 44100;
-  const size_t target_sample_count =
-      static_cast<size_t>(duration * target_sample_rate);
-  std::vector<float> samples;
-  samples.reserve(target_sample_count * target_channels);
+  // Sample-exact window: consecutive chunks [a, b) + [b, c) tile without gaps
+  const int64_t startSample = std::llround(startTime * target_sample_rate);
+  const int64_t target_sample_count =
+      std::max<int64_t>(0, std::llround(duration * target_sample_rate));
+  const int64_t endSample = startSample + target_sample_count;
+  std::vector<float> samples(target_sample_count * target_channels, 0.0f);
+  int64_t cursor = startSample; // Next output sample still to be filled
 
   if (!cached_swr) {
     // FFmpeg 7.x: Use new AVChannelLayout API
@@ -268,61 +310,99 @@ std::vector<float> VideoSource::getAudioSamples(double startTime,
     swr_init(cached_swr);
   }
 
+  // Copies the overlap of [bufStart, bufStart + count) into the output window
+  // and keeps whatever lies past endSample for the next sequential call.
+  auto consume = [&](const float *buf, int64_t bufStart, int64_t count) {
+    const int64_t bufEnd = bufStart + count;
+    if (bufEnd <= cursor)
+      return;
+    if (bufStart > cursor)
+      cursor = std::min(bufStart, endSample); // Hueco real en el stream: silencio
+    const int64_t copyEnd = std::min(bufEnd, endSample);
+    if (copyEnd > cursor) {
+      std::copy(buf + (cursor - bufStart) * target_channels,
+                buf + (copyEnd - bufStart) * target_channels,
+                samples.begin() + (cursor - startSample) * target_channels);
+      cursor = copyEnd;
+    }
+    if (bufEnd > endSample && cursor == endSample) {
+      const int64_t from = std::max(bufStart, endSample);
+      const int64_t carried =
+          static_cast<int64_t>(audio_carry.size() / target_channels);
+      if (audio_carry.empty() || audio_carry_start + carried != from) {
+        audio_carry.clear();
+        audio_carry_start = from;
+      }
+      audio_carry.insert(audio_carry.end(),
+                         buf + (from - bufStart) * target_channels,
+                         buf + count * target_channels);
+    }
+  };
+
   const AVRational timeBase = fmt_ctx->streams[audio_stream_idx]->time_base;
   const int64_t targetPts = static_cast<int64_t>(startTime / av_q2d(timeBase));
 
-  if (std::abs(startTime - last_audio_time) > 0.5) {
-    avcodec_flush_buffers(audio_codec_ctx);
-    av_seek_frame(fmt_ctx, audio_stream_idx, targetPts, AVSEEK_FLAG_BACKWARD);
+  if (!audio_carry.empty() && audio_carry_start == startSample) {
+    // Llamada secuencial: empezar por las muestras sobrantes del chunk anterior
+    std::vector<float> carry = std::move(audio_carry);
+    audio_carry.clear();
+    consume(carry.data(), startSample,
+            static_cast<int64_t>(carry.size() / target_channels));
+  } else {
+    audio_carry.clear();
+    const bool behind = audio_next_sample < 0 || startSample < audio_next_sample;
+    if (behind || std::abs(startTime - last_audio_time) > 0.5) {
+      avcodec_flush_buffers(audio_codec_ctx);
+      swr_init(cached_swr); // Drop resampler history from the old position
+      av_seek_frame(fmt_ctx, audio_stream_idx, targetPts, AVSEEK_FLAG_BACKWARD);
+      EngineStats::instance().increment(Counter::AudioSeeks);
+      audio_next_sample = -1; // Re-anchor on the next decoded frame's pts
+    }
   }
 
-  while (av_read_frame(fmt_ctx, pkt) >= 0) {
+  std::vector<float> resampledBuffer;
+  while (cursor < endSample && av_read_frame(fmt_ctx, pkt) >= 0) {
     if (pkt->stream_index == audio_stream_idx) {
       if (avcodec_send_packet(audio_codec_ctx, pkt) >= 0) {
         while (avcodec_receive_frame(audio_codec_ctx, audio_frame) >= 0) {
-          double frameStart = audio_frame->pts * av_q2d(timeBase);
-          double frameEnd = frameStart + (double)audio_frame->nb_samples /
-                                             audio_codec_ctx->sample_rate;
-
-          if (frameEnd > startTime) {
-            int out_samples =
-                swr_get_out_samples(cached_swr, audio_frame->nb_samples);
-            std::vector<float> resampledBuffer(out_samples * target_channels);
-            float *out_data[1] = {resampledBuffer.data()};
-            swr_convert(cached_swr, (uint8_t **)out_data, out_samples,
-                        (const uint8_t **)audio_frame->data,
-                        audio_frame->nb_samples);
-
-            double copyStart = std::max(startTime, frameStart);
-            double copyEnd = std::min(startTime + duration, frameEnd);
-            if (copyEnd > copyStart) {
-              size_t copyOffset = static_cast<size_t>((copyStart - frameStart) *
-                                                      target_sample_rate) *
-                                  target_channels;
-              size_t availToCopy = static_cast<size_t>((copyEnd - copyStart) *
-                                                       target_sample_rate) *
-                                   target_channels;
-              if (samples.size() + availToCopy <=
-                  target_sample_count * target_channels) {
-                samples.insert(
-                    samples.end(), resampledBuffer.begin() + copyOffset,
-                    resampledBuffer.begin() + copyOffset + availToCopy);
-              }
-            }
-          }
-          last_audio_time = frameEnd;
+          const int64_t pts = (audio_frame->pts != AV_NOPTS_VALUE)
+                                  ? audio_frame->pts
+                                  : audio_frame->best_effort_timestamp;
+          const double frameStart = pts * av_q2d(timeBase);
+
+          int out_samples =
+              swr_get_out_samples(cached_swr, audio_frame->nb_samples);
+          resampledBuffer.resize(out_samples * target_channels);
+          float *out_data[1] = {resampledBuffer.data()};
+          // swr_convert devuelve las muestras REALES (out_samples es solo una cota)
+          const int got = swr_convert(cached_swr, (uint8_t **)out_data,
+                                      out_samples,
+                                      (const uint8_t **)audio_frame->data,
+                                      audio_frame->nb_samples);
           av_frame_unref(audio_frame);
-          if (samples.size() >= target_sample_count * target_channels)
-            break;
+          if (got <= 0)
+            continue;
+
+          // Se ancla por pts tras un seek y cada vez que la posición deriva:
+          // getFrame() lee por el mismo demuxer y descarta los paquetes de
+          // audio que atraviesa, así que el stream no es contiguo entre
+          // llamadas. Sin re-anclar, el audio quedaría adelantado al vídeo.
+          const int64_t ptsSample = std::llround(frameStart * target_sample_rate);
+          if (audio_next_sample < 0 ||
+              std::llabs(ptsSample - audio_next_sample) > kAudioResyncSamples)
+            audio_next_sample = ptsSample;
+          const int64_t bufStart = audio_next_sample;
+          audio_next_sample += got;
+          last_audio_time =
+              static_cast<double>(audio_next_sample) / target_sample_rate;
+
+          // Se drena el paquete completo: lo que sobre queda en audio_carry
+          consume(resampledBuffer.data(), bufStart, got);
         }
       }
     }
     av_packet_unref(pkt);
-    if (samples.size() >= target_sample_count * target_channels)
-      break;
   }
-  if (samples.size() < target_sample_count * target_channels)
-    samples.resize(target_sample_count * target_channels, 0.0f);
   return samples;
 }
 
@@ -345,6 +425,80 @@ std::vector<float> VideoSource::getWaveform(int points) {
   return peaks;
 }
 
+std::vector<std::pair<double, Frame>>
+VideoSource::getKeyframeThumbnails(int thumbW, int thumbH, double minInterval) {
+  std::vector<std::pair<double, Frame>> thumbs;
+  std::lock_guard<std::mutex> lock(mtx);
+  if (!is_valid || !codec_ctx || thumbW <= 0 || thumbH <= 0)
+    return thumbs;
+
+  AVStream *stream = fmt_ctx->streams[video_stream_idx];
+  const double timeBase = av_q2d(stream->time_base);
+  const int64_t startPts =
+      stream->start_time != AV_NOPTS_VALUE ? stream->start_time : 0;
+  SwsContext *thumbSws = nullptr;
+  double lastEmitted = -1e9;
+
+  // El decoder deja de producir frames que no sean clave
+  avcodec_flush_buffers(codec_ctx);
+  codec_ctx->skip_frame = AVDISCARD_NONKEY;
+  av_seek_frame(fmt_ctx, video_stream_idx, startPts, AVSEEK_FLAG_BACKWARD);
+
+  auto emitFrame = [&]() {
+    const int64_t pts = av_frame->best_effort_timestamp != AV_NOPTS_VALUE
+                            ? av_frame->best_effort_timestamp
+                            : av_frame->pts;
+    const double t = pts != AV_NOPTS_VALUE ? (pts - startPts) * timeBase : 0.0;
+    if (t - lastEmitted < minInterval)
+      return;
+    thumbSws = sws_getCachedContext(
+        thumbSws, av_frame->width, av_frame->height,
+        static_cast<AVPixelFormat>(av_frame->format), thumbW, thumbH,
+        AV_PIX_FMT_RGB24, SWS_BILINEAR, nullptr, nullptr, nullptr);
+    if (!thumbSws)
+      return;
+    Frame thumb(thumbW, thumbH, 3);
+    uint8_t *dst[4] = {thumb.data.data(), nullptr, nullptr, nullptr};
+    int dstStrides[4] = {thumbW * 3, 0, 0, 0};
+    sws_scale(thumbSws, av_frame->data, av_frame->linesize, 0, av_frame->height,
+              dst, dstStrides);
+    thumbs.emplace_back(std::max(0.0, t), std::move(thumb));
+    lastEmitted = t;
+  };
+
+  {
+    StageTimer decodeTimer(Stage::Decode);
+    while (av_read_frame(fmt_ctx, pkt) >= 0) {
+      const bool wanted =
+          pkt->stream_index == video_stream_idx && (pkt->flags & AV_PKT_FLAG_KEY) &&
+          (pkt->pts == AV_NOPTS_VALUE ||
+           (pkt->pts - startPts) * timeBase - lastEmitted >= minInterval);
+      if (wanted && avcodec_send_packet(codec_ctx, pkt) >= 0) {
+        while (avcodec_receive_frame(codec_ctx, av_frame) >= 0) {
+          emitFrame();
+          av_frame_unref(av_frame);
+        }
+      }
+      av_packet_unref(pkt);
+    }
+    // Frames retenidos por el decoder multihilo
+    avcodec_send_packet(codec_ctx, nullptr);
+    while (avcodec_receive_frame(codec_ctx, av_frame) >= 0) {
+      emitFrame();
+      av_frame_unref(av_frame);
+    }
+  }
+
+  // Deja la fuente lista para getFrame normal (fuerza un seek en la siguiente)
+  sws_freeContext(thumbSws);
+  codec_ctx->skip_frame = AVDISCARD_DEFAULT;
+  avcodec_flush_buffers(codec_ctx);
+  last_frame = nullptr;
+  last_time = -1.0;
+  EngineStats::instance().increment(Counter::Seeks);
+  return thumbs;
+}
+
 double VideoSource::getDuration() {
   if (!fmt_ctx)
     return 0.0;
@@ -37,20 +37,44 @@ class VideoSource : public MediaSource {
   // Validation flag to prevent crashes with corrupted files (P6)
   bool is_valid = false;
 
+  // Intra-only (MJPEG, ProRes, DNxHD... o todo keyframes): cada paquete se
+  // decodifica solo, así que un seek no recorre el GOP. intra_codec viene
+  // del descriptor del codec; key_run detecta streams all-intra de codecs
+  // inter (H.264 -g 1) hasta ver el primer paquete no-key.
+  bool intra_codec = false;
+  int key_run = 0;
+  bool seen_nonkey = false;
+  static constexpr int kIntraKeyRun = 16;
+
   int last_w = -1, last_h = -1;
   std::shared_ptr<Frame> last_frame = nullptr; // P5: Thread-safe frame caching
   double last_time = -1.0;
   double last_audio_time = -1.0;
+  // Streaming continuo: muestras decodificadas más allá del final del chunk
+  // anterior (se reutilizan en la siguiente llamada secuencial, sin huecos).
+  std::vector<float> audio_carry;   // Stereo interleaved @ 44.1kHz
+  int64_t audio_carry_start = -1;   // Output sample index of audio_carry[0]
+  int64_t audio_next_sample = -1;   // Output sample index of the next swr sample
+  // Deriva pts vs. posición contigua tolerada antes de re-anclar (10 ms; cubre
+  // el retardo del resampler y el redondeo de pts)
+  static constexpr int64_t kAudioResyncSamples = 441;
   SwrContext *cached_swr = nullptr;
   std::once_flag swr_init_flag; // P3: Thread-safe SwrContext initialization
   mutable std::mutex mtx;
 
 public:
-  VideoSource(std::string p);
+  // decodeThreads = 0 deja que FFmpeg auto-detecte los núcleos. Los motores de
+  // exportación paralela pasan un valor menor para no sobre-suscribir la CPU.
+  VideoSource(std::string p, int decodeThreads = 0);
   ~VideoSource();
   Frame getFrame(double localTime, int w, int h) override;
   std::vector<float> getAudioSamples(double startTime, double duration);
   std::vector<float> getWaveform(int points);
+  // Filmstrip: one sequential pass over the keyframes only (non-key packets
+  // are never decoded), each scaled straight to thumbW x thumbH RGB24.
+  // Keyframes closer than minInterval seconds to the previous one are skipped.
+  std::vector<std::pair<double, Frame>> getKeyframeThumbnails(int thumbW, int thumbH,
+                                                              double minInterval);
   double getDuration() override;
   bool isValid() const { return is_valid; } // P6: Expose validation status
 
@@ -60,6 +84,9 @@ public:
   int getNativeWidth() const;
   int getNativeHeight() const;
   int getRotation() const; // Implemented in cpp
+  bool isIntraOnly() const {
+    return intra_codec || (!seen_nonkey && key_run >= kIntraKeyRun);
+  }
 };
 
 class ImageSource : public MediaSource {
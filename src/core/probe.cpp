@@ -0,0 +1,71 @@
+#include "probe.h"
+
+MediaInfo probeMedia(const std::string &path) {
+  MediaInfo info;
+  AVFormatContext *fmt = nullptr;
+
+  // Mismos límites que el ffprobe anterior (-probesize/-analyzeduration 20M)
+  AVDictionary *opts = nullptr;
+  av_dict_set(&opts, "probesize", "20000000", 0);
+  av_dict_set(&opts, "analyzeduration", "20000000", 0);
+  int ret = avformat_open_input(&fmt, path.c_str(), nullptr, &opts);
+  av_dict_free(&opts);
+  if (ret < 0) {
+    info.error = "avformat_open_input failed";
+    return info;
+  }
+  if (avformat_find_stream_info(fmt, nullptr) < 0) {
+    info.error = "avformat_find_stream_info failed";
+    avformat_close_input(&fmt);
+    return info;
+  }
+
+  const int v = av_find_best_stream(fmt, AVMEDIA_TYPE_VIDEO, -1, -1, nullptr, 0);
+  const int a = av_find_best_stream(fmt, AVMEDIA_TYPE_AUDIO, -1, -1, nullptr, 0);
+
+  if (fmt->duration != AV_NOPTS_VALUE && fmt->duration > 0)
+    info.duration = fmt->duration / (double)AV_TIME_BASE;
+
+  if (v >= 0) {
+    AVStream *st = fmt->streams[v];
+    AVCodecParameters *par = st->codecpar;
+    info.hasVideo = true;
+    info.width = par->width;
+    info.height = par->height;
+    info.codec = avcodec_get_name(par->codec_id);
+    const char *pix = av_get_pix_fmt_name(static_cast<AVPixelFormat>(par->format));
+    info.pixFmt = pix ? pix : "";
+
+    AVRational rate = av_guess_frame_rate(fmt, st, nullptr);
+    if (rate.num > 0 && rate.den > 0)
+      info.fps = av_q2d(rate);
+    // Como ffprobe: la duración del stream de vídeo tiene prioridad
+    if (st->duration != AV_NOPTS_VALUE && st->duration > 0)
+      info.duration = st->duration * av_q2d(st->time_base);
+
+    const AVPacketSideData *sd = av_packet_side_data_get(
+        par->coded_side_data, par->nb_coded_side_data, AV_PKT_DATA_DISPLAYMATRIX);
+    if (sd) {
+      info.rotation = (int)std::round(av_display_rotation_get((const int32_t *)sd->data));
+    } else if (AVDictionaryEntry *tag = av_dict_get(st->metadata, "rotate", nullptr, 0)) {
+      info.rotation = std::atoi(tag->value);
+    } else if (AVDictionaryEntry *tag = av_dict_get(fmt->metadata, "rotate", nullptr, 0)) {
+      info.rotation = std::atoi(tag->value);
+    }
+  }
+
+  if (a >= 0) {
+    AVCodecParameters *par = fmt->streams[a]->codecpar;
+    info.hasAudio = true;
+    info.sampleRate = par->sample_rate;
+    info.channels = par->ch_layout.nb_channels;
+    if (!info.hasVideo)
+      info.codec = avcodec_get_name(par->codec_id);
+  }
+
+  info.valid = info.hasVideo || info.hasAudio;
+  if (!info.valid)
+    info.error = "no audio or video streams";
+  avformat_close_input(&fmt);
+  return info;
+}
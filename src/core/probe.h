@@ -0,0 +1,28 @@
+#pragma once
+#include "common.h"
+
+/**
+ * @brief In-process media probe (replaces one ffprobe subprocess per call).
+ *
+ * Opens the container with libavformat, reads stream info and closes it;
+ * nothing is decoded. Field semantics match FFmpegUtils.get_media_specs:
+ * width/height are the coded (native) size and rotation is the display
+ * matrix angle as ffprobe reports it (counter-clockwise, e.g. -90).
+ */
+struct MediaInfo {
+  bool valid = false;
+  bool hasVideo = false;
+  bool hasAudio = false;
+  int width = 0;
+  int height = 0;
+  double fps = 30.0;
+  double duration = 10.0;
+  int rotation = 0;
+  std::string codec;
+  std::string pixFmt;
+  int sampleRate = 0;
+  int channels = 0;
+  std::string error;
+};
+
+MediaInfo probeMedia(const std::string &path);
@@ -0,0 +1,68 @@
+#include "stats.h"
+
+EngineStats& EngineStats::instance() {
+    static EngineStats stats;
+    return stats;
+}
+
+EngineStats::EngineStats() {
+    for (auto& v : stageNs) v.store(0);
+    for (auto& v : stageCalls) v.store(0);
+    for (auto& v : counters) v.store(0);
+    for (auto& v : gauges) v.store(0);
+    resetAtNs.store(nowNs());
+}
+
+void EngineStats::reset() {
+    for (auto& v : stageNs) v.store(0, std::memory_order_relaxed);
+    for (auto& v : stageCalls) v.store(0, std::memory_order_relaxed);
+    for (auto& v : counters) v.store(0, std::memory_order_relaxed);
+    resetAtNs.store(nowNs(), std::memory_order_relaxed);
+}
+
+StatsSnapshot EngineStats::snapshot() const {
+    StatsSnapshot s{};
+    for (int i = 0; i < idx(Stage::Count); ++i) {
+        s.stageNs[i] = stageNs[i].load(std::memory_order_relaxed);
+        s.stageCalls[i] = stageCalls[i].load(std::memory_order_relaxed);
+    }
+    for (int i = 0; i < idx(Counter::Count); ++i)
+        s.counters[i] = counters[i].load(std::memory_order_relaxed);
+    for (int i = 0; i < idx(Gauge::Count); ++i)
+        s.gauges[i] = gauges[i].load(std::memory_order_relaxed);
+    s.elapsedSeconds = (nowNs() - resetAtNs.load(std::memory_order_relaxed)) / 1e9;
+    return s;
+}
+
+const char* EngineStats::name(Stage s) {
+    switch (s) {
+    case Stage::Decode: return "decode";
+    case Stage::Scale: return "scale";
+    case Stage::Transform: return "transform";
+    case Stage::Effect: return "effect";
+    case Stage::Blend: return "blend";
+    case Stage::AudioDecode: return "audio_decode";
+    case Stage::Mix: return "mix";
+    default: return "unknown";
+    }
+}
+
+const char* EngineStats::name(Counter c) {
+    switch (c) {
+    case Counter::Frames: return "frames";
+    case Counter::AudioChunks: return "audio_chunks";
+    case Counter::Seeks: return "seeks";
+    case Counter::AudioSeeks: return "audio_seeks";
+    case Counter::FrameCacheHits: return "frame_cache_hits";
+    case Counter::RenderCacheHits: return "render_cache_hits";
+    case Counter::PacketsSkipped: return "packets_skipped";
+    default: return "unknown";
+    }
+}
+
+const char* EngineStats::name(Gauge g) {
+    switch (g) {
+    case Gauge::OpenDecoders: return "open_decoders";
+    default: return "unknown";
+    }
+}
@@ -0,0 +1,105 @@
+#pragma once
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include "trace.h"
+
+/**
+ * @brief Process-wide per-stage timers and counters for the render pipeline.
+ *
+ * Everything is a relaxed atomic: recording costs one steady_clock read per
+ * boundary and one fetch_add, so it stays enabled in release builds. Stage
+ * times are summed over all threads (parallel layers add up), so per-frame
+ * values read as CPU work, not wall time.
+ */
+enum class Stage {
+    Decode = 0,   // demux + decode until the target frame
+    Scale,        // sws_scale to RGBA
+    Transform,    // opacity envelope + affine transform loop (Clip::render)
+    Effect,       // OFX plugins
+    Blend,        // canvas compositing
+    AudioDecode,  // demux + decode + swr (VideoSource::getAudioSamples)
+    Mix,          // summing, master gain and limiter
+    Count
+};
+
+enum class Counter {
+    Frames = 0,       // composited video frames (renderFrame)
+    AudioChunks,      // mixAudio calls
+    Seeks,            // video av_seek_frame
+    AudioSeeks,       // audio av_seek_frame
+    FrameCacheHits,   // VideoSource last-frame reuse
+    RenderCacheHits,  // pre-rendered range served instead of compositing
+    PacketsSkipped,   // intra-only seek: packets before the target never decoded
+    Count
+};
+
+enum class Gauge {
+    OpenDecoders = 0, // live decoder contexts (video + audio)
+    Count
+};
+
+struct StatsSnapshot {
+    int64_t stageNs[static_cast<int>(Stage::Count)];
+    int64_t stageCalls[static_cast<int>(Stage::Count)];
+    int64_t counters[static_cast<int>(Counter::Count)];
+    int64_t gauges[static_cast<int>(Gauge::Count)];
+    double elapsedSeconds; // since the last reset
+};
+
+class EngineStats {
+public:
+    static EngineStats& instance();
+
+    static int64_t nowNs() {
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(
+                   std::chrono::steady_clock::now().time_since_epoch()).count();
+    }
+
+    void addTime(Stage s, int64_t ns) {
+        stageNs[idx(s)].fetch_add(ns, std::memory_order_relaxed);
+        stageCalls[idx(s)].fetch_add(1, std::memory_order_relaxed);
+    }
+    void increment(Counter c, int64_t n = 1) {
+        counters[idx(c)].fetch_add(n, std::memory_order_relaxed);
+    }
+    void adjust(Gauge g, int64_t delta) {
+        gauges[idx(g)].fetch_add(delta, std::memory_order_relaxed);
+    }
+
+    // Zeroes stage times and counters. Gauges describe live state and are kept.
+    void reset();
+    StatsSnapshot snapshot() const;
+
+    static const char* name(Stage s);
+    static const char* name(Counter c);
+    static const char* name(Gauge g);
+
+private:
+    EngineStats();
+    template <typename E> static constexpr int idx(E e) { return static_cast<int>(e); }
+
+    std::atomic<int64_t> stageNs[static_cast<int>(Stage::Count)];
+    std::atomic<int64_t> stageCalls[static_cast<int>(Stage::Count)];
+    std::atomic<int64_t> counters[static_cast<int>(Counter::Count)];
+    std::atomic<int64_t> gauges[static_cast<int>(Gauge::Count)];
+    std::atomic<int64_t> resetAtNs;
+};
+
+// Adds [startNs, endNs) to `stage` and, while tracing, emits it as a span
+inline void recordStage(Stage s, int64_t startNs, int64_t endNs) {
+    EngineStats::instance().addTime(s, endNs - startNs);
+    if (TraceRecorder::enabled())
+        TraceRecorder::instance().complete(EngineStats::name(s), startNs, endNs);
+}
+
+// RAII: adds the scope duration to `stage`
+class StageTimer {
+    Stage stage;
+    int64_t start;
+public:
+    explicit StageTimer(Stage s) : stage(s), start(EngineStats::nowNs()) {}
+    ~StageTimer() { recordStage(stage, start, EngineStats::nowNs()); }
+    StageTimer(const StageTimer&) = delete;
+    StageTimer& operator=(const StageTimer&) = delete;
+};
@@ -0,0 +1,75 @@
+#include "trace.h"
+#include "stats.h"
+
+#if defined(_WIN32)
+#ifndef NOMINMAX
+#define NOMINMAX
+#endif
+#include <windows.h>
+#elif defined(__APPLE__)
+#include <pthread.h>
+#else
+#include <sys/syscall.h>
+#include <unistd.h>
+#endif
+
+TraceRecorder& TraceRecorder::instance() {
+    static TraceRecorder recorder;
+    return recorder;
+}
+
+uint64_t TraceRecorder::currentThreadId() {
+    // Mismo id que threading.get_native_id() en Python
+    thread_local uint64_t tid = []() -> uint64_t {
+#if defined(_WIN32)
+        return static_cast<uint64_t>(GetCurrentThreadId());
+#elif defined(__APPLE__)
+        uint64_t id = 0;
+        pthread_threadid_np(nullptr, &id);
+        return id;
+#else
+        return static_cast<uint64_t>(syscall(SYS_gettid));
+#endif
+    }();
+    return tid;
+}
+
+void TraceRecorder::start() {
+    std::lock_guard<std::mutex> lock(mtx);
+    events.clear();
+    droppedEvents.store(0, std::memory_order_relaxed);
+    active.store(true, std::memory_order_relaxed);
+}
+
+void TraceRecorder::stop() {
+    active.store(false, std::memory_order_relaxed);
+}
+
+void TraceRecorder::complete(const char* name, int64_t startNs, int64_t endNs, std::string detail) {
+    const uint64_t tid = currentThreadId();
+    std::lock_guard<std::mutex> lock(mtx);
+    if (events.size() >= kMaxEvents) {
+        droppedEvents.fetch_add(1, std::memory_order_relaxed);
+        return;
+    }
+    events.push_back({name, std::move(detail), startNs, endNs, tid});
+}
+
+std::vector<TraceEvent> TraceRecorder::collect() {
+    std::lock_guard<std::mutex> lock(mtx);
+    std::vector<TraceEvent> out;
+    out.swap(events);
+    return out;
+}
+
+TraceSpan::TraceSpan(const char* n, std::string d) : name(n), on(TraceRecorder::enabled()) {
+    if (on) {
+        detail = std::move(d);
+        start = EngineStats::nowNs();
+    }
+}
+
+TraceSpan::~TraceSpan() {
+    if (on)
+        TraceRecorder::instance().complete(name, start, EngineStats::nowNs(), std::move(detail));
+}
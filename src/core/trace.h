@@ -0,0 +1,58 @@
+#pragma once
+#include <atomic>
+#include <cstdint>
+#include <mutex>
+#include <string>
+#include <vector>
+
+/**
+ * @brief Runtime-switchable span recorder (Chrome trace "complete" events).
+ *
+ * Disabled cost is a single relaxed atomic load per span. When enabled, spans
+ * are appended under a mutex to one buffer; Python collects them and writes
+ * the Chrome/Perfetto JSON together with its own spans. Timestamps come from
+ * steady_clock (trace_clock_us) and thread ids are OS thread ids, so they line
+ * up with threading.get_native_id() on the Python side.
+ */
+struct TraceEvent {
+    const char* name;   // static string (stage / span name)
+    std::string detail; // optional (clip name, ...)
+    int64_t startNs;
+    int64_t endNs;
+    uint64_t tid;
+};
+
+class TraceRecorder {
+public:
+    static constexpr size_t kMaxEvents = 2000000; // ~100 MB worst case
+
+    static TraceRecorder& instance();
+    static bool enabled() { return instance().active.load(std::memory_order_relaxed); }
+    static uint64_t currentThreadId();
+
+    void start();
+    void stop();
+    void complete(const char* name, int64_t startNs, int64_t endNs, std::string detail = {});
+    // Returns and clears the buffered events
+    std::vector<TraceEvent> collect();
+    size_t dropped() const { return droppedEvents.load(std::memory_order_relaxed); }
+
+private:
+    std::atomic<bool> active{false};
+    std::atomic<size_t> droppedEvents{0};
+    std::mutex mtx;
+    std::vector<TraceEvent> events;
+};
+
+// RAII span; does nothing unless tracing was enabled when it was created
+class TraceSpan {
+    const char* name;
+    std::string detail;
+    int64_t start = 0;
+    bool on;
+public:
+    explicit TraceSpan(const char* n, std::string d = {});
+    ~TraceSpan();
+    TraceSpan(const TraceSpan&) = delete;
+    TraceSpan& operator=(const TraceSpan&) = delete;
+};
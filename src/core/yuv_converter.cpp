@@ -0,0 +1,106 @@
+#include "yuv_converter.h"
+#include <future>
+#include <stdexcept>
+#include <thread>
+
+YuvConverter::~YuvConverter() { release(); }
+
+bool YuvConverter::isSupported(AVPixelFormat fmt) {
+    return fmt == AV_PIX_FMT_YUV420P || fmt == AV_PIX_FMT_NV12 ||
+           fmt == AV_PIX_FMT_YUV422P;
+}
+
+AVPixelFormat YuvConverter::parse(const std::string& name) {
+    return av_get_pix_fmt(name.c_str());
+}
+
+size_t YuvConverter::bufferSize(int w, int h, AVPixelFormat fmt) {
+    const int size = av_image_get_buffer_size(fmt, w, h, 1);
+    return size > 0 ? static_cast<size_t>(size) : 0;
+}
+
+void YuvConverter::release() {
+    for (auto& band : bands) {
+        if (band.ctx)
+            sws_freeContext(band.ctx);
+    }
+    bands.clear();
+    lastW = lastH = -1;
+    lastFmt = AV_PIX_FMT_NONE;
+}
+
+void YuvConverter::prepare(int w, int h, AVPixelFormat fmt) {
+    if (w == lastW && h == lastH && fmt == lastFmt && !bands.empty())
+        return;
+    release();
+
+    const AVPixFmtDescriptor* desc = av_pix_fmt_desc_get(fmt);
+    if (!desc)
+        throw std::runtime_error("[YuvConverter] Unknown pixel format");
+
+    // Las bandas deben empezar en una fila de croma completa (420/NV12: par)
+    const int rowAlign = 1 << desc->log2_chroma_h;
+    const unsigned cores = std::max(1u, std::thread::hardware_concurrency());
+    const int maxBands = std::max(1, h / 32); // Bandas muy finas no compensan
+    const int bandCount = std::max(1, std::min<int>(static_cast<int>(cores), maxBands));
+
+    int rowsPerBand = (h + bandCount - 1) / bandCount;
+    rowsPerBand = ((rowsPerBand + rowAlign - 1) / rowAlign) * rowAlign;
+
+    for (int y0 = 0; y0 < h; y0 += rowsPerBand) {
+        Band band;
+        band.y0 = y0;
+        band.rows = std::min(rowsPerBand, h - y0);
+        band.ctx = sws_getContext(w, band.rows, AV_PIX_FMT_RGBA, w, band.rows, fmt,
+                                  SWS_BICUBIC, nullptr, nullptr, nullptr);
+        if (!band.ctx) {
+            release();
+            throw std::runtime_error("[YuvConverter] Could not create swscale context");
+        }
+        bands.push_back(band);
+    }
+
+    lastW = w;
+    lastH = h;
+    lastFmt = fmt;
+}
+
+void YuvConverter::convert(const Frame& rgba, AVPixelFormat fmt,
+                           uint8_t* const dstData[4], const int dstLinesize[4]) {
+    std::lock_guard<std::mutex> lock(mtx);
+    prepare(rgba.width, rgba.height, fmt);
+
+    const int chromaShift = av_pix_fmt_desc_get(fmt)->log2_chroma_h;
+    const int planes = av_pix_fmt_count_planes(fmt);
+    const int srcStride[4] = {rgba.width * 4, 0, 0, 0};
+
+    auto convertBand = [&](const Band& band) {
+        const uint8_t* src[4] = {
+            rgba.data.data() + static_cast<size_t>(band.y0) * srcStride[0],
+            nullptr, nullptr, nullptr};
+        uint8_t* dst[4] = {nullptr, nullptr, nullptr, nullptr};
+        for (int p = 0; p < planes; ++p) {
+            const int row = (p == 0) ? band.y0 : (band.y0 >> chromaShift);
+            dst[p] = dstData[p] + static_cast<size_t>(row) * dstLinesize[p];
+        }
+        sws_scale(band.ctx, src, srcStride, 0, band.rows, dst, dstLinesize);
+    };
+
+    // La primera banda se procesa en el hilo llamador
+    std::vector<std::future<void>> jobs;
+    jobs.reserve(bands.size());
+    for (size_t b = 1; b < bands.size(); ++b) {
+        jobs.push_back(std::async(std::launch::async,
+                                  [&convertBand, this, b]() { convertBand(bands[b]); }));
+    }
+    convertBand(bands[0]);
+    for (auto& job : jobs)
+        job.get();
+}
+
+void YuvConverter::convertPacked(const Frame& rgba, AVPixelFormat fmt, uint8_t* dst) {
+    uint8_t* data[4] = {nullptr, nullptr, nullptr, nullptr};
+    int linesize[4] = {0, 0, 0, 0};
+    av_image_fill_arrays(data, linesize, dst, fmt, rgba.width, rgba.height, 1);
+    convert(rgba, fmt, data, linesize);
+}
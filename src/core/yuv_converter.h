@@ -0,0 +1,45 @@
+#pragma once
+#include "common.h"
+#include <mutex>
+
+extern "C" {
+#include <libavutil/pixdesc.h>
+}
+
+/**
+ * @brief Parallel, sliced RGBA -> planar YUV conversion (swscale).
+ *
+ * The frame is split into horizontal bands (aligned to the chroma subsampling)
+ * and each band is converted by its own SwsContext on its own thread, so the
+ * colorspace stage scales with cores instead of running on a single filter
+ * thread inside ffmpeg. No scaling is involved, so bands are independent.
+ */
+class YuvConverter {
+public:
+    ~YuvConverter();
+
+    // yuv420p, nv12 and yuv422p
+    static bool isSupported(AVPixelFormat fmt);
+    static AVPixelFormat parse(const std::string& name);
+    static size_t bufferSize(int w, int h, AVPixelFormat fmt);
+
+    // Converts into an arbitrary planar destination (e.g. an AVFrame)
+    void convert(const Frame& rgba, AVPixelFormat fmt,
+                 uint8_t* const dstData[4], const int dstLinesize[4]);
+    // Converts into one tightly packed buffer of bufferSize() bytes
+    void convertPacked(const Frame& rgba, AVPixelFormat fmt, uint8_t* dst);
+
+private:
+    struct Band {
+        int y0 = 0;
+        int rows = 0;
+        SwsContext* ctx = nullptr;
+    };
+    std::vector<Band> bands;
+    int lastW = -1, lastH = -1;
+    AVPixelFormat lastFmt = AV_PIX_FMT_NONE;
+    std::mutex mtx;
+
+    void prepare(int w, int h, AVPixelFormat fmt);
+    void release();
+};
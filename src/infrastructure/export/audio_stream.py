@@ -0,0 +1,136 @@
+"""
+Audio de exportación en streaming.
+
+En lugar de renderizar la mezcla completa en memoria y volcarla a un .tmp
+(2 h de programa ~ 2.5 GB de float32), un hilo mezcla bloques de duración fija
+y los escribe como f32le en un segundo canal que ffmpeg lee como otra entrada.
+La memoria es constante sea cual sea la duración del programa.
+"""
+import os
+import socket
+import sys
+import threading
+
+import numpy as np
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+DEFAULT_CHUNK_SECONDS = 1.0
+
+
+class AudioChannel:
+    """
+    Second input channel for the ffmpeg child process.
+
+    POSIX: an anonymous pipe whose read end is inherited by ffmpeg (pass_fds)
+    and opened as `pipe:<fd>`. Windows has no pass_fds, so ffmpeg connects to a
+    localhost TCP socket instead.
+    """
+
+    def __init__(self):
+        self._read_fd = None
+        self._write_fd = None
+        self._server = None
+        self._sink = None
+
+        if sys.platform != "win32":
+            self._read_fd, self._write_fd = os.pipe()
+            self.url = f"pipe:{self._read_fd}"
+            self.pass_fds = (self._read_fd,)
+        else:
+            self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._server.bind(("127.0.0.1", 0))
+            self._server.listen(1)
+            self.url = f"tcp://127.0.0.1:{self._server.getsockname()[1]}"
+            self.pass_fds = ()
+
+    def after_spawn(self):
+        """Releases the parent's copy of the read end once ffmpeg owns it."""
+        if self._read_fd is not None:
+            os.close(self._read_fd)
+            self._read_fd = None
+
+    def open_sink(self, timeout=30.0):
+        """Returns a writable binary file object (blocks until ffmpeg connects on Windows)."""
+        if self._write_fd is not None:
+            self._sink = os.fdopen(self._write_fd, "wb")
+            self._write_fd = None
+        else:
+            self._server.settimeout(timeout)
+            conn, _ = self._server.accept()
+            self._server.close()
+            self._server = None
+            self._sink = conn.makefile("wb")
+            conn.close()  # makefile keeps its own reference
+        return self._sink
+
+    def close(self):
+        for fd in (self._read_fd, self._write_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._read_fd = self._write_fd = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self._sink is not None:
+            try:
+                self._sink.close()
+            except OSError:
+                pass
+            self._sink = None
+
+
+class AudioStreamWriter(threading.Thread):
+    """
+    Mixes `total_samples` of program audio in bounded chunks and writes them
+    to `channel` as interleaved stereo f32le @ 44.1kHz.
+
+    Chunk boundaries are sample-exact (start = n / 44100), so sequential
+    render_audio calls tile the timeline without gaps. `start_time` offsets
+    the mix for partial (range) exports.
+    """
+
+    def __init__(self, engine, total_samples, channel, chunk_seconds=DEFAULT_CHUNK_SECONDS,
+                 start_time=0.0):
+        super().__init__(name="RockyExport-Audio", daemon=True)
+        self.engine = engine
+        self.total_samples = int(total_samples)
+        self.channel = channel
+        self.chunk_samples = max(1, int(round(chunk_seconds * SAMPLE_RATE)))
+        self.start_time = float(start_time)
+        self.error = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def samples_for(total_frames, fps):
+        return int(round(total_frames / fps * SAMPLE_RATE))
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        try:
+            sink = self.channel.open_sink()
+            written = 0
+            while written < self.total_samples and not self._stop_event.is_set():
+                count = min(self.chunk_samples, self.total_samples - written)
+                chunk = self.engine.render_audio(
+                    self.start_time + written / SAMPLE_RATE, count / SAMPLE_RATE)
+                expected = count * CHANNELS
+                if chunk.size != expected:
+                    # Nunca desalinear el stream: recortar o rellenar con silencio
+                    fixed = np.zeros(expected, dtype=np.float32)
+                    n = min(expected, chunk.size)
+                    fixed[:n] = chunk[:n]
+                    chunk = fixed
+                sink.write(chunk.data)
+                written += count
+        except (BrokenPipeError, ConnectionError):
+            pass  # ffmpeg terminó o se canceló el render
+        except Exception as e:
+            self.error = e
+        finally:
+            self.channel.close()
@@ -0,0 +1,125 @@
+"""
+Construcción del motor C++ a partir de un TimelineModel.
+
+Este módulo no depende de Qt: lo usan tanto la sincronización interactiva de
+RockyApp como la exportación, que necesita motores independientes (cada uno con
+sus propios decodificadores) para renderizar varios frames a la vez.
+"""
+import os
+import zlib
+
+import rocky_core
+
+from ...ui.models import TrackType, ProxyStatus
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')
+
+
+def create_media_source(path, cache=None, decoder_threads=0):
+    """
+    Opens the correct C++ backend for a file path.
+    If `cache` (dict) is given, heavyweight sources are reused per path.
+    """
+    if not path or not os.path.exists(path):
+        # Color estable por ruta: todos los motores de exportación deben
+        # mostrar el mismo placeholder para el mismo medio ausente.
+        seed = zlib.crc32((path or "").encode("utf-8", "replace"))
+        return rocky_core.ColorSource(50 + seed % 151, 50, 100, 255)
+
+    if cache is not None and path in cache:
+        return cache[path]
+
+    if path.lower().endswith(IMAGE_EXTENSIONS):
+        source = rocky_core.ImageSource(path)
+    else:
+        source = rocky_core.VideoSource(path, decoder_threads)
+
+    if cache is not None:
+        cache[path] = source
+    return source
+
+
+def populate_engine(engine, model, fps, use_proxies=False, source_factory=None):
+    """
+    Mirrors tracks, clips, transforms, fades and effects of `model` into an
+    already cleared `engine`. Returns a dict TimelineClip -> rocky_core.Clip.
+    """
+    if source_factory is None:
+        cache = {}
+        source_factory = lambda path: create_media_source(path, cache)
+
+    # 1. Sync Tracks
+    for track_type in model.track_types:
+        cpp_track_type = rocky_core.VIDEO if track_type == TrackType.VIDEO else rocky_core.AUDIO
+        engine.add_track(cpp_track_type)
+
+    # 2. Sync Clips and Media Sources
+    clip_map = {}
+    for clip in model.clips:
+        # Determine effective path
+        path_to_use = clip.file_path
+        if use_proxies and clip.proxy_status == ProxyStatus.READY and clip.proxy_path:
+            path_to_use = clip.proxy_path
+
+        media_source = source_factory(path_to_use)
+
+        cpp_clip = engine.add_clip(
+            clip.track_index,
+            clip.name,
+            int(clip.start_frame),
+            int(clip.duration_frames),
+            clip.source_offset_frames / fps,
+            media_source
+        )
+        clip_map[clip] = cpp_clip
+
+        # 3. Surface extended properties
+        cpp_clip.opacity = clip.start_opacity
+        cpp_clip.transform.x = clip.transform.x
+        cpp_clip.transform.y = clip.transform.y
+        cpp_clip.transform.scale_x = clip.transform.scale_x
+        cpp_clip.transform.scale_y = clip.transform.scale_y
+        cpp_clip.transform.rotation = clip.transform.rotation
+        cpp_clip.transform.anchor_x = clip.transform.anchor_x
+        cpp_clip.transform.anchor_y = clip.transform.anchor_y
+
+        # 4. Sync Effects
+        if hasattr(clip, 'effects') and clip.effects:
+            cpp_effects_list = []
+            for eff in clip.effects:
+                # Robust key check for plugin path
+                path = eff.get('path') or eff.get('plugin_path') or ''
+                name = eff.get('name', 'Unknown')
+                enabled = eff.get('enabled', True)
+
+                if path:
+                    c_eff = rocky_core.Effect(name, path)
+                    c_eff.enabled = enabled
+                    cpp_effects_list.append(c_eff)
+
+            cpp_clip.effects = cpp_effects_list
+        cpp_clip.fade_in_frames = int(clip.fade_in_frames)
+        cpp_clip.fade_out_frames = int(clip.fade_out_frames)
+        cpp_clip.fade_in_type = rocky_core.FadeType(clip.fade_in_type.value)
+        cpp_clip.fade_out_type = rocky_core.FadeType(clip.fade_out_type.value)
+
+    return clip_map
+
+
+def build_engine(model, fps, width, height, master_gain=1.0, use_proxies=False, decoder_threads=0):
+    """
+    Creates a fully independent RockyEngine for `model`.
+    Sources are not shared with any other engine, so it can be evaluated
+    from its own thread without contending for decoders.
+    """
+    engine = rocky_core.RockyEngine()
+    engine.set_fps(fps)
+    engine.set_resolution(width, height)
+    engine.set_master_gain(master_gain)
+
+    cache = {}
+    populate_engine(
+        engine, model, fps, use_proxies,
+        source_factory=lambda path: create_media_source(path, cache, decoder_threads)
+    )
+    return engine
@@ -0,0 +1,170 @@
+"""
+Pipeline de exportación multi-frame.
+
+RockyEngine.evaluate solo paraleliza las capas de un frame, así que un timeline
+de una sola pista usaba ~1 núcleo. ParallelFrameRenderer mantiene hasta K
+frames en vuelo repartidos entre W motores independientes y los entrega en
+orden mediante un buffer de reordenación. K se limita por presupuesto de
+memoria (K * bytes_por_frame <= presupuesto).
+"""
+import os
+import threading
+
+DEFAULT_MEMORY_BUDGET_MB = 1024
+MIN_FRAMES_PER_CHUNK = 4
+MAX_FRAMES_PER_CHUNK = 48
+
+# Formatos que el core convierte por bandas (RockyEngine.evaluate_yuv) -> bytes/pixel
+ENGINE_YUV_FORMATS = {"yuv420p": 1.5, "nv12": 1.5, "yuv422p": 2.0}
+
+
+def default_memory_budget_mb():
+    """Quarter of the available RAM (capped), or a fixed default without psutil."""
+    try:
+        import psutil
+        available = psutil.virtual_memory().available // (1024 * 1024)
+        return max(256, min(available // 4, 4096))
+    except Exception:
+        return DEFAULT_MEMORY_BUDGET_MB
+
+
+def plan_render_window(total_frames, frame_bytes, workers=None, memory_budget_mb=None):
+    """
+    Sizes the render window for a given memory budget.
+    Returns (workers, max_frames_in_flight, frames_per_chunk).
+    """
+    budget_mb = memory_budget_mb if memory_budget_mb else default_memory_budget_mb()
+    max_in_flight = max(2, (budget_mb * 1024 * 1024) // max(1, frame_bytes))
+
+    requested = workers if workers else (os.cpu_count() or 1)
+    # No tiene sentido tener más motores que trozos que caben en la ventana
+    workers = max(1, min(requested, max_in_flight // MIN_FRAMES_PER_CHUNK, int(total_frames)))
+    chunk_size = max(1, min(MAX_FRAMES_PER_CHUNK, max_in_flight // workers))
+    return workers, int(max_in_flight), chunk_size
+
+
+def frame_size_bytes(width, height, pix_fmt="rgba"):
+    """Bytes of one frame as delivered by the engine in `pix_fmt`."""
+    return int(width * height * ENGINE_YUV_FORMATS.get(pix_fmt, 4))
+
+
+def evaluate_frame(engine, timestamp):
+    return engine.evaluate(timestamp)
+
+
+def yuv_frame_fn(pix_fmt):
+    """frame_fn producing planar YUV converted inside the core."""
+    def evaluate_yuv(engine, timestamp):
+        return engine.evaluate_yuv(timestamp, pix_fmt)
+    return evaluate_yuv
+
+
+class ParallelFrameRenderer:
+    """
+    Iterable over (frame_index, frame) in strict timeline order.
+
+    Each worker thread owns one engine created by `engine_factory()` and renders
+    contiguous chunks of frames so its decoders keep reading forward instead of
+    seeking on every frame. A worker may only render frame i while
+    i < next_frame_to_emit + K, which bounds memory and cannot deadlock: the
+    frame the consumer waits for is always inside the window.
+    """
+
+    def __init__(self, engine_factory, total_frames, fps, frame_bytes,
+                 workers=None, memory_budget_mb=None, chunk_size=None,
+                 frame_fn=evaluate_frame, start_frame=0):
+        self.engine_factory = engine_factory
+        self.start_frame = int(start_frame)
+        self.total_frames = int(total_frames)
+        self.fps = fps
+        self.frame_fn = frame_fn
+
+        self.workers, self.max_in_flight, planned_chunk = plan_render_window(
+            self.total_frames, frame_bytes, workers, memory_budget_mb)
+        self.chunk_size = max(1, int(chunk_size)) if chunk_size else planned_chunk
+
+        self._cond = threading.Condition()
+        self._ready = {}
+        self._next_emit = 0
+        self._next_chunk = 0
+        self._cancelled = False
+        self._error = None
+        self._threads = []
+
+    # ------------------------------------------------------------------
+    def __iter__(self):
+        self._start()
+        try:
+            while self._next_emit < self.total_frames:
+                with self._cond:
+                    while (self._next_emit not in self._ready
+                           and self._error is None and not self._cancelled):
+                        self._cond.wait()
+                    if self._error is not None:
+                        raise self._error
+                    if self._cancelled:
+                        return
+                    frame = self._ready.pop(self._next_emit)
+                    index = self._next_emit
+                    self._next_emit += 1
+                    # Se libera un hueco en la ventana
+                    self._cond.notify_all()
+                yield self.start_frame + index, frame
+        finally:
+            self.close()
+
+    def close(self):
+        """Cancels pending work and joins the worker threads."""
+        with self._cond:
+            self._cancelled = True
+            self._ready.clear()
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+    # ------------------------------------------------------------------
+    def _start(self):
+        for n in range(self.workers):
+            t = threading.Thread(target=self._worker_loop, name=f"RockyExport-{n}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _claim_chunk(self):
+        with self._cond:
+            if self._cancelled or self._error is not None:
+                return None
+            first = self._next_chunk * self.chunk_size
+            if first >= self.total_frames:
+                return None
+            self._next_chunk += 1
+            return range(first, min(first + self.chunk_size, self.total_frames))
+
+    def _worker_loop(self):
+        try:
+            engine = self.engine_factory()
+            while True:
+                chunk = self._claim_chunk()
+                if chunk is None:
+                    return
+                for index in chunk:
+                    with self._cond:
+                        while (index >= self._next_emit + self.max_in_flight
+                               and not self._cancelled and self._error is None):
+                            self._cond.wait()
+                        if self._cancelled or self._error is not None:
+                            return
+
+                    # evaluate() libera el GIL: los motores trabajan en paralelo real
+                    frame = self.frame_fn(engine, (self.start_frame + index) / self.fps)
+
+                    with self._cond:
+                        if self._cancelled:
+                            return
+                        self._ready[index] = frame
+                        self._cond.notify_all()
+        except Exception as e:
+            with self._cond:
+                if self._error is None:
+                    self._error = e
+                self._cond.notify_all()
@@ -0,0 +1,159 @@
+"""
+Pre-render de zonas pesadas del timeline.
+
+Efectos apilados, capas 4K rotadas o cadenas OFX no se reproducen en tiempo
+real. Un rango del timeline se renderiza en segundo plano (ruta de
+exportación paralela) a un mezzanine intra-frame en la caché de medios y el
+motor lo sirve en lugar de componer las capas mientras la reproducción pasa
+por ese rango.
+
+Cada fichero se nombra por la firma del contenido que lo produce (clips de
+vídeo que tocan el rango, sus ficheros, tracks, fps y resolución). Si
+cualquier clip que contribuye cambia, la firma deja de coincidir y la
+entrada se descarta sola; si el cambio se deshace, el fichero vuelve a valer.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+import rocky_core
+
+from ...ui.models import TrackType
+from ..ffmpeg_utils import EncoderConfig
+from .render_job import RenderJob
+
+# H.264 all-intra: cada frame es un keyframe -> seek y scrub sin decodificar GOPs
+PRERENDER_PROFILE = EncoderConfig(
+    codec="libx264",
+    preset_flag=("-preset", "ultrafast"),
+    quality_flag=("-crf", "12"),
+    pix_fmt="yuv420p",
+    extra_flags=["-g", "1", "-bf", "0", "-tune", "fastdecode"]
+)
+
+
+def default_cache_dir():
+    return os.path.join(os.path.expanduser("~"), ".rocky", "cache", "prerender")
+
+
+def mezzanine_size(width, height):
+    """yuv420p necesita dimensiones pares."""
+    return max(2, (int(width) // 2) * 2), max(2, (int(height) // 2) * 2)
+
+
+def _contributing_clips(model, start_frame, end_frame):
+    video_tracks = {i for i, t in enumerate(model.track_types) if t == TrackType.VIDEO}
+    return [c for c in model.clips
+            if c.track_index in video_tracks
+            and c.start_frame < end_frame and c.start_frame + c.duration_frames > start_frame]
+
+
+def range_signature(model, start_frame, end_frame, fps, width, height):
+    """Content hash of everything that affects the composited frames of the range."""
+    width, height = mezzanine_size(width, height)
+    clips = []
+    for clip in _contributing_clips(model, start_frame, end_frame):
+        state = clip.to_dict()
+        state.pop("name", None)  # Renombrar no cambia la imagen
+        try:
+            st = os.stat(clip.file_path)
+            state["_file"] = [st.st_size, st.st_mtime_ns]
+        except (OSError, TypeError):
+            state["_file"] = None
+        clips.append(state)
+    clips.sort(key=lambda c: (c["track_index"], c["start_frame"]))
+
+    payload = {
+        "range": [int(start_frame), int(end_frame)],
+        "fps": fps,
+        "size": [width, height],
+        "tracks": [t.value for t in model.track_types],
+        "clips": clips,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+
+@dataclass
+class PrerenderEntry:
+    start_frame: int
+    end_frame: int
+    signature: str
+    path: str
+    source: Any = field(default=None, repr=False)  # rocky_core.VideoSource (lazy)
+
+
+class PrerenderCache:
+    """Pre-rendered ranges of one project and their validity."""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.entries: List[PrerenderEntry] = []
+
+    def add(self, entry: PrerenderEntry):
+        self.entries = [e for e in self.entries
+                        if e.end_frame <= entry.start_frame or e.start_frame >= entry.end_frame]
+        self.entries.append(entry)
+
+    def clear(self):
+        self.entries = []
+
+    def validate(self, model, fps, width, height):
+        """Drops entries whose contributing clips changed. Returns the dropped ones."""
+        valid, dropped = [], []
+        for e in self.entries:
+            if (os.path.exists(e.path)
+                    and range_signature(model, e.start_frame, e.end_frame, fps, width, height) == e.signature):
+                valid.append(e)
+            else:
+                dropped.append(e)
+        self.entries = valid
+        return dropped
+
+    def apply(self, engine, model, fps, width, height):
+        """Validates and (re)registers the surviving ranges in `engine`."""
+        if not hasattr(engine, "set_render_cache"):
+            return []  # Core compilado sin soporte de pre-render
+        dropped = self.validate(model, fps, width, height)
+        for e in dropped:
+            print(f"Prerender: invalidated frames {e.start_frame}-{e.end_frame}", flush=True)
+        engine.clear_render_cache()
+        for e in self.entries:
+            if e.source is None:
+                e.source = rocky_core.VideoSource(e.path)
+            engine.set_render_cache(e.start_frame, e.end_frame, e.source)
+        return dropped
+
+
+def prerender_range(model, start_frame, end_frame, fps, width, height, cache_dir=None,
+                    on_progress=None, is_cancelled=None, workers=None) -> Optional[PrerenderEntry]:
+    """
+    Renders [start_frame, end_frame) of `model` (a snapshot) into the cache.
+    Returns the entry, or None if cancelled. Existing files are reused.
+    """
+    width, height = mezzanine_size(width, height)
+    cache_dir = cache_dir or default_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+
+    signature = range_signature(model, start_frame, end_frame, fps, width, height)
+    path = os.path.join(cache_dir, f"{signature}.mp4")
+    entry = PrerenderEntry(int(start_frame), int(end_frame), signature, path)
+    if os.path.exists(path):
+        return entry
+
+    part_path = os.path.join(cache_dir, f"{signature}.part.mp4")
+    job = RenderJob(part_path, end_frame - start_frame, fps, width, height,
+                    model=model, workers=workers, on_progress=on_progress,
+                    is_cancelled=is_cancelled, smart_render=False)
+    try:
+        if not job.render_range(part_path, int(start_frame), int(end_frame - start_frame),
+                                PRERENDER_PROFILE, audio=False):
+            return None
+        # Atómico: el motor nunca ve un fichero a medio escribir
+        os.replace(part_path, path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+    return entry
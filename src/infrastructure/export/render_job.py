@@ -0,0 +1,323 @@
+"""
+Exportación sin Qt.
+
+RenderJob contiene la lógica que antes vivía en RenderWorker.run: alineación
+de resolución, encoder in-process (rocky_core.Exporter) con fallback al pipe de
+ffmpeg y audio en streaming. Puede renderizar el programa entero o solo un
+rango de frames, que es lo que necesita el smart render para re-codificar
+únicamente los tramos modificados.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+import rocky_core
+
+from ..ffmpeg_utils import FFmpegUtils
+from .audio_stream import AudioChannel, AudioStreamWriter
+from .engine_factory import build_engine
+from .frame_pipeline import (ParallelFrameRenderer, ENGINE_YUV_FORMATS, evaluate_frame,
+                             frame_size_bytes, plan_render_window, yuv_frame_fn)
+
+
+class RenderError(Exception):
+    """Raised when an export stage fails (message is user facing)."""
+
+
+def hidden_startupinfo():
+    """Windows-specific: hide the console window of ffmpeg child processes."""
+    if sys.platform != "win32":
+        return None
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    startupinfo.wShowWindow = 0  # SW_HIDE
+    return startupinfo
+
+
+def run_ffmpeg(command, label="FFmpeg"):
+    """Runs a short ffmpeg command, raising RenderError with its log on failure."""
+    with tempfile.TemporaryFile() as err_f:
+        rc = subprocess.call(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                             stderr=err_f, startupinfo=hidden_startupinfo())
+        if rc != 0:
+            err_f.seek(0)
+            raise RenderError(f"Fallo en {label} (Code {rc}):\n"
+                              f"{err_f.read().decode('utf-8', 'replace')}")
+
+
+class RenderJob:
+    """
+    Exports `total_frames` of the timeline to `output_path`.
+
+    `on_progress(done, total)` is called with frame counts and `is_cancelled()`
+    is polled between frames. run() returns False when cancelled and raises
+    RenderError on failure.
+
+    With a `model` snapshot every render thread gets its own engine. Without it
+    the shared (preview) `engine` is used sequentially; `engine_guard()` must
+    then return a context manager that locks it.
+
+    `segments` > 1 renders GOP-aligned segments in that many worker processes
+    (requires `model`).
+    """
+
+    def __init__(self, output_path, total_frames, fps, width, height, high_quality=False,
+                 model=None, master_gain=1.0, workers=None, engine=None, engine_guard=None,
+                 on_progress=None, is_cancelled=None, smart_render=True, segments=1):
+        self.output_path = output_path
+        self.total_frames = int(total_frames)
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.high_quality = high_quality
+        self.model = model
+        self.master_gain = master_gain
+        self.workers = workers
+        self.engine = engine
+        self.engine_guard = engine_guard
+        self.on_progress = on_progress
+        self.is_cancelled = is_cancelled or (lambda: False)
+        self.smart_render = smart_render
+        self.segments = max(1, int(segments or 1))
+        self._decoder_threads = 0
+
+    # ------------------------------------------------------------------
+    def run(self):
+        # 1. Ensure dimensions are aligned to 32 (Ultra-Safe HW Alignment)
+        # Some media engines (AMD/Intel) prefer 32 or 64 alignment for strides.
+        self.width = (self.width // 32) * 32
+        self.height = (self.height // 32) * 32
+
+        # Prevent 0 dimensions
+        if self.width <= 0: self.width = 1280
+        if self.height <= 0: self.height = 720
+
+        enc_config = FFmpegUtils.get_export_config(self.high_quality)
+
+        # 2. Smart render: copiar paquetes de los tramos sin modificar
+        if self.smart_render and self.model is not None:
+            from .smart_render import SmartRenderer, plan_smart_render
+            spans = plan_smart_render(self.model, self.total_frames, self.fps,
+                                      self.width, self.height, enc_config)
+            if any(span.is_copy for span in spans):
+                return SmartRenderer(self, spans, enc_config).run()
+
+        # 3. Segmentos en paralelo (un proceso y un encoder por segmento)
+        if self.segments > 1 and self.model is not None:
+            from .segment_export import SegmentedRenderer, plan_segments
+            plan = plan_segments(self.total_frames, self.fps, self.segments)
+            if len(plan) > 1:
+                return SegmentedRenderer(self, enc_config, plan).run()
+
+        return self.render_range(self.output_path, 0, self.total_frames, enc_config)
+
+    def report(self, done):
+        if self.on_progress is not None:
+            self.on_progress(done, self.total_frames)
+
+    def create_engine(self):
+        """Engine factory for ParallelFrameRenderer (called from each render thread)."""
+        if self.model is None:
+            return self.engine
+        return build_engine(self.model, self.fps, self.width, self.height,
+                            self.master_gain, decoder_threads=self._decoder_threads)
+
+    # ------------------------------------------------------------------
+    def render_range(self, output_path, start_frame, frame_count, enc_config,
+                     audio=True, progress_base=0):
+        """
+        Encodes frames [start_frame, start_frame + frame_count) into `output_path`
+        (container from its extension). Progress is reported as
+        progress_base + frames_done. Returns False if cancelled.
+        """
+        # Encoder in-process (rocky_core.Exporter): sin pipe ni proceso hijo.
+        # El pipe a ffmpeg queda como fallback si el core no lo trae o falla al abrir.
+        if self.model is not None and hasattr(rocky_core, "Exporter"):
+            try:
+                if self._render_native(output_path, start_frame, frame_count, enc_config,
+                                       audio, progress_base):
+                    return True
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                return False
+            except RuntimeError as e:
+                print(f"RenderJob: in-process export failed ({e}), falling back to FFmpeg pipe", flush=True)
+
+        return self._render_pipe(output_path, start_frame, frame_count, enc_config,
+                                 audio, progress_base)
+
+    def _render_native(self, output_path, start_frame, frame_count, enc_config, audio, progress_base):
+        """
+        Encodes and muxes inside rocky_core (libavcodec/libavformat).
+        Frames never cross into Python. Returns False if the user cancelled.
+        """
+        workers, window, chunk = plan_render_window(
+            frame_count, self.width * self.height * 4, self.workers)
+        self._decoder_threads = max(1, (os.cpu_count() or 1) // workers)
+        engines = [self.create_engine() for _ in range(workers)]
+        # Motor propio para el audio: VideoSource comparte demuxer entre audio y vídeo
+        audio_engine = self.create_engine() if audio else None
+
+        exporter = rocky_core.Exporter(
+            output_path, self.width, self.height, self.fps,
+            enc_config.codec, enc_config.pix_fmt, enc_config.to_codec_options()
+        )
+
+        def on_progress(done, total):
+            if self.is_cancelled():
+                exporter.cancel()
+            self.report(progress_base + done)
+
+        print(f"RenderJob: in-process {enc_config.codec}, {workers} engines, window {window} frames", flush=True)
+        return exporter.run(engines, audio_engine, frame_count, on_progress, window, chunk, start_frame)
+
+    def _render_pipe(self, output_path, start_frame, frame_count, enc_config, audio, progress_base):
+        ffmpeg_exe = FFmpegUtils.get_ffmpeg_path()
+
+        # Sync engine resolution for RENDER
+        if self.model is None:
+            with self.engine_guard():
+                self.engine.set_resolution(self.width, self.height)
+
+        audio_channel = None
+        audio_writer = None
+        try:
+            # 2. Audio en streaming: bloques de 1 s por un segundo pipe (memoria constante)
+            if audio:
+                audio_channel = AudioChannel()
+                # Motor propio: VideoSource comparte demuxer entre audio y vídeo
+                audio_writer = AudioStreamWriter(
+                    self.create_engine(), AudioStreamWriter.samples_for(frame_count, self.fps),
+                    audio_channel, start_time=start_frame / self.fps)
+
+            # 3. Configurar FFmpeg
+
+            # OPTIMIZACIÓN: el motor entrega YUV planar (conversión por bandas en el core)
+            # y lo declaramos en la entrada: 1.5 B/px por el pipe en vez de 4.
+            # Si el core no trae evaluate_yuv, enviamos RGBA y forzamos la conversión
+            # con filtro para que un encoder HW nunca reciba RGBA.
+            pipe_pix_fmt = 'rgba'
+            if enc_config.pix_fmt in ENGINE_YUV_FORMATS and hasattr(rocky_core.RockyEngine, "evaluate_yuv"):
+                pipe_pix_fmt = enc_config.pix_fmt
+
+            command = [
+                ffmpeg_exe, '-y',
+                '-f', 'rawvideo',
+                '-vcodec', 'rawvideo',
+                '-s', f'{self.width}x{self.height}',
+                '-pix_fmt', pipe_pix_fmt,
+                '-r', str(self.fps),
+                '-i', '-',  # Stdin 0
+            ]
+            if audio_channel is not None:
+                command.extend([
+                    '-f', 'f32le',
+                    '-ar', '44100',
+                    '-ac', '2',
+                    '-i', audio_channel.url,  # Input 1 (streamed)
+                ])
+            if pipe_pix_fmt == 'rgba':
+                command.extend(['-vf', f'format={enc_config.pix_fmt}'])  # Force SW conversion before encoder
+            command.extend(['-c:v', enc_config.codec])
+
+            # Add Preset/Quality flags
+            command.extend(enc_config.preset_flag)
+            command.extend(enc_config.quality_flag)
+
+            # Add Extra flags
+            command.extend(enc_config.extra_flags)
+
+            # Common flags
+            command.extend(['-pix_fmt', enc_config.pix_fmt])
+            if audio_channel is not None:
+                command.extend(['-c:a', 'aac', '-b:a', '192k'])
+            command.append(output_path)
+
+            # IMPORTANT: We avoid stderr=subprocess.PIPE to prevent deadlocks on Windows
+            # when the pipe buffer fills up. A temporary file captures errors without blocking.
+            with tempfile.TemporaryFile() as err_f:
+                process = subprocess.Popen(
+                    command,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.DEVNULL,  # We don't need stdout
+                    stderr=err_f,
+                    startupinfo=hidden_startupinfo(),
+                    pass_fds=audio_channel.pass_fds if audio_channel is not None else ()
+                )
+                if audio_channel is not None:
+                    audio_channel.after_spawn()
+                    audio_writer.start()
+
+                # 4. Renderizar Video: K frames en vuelo, escritos en orden
+                expected_bytes = frame_size_bytes(self.width, self.height, pipe_pix_fmt)
+                renderer = ParallelFrameRenderer(
+                    self.create_engine, frame_count, self.fps,
+                    frame_bytes=expected_bytes,
+                    workers=self.workers if self.model is not None else 1,
+                    frame_fn=yuv_frame_fn(pipe_pix_fmt) if pipe_pix_fmt != 'rgba' else evaluate_frame,
+                    start_frame=start_frame
+                )
+                # Repartir los núcleos entre los decodificadores de cada motor
+                self._decoder_threads = max(1, (os.cpu_count() or 1) // renderer.workers)
+                print(f"RenderJob: {renderer.workers} engines, window {renderer.max_in_flight} frames, "
+                      f"chunk {renderer.chunk_size}", flush=True)
+
+                cancelled = False
+                for i, frame_data in renderer:
+                    if self.is_cancelled():
+                        cancelled = True
+                        process.terminate()
+                        break
+
+                    done = i - start_frame
+                    try:
+                        # DEBUG: Verify exact byte alignment
+                        if done == 0 and frame_data.nbytes != expected_bytes:
+                            print("CRITICAL ERROR: Buffer Size Mismatch! This causes render artifacts/glitches.", flush=True)
+
+                        # Buffer protocol: sin copia intermedia a bytes
+                        process.stdin.write(frame_data.data)
+
+                        # CRITICAL: Flush immediately after the first frame to ensure
+                        # FFmpeg locks onto the stream start without buffer shift.
+                        # Periodic flush to avoid large memory buildup.
+                        if done % 30 == 0:
+                            process.stdin.flush()
+                    except BrokenPipeError:
+                        break
+                    del frame_data
+
+                    if done % 5 == 0:
+                        self.report(progress_base + done)
+
+                renderer.close()
+                if cancelled and audio_writer is not None:
+                    audio_writer.stop()
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+                process.wait()
+                if audio_writer is not None:
+                    audio_writer.join()
+
+                if cancelled:
+                    if os.path.exists(output_path):
+                        os.remove(output_path)
+                    return False
+
+                # Check for errors
+                if audio_writer is not None and audio_writer.error is not None:
+                    raise RenderError(f"Fallo en el audio: {audio_writer.error}")
+                if process.returncode != 0:
+                    err_f.seek(0)
+                    err_out = err_f.read().decode('utf-8', 'replace')
+                    raise RenderError(f"Fallo en FFmpeg (Code {process.returncode}):\n{err_out}")
+            return True
+        finally:
+            if audio_writer is not None and audio_writer.is_alive():
+                audio_writer.stop()
+                audio_writer.join(timeout=5.0)
+            if audio_channel is not None:
+                audio_channel.close()
@@ -0,0 +1,145 @@
+"""
+Exportación por segmentos en varios procesos.
+
+Un único encoder limita el throughput aunque el motor sea rápido. Aquí el
+programa se divide en N segmentos de tiempo alineados a GOP; cada uno lo
+renderiza un proceso independiente con su propio RockyEngine construido desde
+el dict del proyecto (TimelineModel.to_dict). Cada segmento empieza con un
+encoder nuevo (IDR, GOP cerrado) y todos usan los mismos parámetros, así que
+se empalman con el demuxer concat sin re-codificar.
+"""
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+# CRITICAL: nada que importe rocky_core a nivel de módulo. Los procesos hijo
+# (spawn) importan este módulo antes de _init_worker, que registra las DLLs.
+from ..native_paths import register_dll_directories
+
+# Segmentos más cortos no amortizan el arranque de un proceso + motor
+MIN_SEGMENT_SECONDS = 10.0
+GOP_SECONDS = 2.0
+MAX_SEGMENT_PROCESSES = 8
+
+# Estado del proceso hijo (ProcessPoolExecutor initializer)
+_progress_queue = None
+_cancel_event = None
+
+
+def default_segment_count():
+    """Processes for a segmented export: each one still renders with several threads."""
+    return max(2, min(MAX_SEGMENT_PROCESSES, (os.cpu_count() or 1) // 4))
+
+
+def plan_segments(total_frames, fps, count):
+    """
+    Splits [0, total_frames) into at most `count` GOP-aligned segments.
+    Returns a list of (start_frame, frame_count).
+    """
+    total_frames = int(total_frames)
+    gop = max(1, int(round(fps * GOP_SECONDS)))
+    min_frames = int(MIN_SEGMENT_SECONDS * fps)
+    count = max(1, min(int(count), total_frames // max(1, min_frames)))
+
+    per_segment = -(-total_frames // count)           # ceil
+    per_segment = -(-per_segment // gop) * gop        # múltiplo de GOP
+    segments = []
+    for start in range(0, total_frames, per_segment):
+        segments.append((start, min(per_segment, total_frames - start)))
+    return segments
+
+
+def _init_worker(progress_queue, cancel_event):
+    global _progress_queue, _cancel_event
+    # El hijo no pasa por el __main__ del launcher: sin esto rocky_core no
+    # encuentra las DLLs de FFmpeg en Windows
+    register_dll_directories()
+    _progress_queue = progress_queue
+    _cancel_event = cancel_event
+
+
+def _render_segment(index, project, seg_path, start_frame, frame_count, fps, width, height,
+                    enc_config, master_gain, workers):
+    """Runs in a worker process. Returns False if cancelled."""
+    from ...ui.models import TimelineModel
+    from .render_job import RenderJob
+
+    job = RenderJob(
+        seg_path, frame_count, fps, width, height,
+        model=TimelineModel.from_dict(project), master_gain=master_gain, workers=workers,
+        on_progress=lambda done, total: _progress_queue.put((index, done)),
+        is_cancelled=_cancel_event.is_set, smart_render=False
+    )
+    # Solo vídeo: el audio se mezcla una única vez al empalmar
+    return job.render_range(seg_path, start_frame, frame_count, enc_config, audio=False)
+
+
+class SegmentedRenderer:
+    """Renders a RenderJob as parallel segments in worker processes and splices them."""
+
+    def __init__(self, job, enc_config, segments):
+        self.job = job
+        self.enc_config = enc_config
+        self.segments = segments
+
+    def run(self):
+        from .render_job import RenderError
+        from .smart_render import splice_segments
+
+        job = self.job
+        processes = len(self.segments)
+        workers = max(1, (os.cpu_count() or 1) // processes)
+        project = job.model.to_dict()
+        print(f"SegmentedRender: {processes} processes x {workers} engines", flush=True)
+
+        out_dir = os.path.dirname(os.path.abspath(job.output_path))
+        work_dir = tempfile.mkdtemp(prefix=".rocky_segments_", dir=out_dir)
+        # spawn: nunca heredar por fork un proceso con Qt y hilos de decodificación
+        ctx = multiprocessing.get_context("spawn")
+        progress_queue = ctx.Queue()
+        cancel_event = ctx.Event()
+        seg_paths = [os.path.join(work_dir, f"seg_{n:05d}.ts") for n in range(processes)]
+        seg_done = [0] * processes
+
+        try:
+            with ProcessPoolExecutor(max_workers=processes, mp_context=ctx,
+                                     initializer=_init_worker,
+                                     initargs=(progress_queue, cancel_event)) as pool:
+                futures = [
+                    pool.submit(_render_segment, n, project, seg_paths[n], start, count,
+                                job.fps, job.width, job.height, self.enc_config,
+                                job.master_gain, workers)
+                    for n, (start, count) in enumerate(self.segments)
+                ]
+
+                while not all(f.done() for f in futures):
+                    if job.is_cancelled():
+                        cancel_event.set()
+                    for f in futures:
+                        if f.done() and f.exception() is not None:
+                            cancel_event.set()
+                    try:
+                        index, done = progress_queue.get(timeout=0.1)
+                        seg_done[index] = done
+                        # Una sola barra: suma de los frames hechos por todos los segmentos
+                        job.report(sum(seg_done))
+                    except queue.Empty:
+                        pass
+
+                results = []
+                for f in futures:
+                    if f.exception() is not None:
+                        raise RenderError(f"Fallo en un segmento: {f.exception()}")
+                    results.append(f.result())
+
+            if job.is_cancelled() or not all(results):
+                return False
+            job.report(job.total_frames)
+            return splice_segments(
+                job, [(seg_paths[n], count) for n, (_, count) in enumerate(self.segments)], work_dir)
+        finally:
+            progress_queue.close()
+            shutil.rmtree(work_dir, ignore_errors=True)
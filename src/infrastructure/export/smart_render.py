@@ -0,0 +1,471 @@
+"""
+Smart render: copia de paquetes en los tramos sin modificar.
+
+Un tramo del timeline cubierto por un único clip de vídeo sin transformación,
+opacidad, fundido ni efectos, cuyo códec/resolución/fps coinciden con la
+exportación, no necesita decodificarse ni re-codificarse: sus GOPs se copian
+tal cual. Solo los bordes (hasta el siguiente keyframe) y los tramos
+modificados pasan por el motor. Todos los trozos se escriben como MPEG-TS
+(parámetros SPS/PPS en banda) y se empalman con el demuxer concat; el audio
+se mezcla siempre completo desde el timeline.
+
+Solo se copia desde keyframes limpios (IDR / GOP cerrado, sin B-frames
+iniciales que referencien el GOP anterior). El MP4 final declara un único
+juego de parámetros (avc1/hvc1), así que cada tramo copiado debe tener el
+mismo perfil, nivel, refs y SPS/PPS que el encoder configurado; si no, ese
+tramo se re-codifica.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import List, Optional
+
+from ...ui.models import TrackType
+from .. import media_info
+from ..ffmpeg_utils import FFmpegUtils
+from .audio_stream import AudioChannel, AudioStreamWriter
+from .engine_factory import IMAGE_EXTENSIONS
+from .render_job import RenderError, hidden_startupinfo, run_ffmpeg
+
+# Un tramo copiado más corto que esto no compensa los bordes re-codificados
+MIN_COPY_SECONDS = 2.0
+# Tolerancia para considerar que un keyframe cae en un límite de frame
+FRAME_ALIGN_TOLERANCE = 0.02
+# ISO/IEC 14496-15: las muestras sync (stss) de AVC son IDR. En otros
+# contenedores el flag K puede marcar cualquier I-frame.
+COPY_CONTAINERS = ('.mp4', '.mov', '.m4v')
+
+_EPS = 1e-6
+
+
+@dataclass
+class RenderSpan:
+    """Frames [start_frame, end_frame) of the program, copied or encoded."""
+    start_frame: int
+    end_frame: int
+    source_path: Optional[str] = None  # Set -> packet copy from this file
+    source_start: float = 0.0          # Input -ss (container time, s) of the first copied keyframe
+
+    @property
+    def is_copy(self):
+        return self.source_path is not None
+
+    @property
+    def frame_count(self):
+        return self.end_frame - self.start_frame
+
+
+def codec_family(name):
+    """'libx264' / 'h264_nvenc' / 'h264' -> 'h264'; same for HEVC. None if unknown."""
+    name = (name or "").lower()
+    if name in ("libx264", "h264") or name.startswith("h264_"):
+        return "h264"
+    if name in ("libx265", "hevc", "h265") or name.startswith("hevc_"):
+        return "hevc"
+    return None
+
+
+# ----------------------------------------------------------------------
+# Probing: datos del stream de la caché compartida (media_info); solo el
+# escaneo de keyframes es propio y se guarda en memoria por path/size/mtime.
+# ----------------------------------------------------------------------
+_keyframe_cache = {}
+_keyframe_lock = threading.Lock()
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def keyframe_times(path):
+    """
+    Clean keyframe times of the first video stream, relative to the stream
+    start (demux only, nothing is decoded), and the offset that converts them
+    to input -ss time: (keyframes, seek_offset). Cached per file. None on failure.
+
+    -ss counts from the container start (minimum over all streams); the video
+    stream can start later (audio priming, B-frame delay without edit list).
+
+    A keyframe is clean when no packet of its GOP is presented before it:
+    open-GOP I-frames (leading B-frames referencing the previous GOP) are
+    dropped, so a copy starting there decodes every packet it contains.
+    """
+    try:
+        key = _file_key(path)
+    except OSError:
+        return None
+    with _keyframe_lock:
+        if key in _keyframe_cache:
+            return _keyframe_cache[key]
+
+    result = None
+    try:
+        out = subprocess.check_output([
+            FFmpegUtils.get_ffprobe_path(), '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,flags:format=start_time',
+            '-of', 'compact=p=0', path
+        ], timeout=120.0, startupinfo=hidden_startupinfo()).decode('utf-8', 'replace')
+        # Paquetes en orden de decodificación; la última línea es el formato
+        packets = []
+        format_start = None
+        for line in out.splitlines():
+            fields = dict(item.split('=', 1) for item in line.split('|') if '=' in item)
+            if 'pts_time' in fields:
+                if fields['pts_time'] != 'N/A':
+                    packets.append((float(fields['pts_time']), 'K' in fields.get('flags', '')))
+            elif fields.get('start_time', 'N/A') != 'N/A':
+                format_start = float(fields['start_time'])
+        # Inicio del stream = menor pts (con B-frames no es el primer paquete)
+        start = min((pts for pts, _ in packets), default=0.0)
+        if format_start is None:
+            format_start = start
+
+        keyframes = []
+        key_pts = None
+        clean = False
+        for pts, is_key in packets:
+            if is_key:
+                if key_pts is not None and clean:
+                    keyframes.append(key_pts - start)
+                key_pts, clean = pts, True
+            elif key_pts is not None and pts < key_pts:
+                clean = False  # Leading picture: GOP abierto
+        if key_pts is not None and clean:
+            keyframes.append(key_pts - start)
+        keyframes.sort()
+        result = (keyframes, start - format_start)
+    except Exception as e:
+        print(f"SmartRender: keyframe scan failed for {os.path.basename(path)}: {e}", flush=True)
+
+    with _keyframe_lock:
+        _keyframe_cache[key] = result
+    return result
+
+
+def probe_stream(path):
+    """
+    Video stream info needed to decide packet-copy eligibility:
+    {'container', 'codec', 'pix_fmt', 'width', 'height', 'fps', 'rotation',
+    'keyframes', 'seek_offset'}. Codec/size/fps/rotation come from the shared
+    persistent media info cache (media_info.get_specs); keyframe times are
+    relative to the stream start, add seek_offset for input -ss.
+    Returns None on failure.
+    """
+    specs = media_info.get_specs(path)
+    if specs.get('width', 0) <= 0 or not specs.get('codec'):
+        return None
+    scan = keyframe_times(path)
+    if scan is None:
+        return None
+    keyframes, seek_offset = scan
+    return {
+        'container': os.path.splitext(path)[1].lower(),
+        'codec': specs['codec'],
+        'pix_fmt': specs.get('pix_fmt', ''),
+        'width': int(specs['width']),
+        'height': int(specs['height']),
+        'fps': float(specs['fps']),
+        'rotation': specs.get('rotation', 0),
+        'keyframes': keyframes,
+        'seek_offset': seek_offset,
+    }
+
+
+def segment_params(path):
+    """
+    (codec, profile, level, refs, SPS/PPS hash) of a written MPEG-TS segment,
+    or None if unknown. Two segments splice into one avc1/hvc1 track only if
+    these match.
+    """
+    try:
+        out = subprocess.check_output([
+            FFmpegUtils.get_ffprobe_path(), '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'stream=codec_name,profile,level,refs,extradata_hash',
+            '-show_data_hash', 'MD5', '-of', 'default=noprint_wrappers=1', path
+        ], timeout=30.0, startupinfo=hidden_startupinfo()).decode('utf-8', 'replace')
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"SmartRender: could not probe segment {os.path.basename(path)}: {e}", flush=True)
+        return None
+    fields = dict(line.split('=', 1) for line in out.splitlines() if '=' in line)
+    if not fields.get('extradata_hash'):
+        return None
+    return tuple(fields.get(k, '') for k in ('codec_name', 'profile', 'level', 'refs', 'extradata_hash'))
+
+
+# ----------------------------------------------------------------------
+# Planning
+# ----------------------------------------------------------------------
+def _is_untouched(clip):
+    """True if the engine would output the source pixels unchanged (fades aside)."""
+    t = clip.transform
+    if (abs(t.x) > _EPS or abs(t.y) > _EPS or abs(t.rotation) > _EPS
+            or abs(t.scale_x - 1.0) > _EPS or abs(t.scale_y - 1.0) > _EPS):
+        return False
+    if min(clip.start_opacity, clip.end_opacity, clip.opacity_level) < 0.999:
+        return False
+    if any(node[1] < 0.999 for node in clip.opacity_nodes):
+        return False
+    if any(eff.get('enabled', True) and (eff.get('path') or eff.get('plugin_path'))
+           for eff in (clip.effects or [])):
+        return False
+    path = clip.file_path
+    return bool(path) and os.path.exists(path) and not path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _stream_matches(info, family, enc_config, fps, width, height):
+    return (info is not None
+            and info['container'] in COPY_CONTAINERS
+            and codec_family(info['codec']) == family
+            and info['pix_fmt'] in ('yuv420p', 'yuvj420p')
+            and enc_config.pix_fmt in ('yuv420p', 'nv12')
+            and info['width'] == width and info['height'] == height
+            and abs(info['fps'] - fps) < 0.01
+            and info['rotation'] == 0
+            and len(info['keyframes']) > 1)
+
+
+def _copy_window(clip, a, b, fps, keyframes):
+    """
+    Largest GOP-aligned sub-span of timeline frames [a, b) for `clip`.
+    Returns (start_frame, end_frame, keyframe_time) or None.
+    """
+    # Tiempo de fuente del frame f: (offset + f - start) / fps
+    base = clip.source_offset_frames - clip.start_frame
+    src_a = (base + a) / fps
+    src_b = (base + b) / fps
+
+    aligned = [k for k in keyframes
+               if src_a - _EPS <= k <= src_b + _EPS
+               and abs(k * fps - round(k * fps)) < FRAME_ALIGN_TOLERANCE]
+    if len(aligned) < 2:
+        return None
+    # Se copia de un keyframe al último keyframe del tramo: GOPs completos
+    k0, k1 = aligned[0], aligned[-1]
+    f0 = int(round(k0 * fps)) - base
+    f1 = int(round(k1 * fps)) - base
+    if (f1 - f0) < MIN_COPY_SECONDS * fps:
+        return None
+    return f0, f1, k0
+
+
+def plan_smart_render(model, total_frames, fps, width, height, enc_config, probe=probe_stream):
+    """
+    Splits [0, total_frames) into copy and encode spans (ordered, contiguous).
+    Without any copyable span a single encode span is returned.
+    """
+    total_frames = int(total_frames)
+    whole = [RenderSpan(0, total_frames)]
+    family = codec_family(enc_config.codec)
+    if family is None or total_frames <= 0:
+        return whole
+
+    video_tracks = [i for i, t in enumerate(model.track_types) if t == TrackType.VIDEO]
+
+    def video_clips(lo, hi):
+        # Consultas por pista al índice de intervalos, no un recorrido de model.clips
+        return [c for track in video_tracks for c in model.clips_in_range(lo, hi, track)
+                if c.duration_frames > 0]
+
+    clips = video_clips(0, total_frames)
+
+    # Intervalos elementales: entre dos bordes consecutivos de clip el conjunto
+    # de clips activos no cambia.
+    edges = {0, total_frames}
+    for c in clips:
+        edges.add(max(0, min(total_frames, int(c.start_frame))))
+        edges.add(max(0, min(total_frames, int(c.start_frame + c.duration_frames))))
+    edges = sorted(edges)
+
+    copies = []
+    for a, b in zip(edges, edges[1:]):
+        active = video_clips(a, b)
+        if len(active) != 1 or not _is_untouched(active[0]):
+            continue
+        clip = active[0]
+        # Los frames con fundido pasan por el motor
+        a = max(a, int(clip.start_frame + clip.fade_in_frames))
+        b = min(b, int(clip.start_frame + clip.duration_frames - clip.fade_out_frames))
+        if b <= a:
+            continue
+        info = probe(clip.file_path)
+        if not _stream_matches(info, family, enc_config, fps, width, height):
+            continue
+        window = _copy_window(clip, a, b, fps, info['keyframes'])
+        if window is not None:
+            f0, f1, k0 = window
+            # Tiempo de stream -> tiempo de contenedor (-ss), solo aquí
+            copies.append(RenderSpan(f0, f1, clip.file_path, k0 + info['seek_offset']))
+
+    if not copies:
+        return whole
+
+    spans = []
+    cursor = 0
+    for span in copies:
+        if span.start_frame > cursor:
+            spans.append(RenderSpan(cursor, span.start_frame))
+        spans.append(span)
+        cursor = span.end_frame
+    if cursor < total_frames:
+        spans.append(RenderSpan(cursor, total_frames))
+    return spans
+
+
+# ----------------------------------------------------------------------
+# Execution
+# ----------------------------------------------------------------------
+class SmartRenderer:
+    """Executes a span plan for a RenderJob and splices the result."""
+
+    def __init__(self, job, spans: List[RenderSpan], enc_config):
+        self.job = job
+        self.spans = spans
+        self.enc_config = enc_config
+
+    def run(self):
+        job = self.job
+        copied = sum(s.frame_count for s in self.spans if s.is_copy)
+        print(f"SmartRender: {copied}/{job.total_frames} frames planned for copy, "
+              f"{sum(1 for s in self.spans if not s.is_copy)} spans re-encoded", flush=True)
+
+        out_dir = os.path.dirname(os.path.abspath(job.output_path))
+        work_dir = tempfile.mkdtemp(prefix=".rocky_smart_", dir=out_dir)
+        try:
+            done = 0
+            written = {}
+            # 1) Tramos re-codificados primero: fijan los parámetros del encoder
+            for n, span in enumerate(self.spans):
+                if span.is_copy:
+                    continue
+                if job.is_cancelled():
+                    return False
+                seg_path = os.path.join(work_dir, f"seg_{n:05d}.ts")
+                if not self._encode_span(span, seg_path, done):
+                    return False
+                written[n] = seg_path
+                done += span.frame_count
+                job.report(done)
+
+            reference = self._encoder_params(work_dir, written)
+
+            # 2) Copias: solo si perfil/nivel/refs/SPS-PPS coinciden con el encoder.
+            # CRITICAL: el MP4 declara un único juego de parámetros para toda la pista.
+            for n, span in enumerate(self.spans):
+                if not span.is_copy:
+                    continue
+                if job.is_cancelled():
+                    return False
+                seg_path = os.path.join(work_dir, f"seg_{n:05d}.ts")
+                self._copy_span(span, seg_path)
+                params = segment_params(seg_path)
+                if reference is None or params != reference:
+                    print(f"SmartRender: {os.path.basename(span.source_path)} parameters {params} "
+                          f"differ from the encoder {reference}, re-encoding frames "
+                          f"{span.start_frame}-{span.end_frame}", flush=True)
+                    if not self._encode_span(span, seg_path, done):
+                        return False
+                written[n] = seg_path
+                done += span.frame_count
+                job.report(done)
+
+            if job.is_cancelled():
+                return False
+            segments = [(written[n], span.frame_count) for n, span in enumerate(self.spans)]
+            return splice_segments(job, segments, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _encode_span(self, span, seg_path, progress_base):
+        # Solo vídeo: el audio se mezcla una única vez al empalmar
+        return self.job.render_range(seg_path, span.start_frame, span.frame_count,
+                                     self.enc_config, audio=False, progress_base=progress_base)
+
+    def _encoder_params(self, work_dir, written):
+        """
+        Parameter sets of the configured encoder: from the first re-encoded
+        segment or, if every span is a copy, from a one-frame sample.
+        """
+        if written:
+            return segment_params(written[min(written)])
+        sample = os.path.join(work_dir, "encoder_sample.ts")
+        if not self.job.render_range(sample, self.spans[0].start_frame, 1,
+                                     self.enc_config, audio=False, progress_base=0):
+            return None
+        return segment_params(sample)
+
+    def _copy_span(self, span, seg_path):
+        # CRITICAL: cortar por número de paquetes, no con -t. En copia -t corta por
+        # DTS y con B-frames arrastra el keyframe del GOP siguiente. Con GOPs
+        # completos y cerrados (keyframes limpios, ver keyframe_times) los N
+        # primeros paquetes en orden de decodificación son exactamente los N
+        # frames del tramo.
+        run_ffmpeg([
+            FFmpegUtils.get_ffmpeg_path(), '-y',
+            '-ss', f'{span.source_start:.6f}', '-i', span.source_path,
+            '-frames:v', str(span.frame_count),
+            '-map', '0:v:0', '-c:v', 'copy', '-an', '-sn', '-dn',
+            '-f', 'mpegts', seg_path
+        ], label="FFmpeg (copia)")
+
+
+def splice_segments(job, segments, work_dir):
+    """
+    Joins video-only segments [(path, frames)] without re-encoding (concat
+    demuxer) and muxes the program audio, mixed once from `job`.
+    Returns False if cancelled.
+    """
+    list_path = os.path.join(work_dir, "segments.txt")
+    with open(list_path, 'w', encoding='utf-8') as f:
+        f.write("ffconcat version 1.0\n")
+        for path, frames in segments:
+            escaped = path.replace("'", "'\\''")
+            f.write(f"file '{escaped}'\nduration {frames / job.fps:.6f}\n")
+
+    audio_channel = AudioChannel()
+    audio_writer = AudioStreamWriter(
+        job.create_engine(), AudioStreamWriter.samples_for(job.total_frames, job.fps), audio_channel)
+    try:
+        command = [
+            FFmpegUtils.get_ffmpeg_path(), '-y',
+            '-f', 'concat', '-safe', '0', '-i', list_path,
+            '-f', 'f32le', '-ar', '44100', '-ac', '2', '-i', audio_channel.url,
+            '-map', '0:v:0', '-map', '1:a:0',
+            '-c:v', 'copy', '-c:a', 'aac', '-b:a', '192k',
+            job.output_path
+        ]
+        with tempfile.TemporaryFile() as err_f:
+            process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                       stderr=err_f, startupinfo=hidden_startupinfo(),
+                                       pass_fds=audio_channel.pass_fds)
+            audio_channel.after_spawn()
+            audio_writer.start()
+            while process.poll() is None:
+                if job.is_cancelled():
+                    audio_writer.stop()
+                    process.terminate()
+                    process.wait()
+                    audio_writer.join()
+                    if os.path.exists(job.output_path):
+                        os.remove(job.output_path)
+                    return False
+                try:
+                    process.wait(timeout=0.2)
+                except subprocess.TimeoutExpired:
+                    pass
+            audio_writer.join()
+            if audio_writer.error is not None:
+                raise RenderError(f"Fallo en el audio: {audio_writer.error}")
+            if process.returncode != 0:
+                err_f.seek(0)
+                raise RenderError(f"Fallo en FFmpeg (Code {process.returncode}):\n"
+                                  f"{err_f.read().decode('utf-8', 'replace')}")
+        return True
+    finally:
+        if audio_writer.is_alive():
+            audio_writer.stop()
+            audio_writer.join(timeout=5.0)
+        audio_channel.close()
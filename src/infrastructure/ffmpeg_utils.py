@@ -3,7 +3,7 @@ import sys
 import subprocess
 import json
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 @dataclass
 class EncoderConfig:
@@ -13,6 +13,18 @@ class EncoderConfig:
     pix_fmt: str # "yuv420p" usually, but sometimes "nv12" preferred for HW
     extra_flags: List[str]
 
+    def to_codec_options(self) -> Dict[str, str]:
+        """
+        Translates the CLI-style flags into AVOptions for the in-process
+        encoder (rocky_core.Exporter): ("-q:v", "60") -> {"q": "60"}.
+        """
+        flags = list(self.preset_flag) + list(self.quality_flag) + list(self.extra_flags)
+        options = {}
+        for key, value in zip(flags[0::2], flags[1::2]):
+            name = key.lstrip('-').split(':')[0]  # Drop stream specifier (":v")
+            options[name] = str(value)
+        return options
+
 class FFmpegUtils:
     _cached_ffmpeg_path: Optional[str] = None
     _available_encoders: List[str] = []
@@ -102,6 +114,7 @@ class FFmpegUtils:
                 if "h264_nvenc" in line: encoders.append("h264_nvenc")
                 if "h264_qsv" in line: encoders.append("h264_qsv")
                 if "h264_amf" in line: encoders.append("h264_amf")
+                if "prores_videotoolbox" in line: encoders.append("prores_videotoolbox")
             
             FFmpegUtils._available_encoders = encoders
             
@@ -219,14 +232,18 @@ class FFmpegUtils:
                 )
 
     @staticmethod
-    def get_proxy_command(input_path: str, output_path: str) -> List[str]:
+    def get_proxy_command(input_path: str, output_path: str, profile=None) -> List[str]:
         """
         Returns the optimal FFmpeg command for proxy generation.
         PRESERVES NATIVE ORIENTATION: Uses -noautorotate and maps metadata
         to ensure the proxy is a perfect structural clone of the raw media.
+        `profile` (proxy_cache.ProxyProfile) selects height and codec
+        (Preferencias > Proxies); default 540p H.264.
         """
         ffmpeg = FFmpegUtils.get_ffmpeg_path()
         hw = FFmpegUtils.detect_hardware()
+        height = profile.height if profile else 540
+        codec = profile.codec if profile else "h264"
         
         # 1. Gather input specs
         specs = FFmpegUtils.get_media_specs(input_path)
@@ -235,29 +252,36 @@ class FFmpegUtils:
         # 2. Base Command (Disable auto-rotation to keep original tag context)
         cmd = [ffmpeg, "-y", "-noautorotate", "-i", input_path]
 
-        # 3. Scaling Strategy (Scale native dimensions to fit ~540 height)
-        # We always scale native height to 540 and width proportionally.
+        # 3. Scaling Strategy (Scale native dimensions to the profile height)
+        # We always scale native height and width proportionally.
         # Since tags are preserved, the engine will handle the visual swap correctly.
-        scale_filter = "scale=-2:540,setsar=1"
+        scale_filter = f"scale=-2:{height},setsar=1"
 
-        # 4. Hardware Encoding Segments
-        if hw == "vt":
-            # MAC Apple Silicon
-            if "prores_videotoolbox" in FFmpegUtils._available_encoders:
-                 cmd.extend([
-                     "-vf", scale_filter,
-                     "-c:v", "prores_videotoolbox", 
-                     "-profile:v", "proxy",
-                     "-c:a", "pcm_s16le",
-                     "-f", "mov"
-                 ])
+        # 4. Encoding Segments
+        if codec == "prores":
+            # ProRes 422 Proxy: intra-frame, seeks instantly, larger files
+            if hw == "vt" and "prores_videotoolbox" in FFmpegUtils._available_encoders:
+                cmd.extend(["-vf", scale_filter, "-c:v", "prores_videotoolbox", "-profile:v", "proxy"])
             else:
-                cmd.extend([
-                     "-vf", scale_filter,
-                     "-c:v", "h264_videotoolbox", 
-                     "-b:v", "2M", 
-                     "-c:a", "aac", "-ac", "2"
-                ])
+                cmd.extend(["-vf", scale_filter, "-c:v", "prores_ks", "-profile:v", "0"])
+            cmd.extend(["-c:a", "pcm_s16le", "-f", "mov"])
+        elif codec == "mjpeg":
+            # Edición: MJPEG all-intra. Decodifica más rápido que ProRes y está
+            # en cualquier build de FFmpeg; el motor detecta el stream intra y
+            # cada seek de scrub decodifica exactamente un frame.
+            cmd.extend([
+                "-vf", scale_filter,
+                "-c:v", "mjpeg", "-q:v", "4", "-pix_fmt", "yuvj420p",
+                "-c:a", "pcm_s16le", "-f", "mov"
+            ])
+        elif hw == "vt":
+            # MAC Apple Silicon
+            cmd.extend([
+                 "-vf", scale_filter,
+                 "-c:v", "h264_videotoolbox", 
+                 "-b:v", "2M", 
+                 "-c:a", "aac", "-ac", "2"
+            ])
         elif hw == "nvenc":
             # NVIDIA
             cmd.extend([
@@ -270,10 +294,10 @@ class FFmpegUtils:
             ])
         else:
             # CPU / Other
-            codec = "h264_qsv" if hw == "qsv" else ("h264_amf" if hw == "amf" else "libx264")
+            encoder = "h264_qsv" if hw == "qsv" else ("h264_amf" if hw == "amf" else "libx264")
             cmd.extend([
                 "-vf", scale_filter,
-                "-c:v", codec,
+                "-c:v", encoder,
                 "-g", "30"
             ])
             if hw == "cpu":
@@ -291,9 +315,18 @@ class FFmpegUtils:
     @staticmethod
     def get_media_specs(file_path: str) -> dict:
         """
-        ULTRA-ROBUST Prober for all media types.
-        Returns common specs using FFprobe with Apple-specific tag support.
-        If FFprobe fails, returns width=0 to signal Engine Fallback.
+        Specs of a media file, shared by every caller through the persistent
+        metadata cache (media_info): probed in-process once per file version.
+        width=0 signals Engine Fallback.
+        """
+        from .media_info import get_specs
+        return get_specs(file_path)
+
+    @staticmethod
+    def probe_with_ffprobe(file_path: str) -> dict:
+        """
+        ULTRA-ROBUST Prober for all media types (ffprobe subprocess).
+        Fallback for rocky_core builds without probe(); same keys as get_media_specs.
         """
         specs = {'width': 0, 'height': 0, 'fps': 30.0, 'rotation': 0, 'duration': 10.0}
         
@@ -302,7 +335,7 @@ class FFmpegUtils:
             cmd = [
                 ffp, '-v', 'error', '-select_streams', 'v:0',
                 '-analyzeduration', '20M', '-probesize', '20M',
-                '-show_entries', 'stream=width,height,r_frame_rate,duration:format=duration:side_data=rotation',
+                '-show_entries', 'stream=codec_name,pix_fmt,width,height,r_frame_rate,duration:format=duration:side_data=rotation',
                 '-of', 'json', file_path
             ]
             
@@ -314,6 +347,8 @@ class FFmpegUtils:
                 s = data['streams'][0]
                 specs['width'] = s.get('width', 0)
                 specs['height'] = s.get('height', 0)
+                specs['codec'] = s.get('codec_name', '')
+                specs['pix_fmt'] = s.get('pix_fmt', '')
                 
                 # FPS Robust parsing
                 rfps = s.get('r_frame_rate', '30/1')
@@ -0,0 +1,238 @@
+"""
+Filmstrips del timeline: miniaturas de keyframes guardadas como atlas JPEG.
+
+Una sola pasada secuencial por el fichero decodifica únicamente los
+keyframes (skip_frame=nokey en rocky_core) y los escala directamente al
+tamaño de miniatura. Las miniaturas se empaquetan en atlas de
+ATLAS_COLS x ATLAS_ROWS teselas en la caché de medios, indexada por el
+contenido del fichero:
+
+    ~/.rocky/cache/filmstrip/<content_key>/index.json    tiempos + tamaño
+    ~/.rocky/cache/filmstrip/<content_key>/atlas_0000.jpg ...
+
+index.json se escribe el último, así que su presencia marca una entrada
+completa. El painter elige las miniaturas según el zoom (una por ancho de
+miniatura en pantalla) y los atlas se cargan bajo demanda, solo cuando una
+tesela cae en la zona visible, con un LRU global que acota la memoria.
+"""
+import bisect
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QImage
+
+import rocky_core
+
+from . import media_cache, project_io
+
+FORMAT_VERSION = 1
+THUMB_HEIGHT = 64
+ATLAS_COLS = 8
+ATLAS_ROWS = 8
+JPEG_QUALITY = 80
+INDEX_FILE = "index.json"
+
+# Tope de miniaturas por medio: en material all-intra cada frame es keyframe
+MAX_THUMBS = 4096
+MIN_INTERVAL = 0.5
+# Sin la pasada de keyframes en rocky_core: muestreo con get_frame
+FALLBACK_INTERVAL = 2.0
+FALLBACK_MAX_THUMBS = 600
+
+# Atlas decodificados en memoria (8x8 teselas de ~114x64 ~ 1.9 MB cada uno)
+MAX_LOADED_ATLASES = 48
+
+IMAGE_EXTENSIONS = ("jpg", "jpeg", "png", "gif", "bmp", "webp")
+
+_atlas_lock = threading.Lock()
+_atlases = OrderedDict()  # (folder, n) -> QImage
+
+
+def _atlas_path(folder, n):
+    return os.path.join(folder, f"atlas_{n:04d}.jpg")
+
+
+def _load_atlas(folder, n):
+    key = (folder, n)
+    with _atlas_lock:
+        img = _atlases.get(key)
+        if img is not None:
+            _atlases.move_to_end(key)
+            return img
+    img = QImage(_atlas_path(folder, n))
+    if img.isNull():
+        return None
+    with _atlas_lock:
+        _atlases[key] = img
+        while len(_atlases) > MAX_LOADED_ATLASES:
+            _atlases.popitem(last=False)
+    return img
+
+
+class Filmstrip:
+    """Keyframe thumbnails of one media file, backed by on-disk atlases."""
+    __slots__ = ("folder", "times", "thumb_w", "thumb_h")
+
+    PER_ATLAS = ATLAS_COLS * ATLAS_ROWS
+
+    def __init__(self, folder, times, thumb_w, thumb_h):
+        self.folder = folder
+        self.times = times
+        self.thumb_w = thumb_w
+        self.thumb_h = thumb_h
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def load(cls, folder):
+        """Filmstrip stored in `folder`, or None if missing/incomplete/old."""
+        try:
+            with open(os.path.join(folder, INDEX_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != FORMAT_VERSION or not meta.get("times"):
+            return None
+        return cls(folder, meta["times"], meta["thumb_w"], meta["thumb_h"])
+
+    def nearest_index(self, seconds):
+        """Index of the last thumbnail at or before `seconds` (keyframe semantics)."""
+        i = bisect.bisect_right(self.times, seconds) - 1
+        return min(max(i, 0), len(self.times) - 1)
+
+    def tile(self, i):
+        """(atlas QImage, source QRect) of thumbnail i; loads the atlas lazily."""
+        atlas = _load_atlas(self.folder, i // self.PER_ATLAS)
+        if atlas is None:
+            return None, None
+        slot = i % self.PER_ATLAS
+        col, row = slot % ATLAS_COLS, slot // ATLAS_COLS
+        return atlas, QRect(col * self.thumb_w, row * self.thumb_h, self.thumb_w, self.thumb_h)
+
+    def image(self, i):
+        atlas, src = self.tile(i)
+        return atlas.copy(src) if atlas is not None else QImage()
+
+    def previews(self):
+        """Start / middle / end QImages (clip.thumbnails for the FX dialogs)."""
+        n = len(self.times)
+        return [self.image(i) for i in (0, n // 2, n - 1)]
+
+
+# ---------------------------------------------------------------------------
+# Registro en memoria: ruta -> Filmstrip (lo consulta el painter sin tocar disco)
+# ---------------------------------------------------------------------------
+_registry_lock = threading.Lock()
+_by_path = {}
+
+
+def lookup(path):
+    with _registry_lock:
+        return _by_path.get(path)
+
+
+def register(path, strip):
+    with _registry_lock:
+        _by_path[path] = strip
+
+
+# ---------------------------------------------------------------------------
+# Generación
+# ---------------------------------------------------------------------------
+def _to_qimage(rgb):
+    """HxWx3 uint8 array -> QImage (copied, owns its pixels)."""
+    rgb = np.ascontiguousarray(rgb)
+    h, w, _ = rgb.shape
+    return QImage(rgb.data, w, h, 3 * w, QImage.Format.Format_RGB888).copy()
+
+
+def _thumb_size(src_w, src_h, rotation):
+    """Decode size so that the upright thumbnail is THUMB_HEIGHT tall."""
+    if src_w <= 0 or src_h <= 0:
+        src_w, src_h = 16, 9
+    rotated = abs(rotation) % 180 == 90
+    # El escalado ocurre antes de rotar: con 90/270 el alto final es el ancho
+    out_h = THUMB_HEIGHT
+    out_w = max(2, round(out_h * (src_h / src_w if rotated else src_w / src_h)))
+    return (out_h, out_w) if rotated else (out_w, out_h)
+
+
+def _extract(path, stopped):
+    """[(seconds, HxWx3 uint8)] upright thumbnails, all the same size."""
+    ext = path.lower().rsplit(".", 1)[-1]
+    if ext in IMAGE_EXTENSIONS:
+        src = rocky_core.ImageSource(path)
+        frame = src.get_frame(0.0, THUMB_HEIGHT * 16 // 9, THUMB_HEIGHT)
+        return [(0.0, frame[..., :3])] if frame is not None else []
+
+    src = rocky_core.VideoSource(path)
+    rotation = src.get_rotation()
+    dec_w, dec_h = _thumb_size(src.get_width(), src.get_height(), rotation)
+    duration = max(0.0, src.get_duration())
+
+    if hasattr(src, "get_keyframe_thumbnails"):
+        interval = max(MIN_INTERVAL, duration / MAX_THUMBS)
+        frames = src.get_keyframe_thumbnails(dec_w, dec_h, interval)
+    else:
+        # rocky_core antiguo: muestreo a intervalo fijo (seek + decode por miniatura)
+        step = max(FALLBACK_INTERVAL, duration / FALLBACK_MAX_THUMBS)
+        frames, t = [], 0.0
+        while t <= duration and not stopped():
+            frame = src.get_frame(t, dec_w, dec_h)
+            if frame is not None:
+                frames.append((t, frame[..., :3]))
+            t += step
+
+    # Rotación en grados horarios (como el motor); rot90 con k<0 gira en sentido horario
+    k = -(int(round(rotation / 90.0)) % 4)
+    return [(t, np.rot90(f, k) if k else f) for t, f in frames]
+
+
+def _write(folder, thumbs):
+    """Packs thumbnails into JPEG atlases + index.json; returns the Filmstrip."""
+    os.makedirs(folder, exist_ok=True)
+    th, tw = thumbs[0][1].shape[:2]
+    per_atlas = Filmstrip.PER_ATLAS
+    for n in range(0, len(thumbs), per_atlas):
+        chunk = thumbs[n:n + per_atlas]
+        rows = (len(chunk) + ATLAS_COLS - 1) // ATLAS_COLS
+        atlas = np.zeros((rows * th, min(len(chunk), ATLAS_COLS) * tw, 3), dtype=np.uint8)
+        for slot, (_, frame) in enumerate(chunk):
+            x, y = (slot % ATLAS_COLS) * tw, (slot // ATLAS_COLS) * th
+            atlas[y:y + th, x:x + tw] = frame[:th, :tw]
+        path = _atlas_path(folder, n // per_atlas)
+        tmp = path + ".tmp.jpg"
+        if not _to_qimage(atlas).save(tmp, "JPG", JPEG_QUALITY):
+            raise OSError(f"No se pudo escribir {path}")
+        os.replace(tmp, path)
+
+    meta = {"version": FORMAT_VERSION, "thumb_w": tw, "thumb_h": th,
+            "times": [round(float(t), 4) for t, _ in thumbs]}
+    project_io.atomic_write(os.path.join(folder, INDEX_FILE), json.dumps(meta).encode("utf-8"))
+    return Filmstrip(folder, meta["times"], tw, th)
+
+
+def folder_for(key):
+    return os.path.join(media_cache.cache_dir("filmstrip"), key)
+
+
+def get_or_build(path, stopped=lambda: False):
+    """
+    Filmstrip for `path`: from the disk cache if this content was already
+    processed, otherwise one keyframe pass + atlas write. Registers the
+    result for the painter. Returns None if nothing could be extracted.
+    """
+    folder = folder_for(media_cache.content_key(path))
+    strip = Filmstrip.load(folder)
+    if strip is None:
+        thumbs = _extract(path, stopped)
+        if not thumbs or stopped():
+            return None
+        strip = _write(folder, thumbs)
+    register(path, strip)
+    return strip
@@ -0,0 +1,42 @@
+"""
+Caché de medios derivados (filmstrips, proxies...) bajo ~/.rocky/cache.
+
+Las entradas se indexan por el contenido del fichero y no por su ruta: si
+el mismo medio se importa desde otra carpeta (o se renombra) se reutiliza
+lo ya generado, y si el fichero cambia en el sitio la clave cambia sola.
+"""
+import hashlib
+import os
+
+# Bytes leídos del principio y del final del fichero para la clave
+_SAMPLE_BYTES = 1 << 20
+
+
+def cache_root():
+    return os.path.join(os.path.expanduser("~"), ".rocky", "cache")
+
+
+def cache_dir(kind):
+    """~/.rocky/cache/<kind> (created on demand)."""
+    folder = os.path.join(cache_root(), kind)
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def content_key(path):
+    """
+    sha1 of the file size plus its first and last MiB. Hashing whole
+    multi-GB camera files would cost more than the work being cached; size +
+    head (container header) + tail (index/moov) tells media files apart.
+    """
+    size = os.path.getsize(path)
+    h = hashlib.sha1()
+    h.update(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        h.update(f.read(_SAMPLE_BYTES))
+        if size > 2 * _SAMPLE_BYTES:
+            f.seek(size - _SAMPLE_BYTES)
+            h.update(f.read(_SAMPLE_BYTES))
+        elif size > _SAMPLE_BYTES:
+            h.update(f.read())
+    return h.hexdigest()
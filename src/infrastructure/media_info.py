@@ -0,0 +1,118 @@
+"""
+Metadatos de medios compartidos (importación, proxies, smart render, UI).
+
+Antes cada llamador lanzaba su propio ffprobe (-probesize 20M), así que un
+mismo fichero se analizaba 3-4 veces por importación y otra vez al reabrir
+el proyecto. Ahora se sondea en proceso con rocky_core.probe (libavformat,
+sin GIL) y el resultado se guarda en ~/.rocky/cache/media_info.json,
+indexado por ruta + tamaño + mtime: mientras el fichero no cambie no se
+vuelve a sondear, ni en esta sesión ni en las siguientes.
+"""
+import atexit
+import json
+import os
+import threading
+
+import rocky_core
+
+from . import media_cache, project_io
+
+# 2: las entradas incluyen codec/pix_fmt también con el fallback ffprobe
+CACHE_VERSION = 2
+MAX_ENTRIES = 5000
+# Las escrituras se agrupan: una importación por lotes guarda una vez
+SAVE_DELAY_S = 1.0
+
+# Valores por defecto de get_media_specs (width=0 indica fallo al motor)
+DEFAULT_SPECS = {'width': 0, 'height': 0, 'fps': 30.0, 'rotation': 0, 'duration': 10.0,
+                 'codec': '', 'pix_fmt': ''}
+
+
+class MediaInfoCache:
+    """Thread-safe path -> specs cache persisted as JSON."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(media_cache.cache_root(), "media_info.json")
+        self.probes = 0  # Sondeos reales (diagnóstico)
+        self._lock = threading.Lock()
+        self._entries = None  # Carga perezosa
+        self._save_timer = None
+
+    def _ensure_loaded(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, file_path):
+        """Specs for file_path; probes only if the file is new or changed."""
+        key = os.path.abspath(file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return dict(DEFAULT_SPECS)
+
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+            if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                return dict(entry["specs"])
+
+        specs = self._probe(key)
+        with self._lock:
+            self._entries.pop(key, None)  # Reinserta al final (orden = antigüedad)
+            self._entries[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "specs": specs}
+            while len(self._entries) > MAX_ENTRIES:
+                del self._entries[next(iter(self._entries))]
+            self._schedule_save()
+        return dict(specs)
+
+    def _probe(self, path):
+        self.probes += 1
+        if not hasattr(rocky_core, "probe"):
+            # rocky_core antiguo: ffprobe en subproceso
+            from .ffmpeg_utils import FFmpegUtils
+            return FFmpegUtils.probe_with_ffprobe(path)
+        specs = dict(DEFAULT_SPECS)
+        try:
+            specs.update(rocky_core.probe(path))
+        except Exception as e:
+            print(f"INFO: Probe failed for {os.path.basename(path)}: {e}")
+        return specs
+
+    def _schedule_save(self):
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(SAVE_DELAY_S, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Writes pending entries to disk (atomic)."""
+        with self._lock:
+            self._save_timer = None
+            if self._entries is None:
+                return
+            blob = json.dumps({"version": CACHE_VERSION, "entries": self._entries}).encode("utf-8")
+        try:
+            project_io.atomic_write(self.path, blob)
+        except OSError as e:
+            print(f"WARNING: Could not write media info cache: {e}")
+
+
+_cache = MediaInfoCache()
+atexit.register(lambda: _cache._save_timer is not None and _cache.flush())
+
+
+def get_specs(file_path):
+    """Shared entry point (FFmpegUtils.get_media_specs delegates here)."""
+    return _cache.get(file_path)
+
+
+def cache():
+    return _cache
@@ -0,0 +1,45 @@
+"""
+Rutas de DLLs nativas (FFmpeg/MinGW) para rocky_core en Windows.
+
+Desde Python 3.8 las dependencias de una extensión no se buscan en PATH:
+hay que registrarlas con os.add_dll_directory ANTES de importar rocky_core.
+Lo llama el launcher y también cada proceso hijo de la exportación por
+segmentos (spawn), que nunca ejecuta el bloque __main__ del launcher.
+"""
+import os
+import sys
+
+DLL_SUBDIRS = (os.path.join('external', 'ffmpeg', 'bin'), os.path.join('external', 'mingw', 'bin'))
+
+_registered = set()
+
+
+def project_root():
+    """external/ junto al ejecutable (instalado) o la raíz del bundle/repositorio."""
+    exe_dir = os.path.dirname(sys.executable)
+    if getattr(sys, 'frozen', False):
+        application_path = getattr(sys, '_MEIPASS', exe_dir)
+    else:
+        application_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    return exe_dir if os.path.isdir(os.path.join(exe_dir, "external")) else application_path
+
+
+def register_dll_directories(root=None):
+    """
+    Registers external/ffmpeg/bin and external/mingw/bin as DLL directories
+    and prepends them to PATH (for ffmpeg subprocesses). Idempotent.
+    """
+    root = root or project_root()
+    for d in DLL_SUBDIRS:
+        full = os.path.join(root, d)
+        if full in _registered or not os.path.isdir(full):
+            continue
+        _registered.add(full)
+        if hasattr(os, 'add_dll_directory'):
+            try:
+                os.add_dll_directory(full)
+                print(f"Added DLL directory {full}", flush=True)
+            except OSError as e:
+                print(f"WARNING: Could not add DLL directory {full}: {e}", flush=True)
+        if full not in os.environ.get('PATH', ''):
+            os.environ['PATH'] = full + os.pathsep + os.environ.get('PATH', '')
@@ -0,0 +1,40 @@
+"""
+Preferencias de usuario persistentes (diálogo Preferencias).
+
+QSettings guarda en el almacén nativo de cada sistema (plist, registro,
+.ini). Solo se guardan aquí opciones de la aplicación; las del proyecto
+(resolución, fps) viajan en el .rocky.
+"""
+from PySide6.QtCore import QSettings
+
+ORGANIZATION = "Rocky"
+APPLICATION = "RockyVideoEditor"
+
+DEFAULTS = {
+    "proxy/auto": True,
+    "proxy/resolution": "540p",
+    "proxy/codec": "H.264",
+    "preview/resolution": "Completa",
+    "preview/adaptive": True,
+    "preview/proxy_fallback": True,
+}
+
+
+def _settings():
+    return QSettings(ORGANIZATION, APPLICATION)
+
+
+def get(key):
+    default = DEFAULTS.get(key)
+    value = _settings().value(key, default)
+    # Algunos backends (ini) devuelven los booleanos como texto
+    if isinstance(default, bool) and isinstance(value, str):
+        return value.lower() in ("1", "true", "yes")
+    return value
+
+
+def set_many(values):
+    settings = _settings()
+    for key, value in values.items():
+        settings.setValue(key, value)
+    settings.sync()
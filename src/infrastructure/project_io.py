@@ -0,0 +1,140 @@
+"""
+Formato de proyecto .rocky (binario, versionado) y escritura atómica.
+
+Layout del fichero:
+
+    b"RKYP"          magic
+    uint16  version  FORMAT_VERSION (se rechaza un fichero más nuevo)
+    uint8   codec    CODEC_MSGPACK | CODEC_JSON
+    uint8   flags    FLAG_ZLIB
+    uint32  length   bytes del payload
+    uint32  crc32    del payload (detecta ficheros truncados)
+    payload          TimelineModel.to_dict() codificado (y comprimido)
+
+msgpack es opcional: si no está instalado se usa JSON compacto, que con
+el codificador C de json sigue siendo varias veces más rápido que el
+json.dump(indent=4) anterior (indent obliga al codificador en Python).
+
+Los proyectos JSON antiguos se siguen abriendo (se detectan por el magic) y
+JSON queda como formato de importación/exportación (export_json).
+"""
+import json
+import os
+import struct
+import tempfile
+import zlib
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MAGIC = b"RKYP"
+FORMAT_VERSION = 1
+CODEC_MSGPACK = 1
+CODEC_JSON = 2
+FLAG_ZLIB = 0x01
+_HEADER = struct.Struct("<4sHBBII")
+
+# Nivel 1: casi todo el ahorro de tamaño por una fracción del tiempo
+ZLIB_LEVEL = 1
+
+
+class ProjectFormatError(ValueError):
+    """The file is not a Rocky project or was written by a newer version."""
+
+
+def encode(data, codec=None, compress=True):
+    """Encodes a project dict into the binary .rocky representation."""
+    if codec is None:
+        codec = CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+    if codec == CODEC_MSGPACK:
+        payload = msgpack.packb(data, use_bin_type=True)
+    else:
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, ZLIB_LEVEL)
+        flags |= FLAG_ZLIB
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, codec, flags, len(payload),
+                          zlib.crc32(payload) & 0xFFFFFFFF)
+    return header + payload
+
+
+def decode(blob):
+    """Decodes a .rocky file (binary or legacy JSON) into the project dict."""
+    if not blob.startswith(MAGIC):
+        # Proyecto JSON (formato anterior / exportado)
+        try:
+            return json.loads(blob.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ProjectFormatError(f"No es un proyecto de Rocky: {e}") from e
+
+    if len(blob) < _HEADER.size:
+        raise ProjectFormatError("Cabecera de proyecto incompleta")
+    _, version, codec, flags, length, crc = _HEADER.unpack_from(blob)
+    if version > FORMAT_VERSION:
+        raise ProjectFormatError(
+            f"El proyecto usa el formato v{version}; esta versión solo lee hasta v{FORMAT_VERSION}")
+    payload = blob[_HEADER.size:_HEADER.size + length]
+    if len(payload) != length or (zlib.crc32(payload) & 0xFFFFFFFF) != crc:
+        raise ProjectFormatError("El proyecto está truncado o dañado (CRC)")
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ProjectFormatError("El proyecto se guardó con msgpack: instala 'msgpack' para abrirlo")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if codec == CODEC_JSON:
+        return json.loads(payload)
+    raise ProjectFormatError(f"Codec de proyecto desconocido: {codec}")
+
+
+def atomic_write(path, blob):
+    """
+    Writes to a temp file in the same folder, fsyncs and renames over `path`.
+    A crash leaves either the previous file or the new one, never half of it.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".rocky_save_", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save(data, path):
+    """Encodes a project dict (TimelineModel.to_dict snapshot) and writes it atomically."""
+    atomic_write(path, encode(data))
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+def load_model(path):
+    from ..ui.models import TimelineModel
+    return TimelineModel.from_dict(load(path))
+
+
+def export_json(data, path):
+    """Human-readable JSON export (same atomic write)."""
+    atomic_write(path, json.dumps(data, indent=4).encode("utf-8"))
+
+
+def autosave_path(project_path=None):
+    """~/.rocky/autosave/<project>.autosave.rocky (or untitled)."""
+    name = os.path.splitext(os.path.basename(project_path))[0] if project_path else "untitled"
+    folder = os.path.join(os.path.expanduser("~"), ".rocky", "autosave")
+    return os.path.join(folder, f"{name}.autosave.rocky")
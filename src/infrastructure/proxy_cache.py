@@ -0,0 +1,183 @@
+"""
+Caché central de proxies: ~/.rocky/cache/proxies.
+
+Cada proxy se nombra por el contenido del medio original y por el perfil
+(resolución + codec) con el que se generó:
+
+    <content_key>_<codec>_<alto>p.mp4|.mov
+    <content_key>_<codec>_<alto>p.mp4.done   marcador de finalización
+
+ffmpeg escribe en un fichero .partial que se renombra al terminar; el
+marcador (escrito de forma atómica, con el tamaño final) es lo único que
+hace válido un proxy, así que un encode interrumpido nunca se confunde con
+uno terminado. El mismo medio usado por varios clips, desde otra ruta o en
+otro proyecto comparte el mismo proxy.
+
+La cola de proxies pendientes se guarda en queue.json: si se cierra la
+aplicación a mitad, los que falten se retoman al volver a abrirla.
+"""
+import atexit
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+from . import media_cache, project_io
+
+PROXY_HEIGHTS = {"360p": 360, "540p": 540, "720p": 720}
+# "Edición": MJPEG all-intra, cada frame se decodifica solo (scrub = 1 frame)
+PROXY_CODECS = {"H.264": "h264", "ProRes 422 Proxy": "prores", "Edición (MJPEG intra)": "mjpeg"}
+INTRA_CODECS = ("prores", "mjpeg")
+MARKER_SUFFIX = ".done"
+
+# Sesiones de encoder hardware simultáneas razonables por tipo
+HW_SESSIONS = {"vt": 2, "nvenc": 3, "qsv": 2, "amf": 2}
+
+
+@dataclass(frozen=True)
+class ProxyProfile:
+    height: int = 540
+    codec: str = "h264"
+
+    @property
+    def extension(self):
+        return ".mov" if self.is_intra else ".mp4"
+
+    @property
+    def is_intra(self):
+        return self.codec in INTRA_CODECS
+
+    def key(self):
+        return f"{self.codec}_{self.height}p"
+
+    @classmethod
+    def from_key(cls, key):
+        codec, _, height = key.rpartition("_")
+        return cls(height=int(height.rstrip("p")), codec=codec)
+
+    @classmethod
+    def from_preferences(cls):
+        from . import preferences
+        return cls(height=PROXY_HEIGHTS.get(preferences.get("proxy/resolution"), 540),
+                   codec=PROXY_CODECS.get(preferences.get("proxy/codec"), "h264"))
+
+
+def cache_dir():
+    return media_cache.cache_dir("proxies")
+
+
+def proxy_path(content_key, profile):
+    return os.path.join(cache_dir(), f"{content_key}_{profile.key()}{profile.extension}")
+
+
+def partial_path(path):
+    # ffmpeg deduce el contenedor de la extensión: .partial va antes
+    root, ext = os.path.splitext(path)
+    return f"{root}.partial{ext}"
+
+
+def is_complete(path):
+    """True only if the marker exists and matches the proxy file size."""
+    try:
+        with open(path + MARKER_SUFFIX, "r", encoding="utf-8") as f:
+            return json.load(f)["size"] == os.path.getsize(path)
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def mark_complete(path, source_path, profile):
+    meta = {"source": source_path, "profile": profile.key(), "size": os.path.getsize(path)}
+    project_io.atomic_write(path + MARKER_SUFFIX, json.dumps(meta).encode("utf-8"))
+
+
+_locks_guard = threading.Lock()
+_output_locks = {}
+
+
+def output_lock(path):
+    """Per-output lock: two jobs for identical content never encode twice."""
+    with _locks_guard:
+        return _output_locks.setdefault(path, threading.Lock())
+
+
+def concurrency():
+    """
+    Proxy encodes allowed at once, by encoder type. Hardware encoders cap
+    concurrent sessions; libx264 already uses several cores per encode.
+    Until the first proxy job has detected the hardware (in its worker
+    thread, not the UI), a single slot is used.
+    """
+    from .ffmpeg_utils import FFmpegUtils
+    hw = FFmpegUtils._hardware_detected
+    if hw is None:
+        return 1
+    if hw in HW_SESSIONS:
+        return HW_SESSIONS[hw]
+    return max(1, (os.cpu_count() or 4) // 4)
+
+
+class ProxyQueue:
+    """Persistent journal of requested-but-unfinished proxies (resume on next launch)."""
+
+    SAVE_DELAY_S = 1.0
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(media_cache.cache_root(), "proxies", "queue.json")
+        self._lock = threading.Lock()
+        self._entries = None
+        self._save_timer = None
+
+    def _ensure_loaded(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = {(e["source"], e["profile"]) for e in json.load(f)}
+            except (OSError, ValueError, KeyError, TypeError):
+                self._entries = set()
+
+    def add(self, source_path, profile):
+        with self._lock:
+            self._ensure_loaded()
+            entry = (source_path, profile.key())
+            if entry not in self._entries:
+                self._entries.add(entry)
+                self._schedule_save()
+
+    def remove(self, source_path, profile):
+        with self._lock:
+            self._ensure_loaded()
+            entry = (source_path, profile.key())
+            if entry in self._entries:
+                self._entries.discard(entry)
+                self._schedule_save()
+
+    def pending(self):
+        """[(source_path, ProxyProfile)] left over from a previous session."""
+        with self._lock:
+            self._ensure_loaded()
+            return [(src, ProxyProfile.from_key(key)) for src, key in sorted(self._entries)]
+
+    def _schedule_save(self):
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.SAVE_DELAY_S, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._save_timer = None
+            if self._entries is None:
+                return
+            blob = json.dumps([{"source": s, "profile": k} for s, k in sorted(self._entries)])
+        try:
+            project_io.atomic_write(self.path, blob.encode("utf-8"))
+        except OSError as e:
+            print(f"WARNING: Could not write proxy queue: {e}")
+
+
+_queue = ProxyQueue()
+atexit.register(lambda: _queue._save_timer is not None and _queue.flush())
+
+
+def queue():
+    return _queue
@@ -0,0 +1,89 @@
+"""
+Calidad adaptativa de la preview durante la reproducción.
+
+El VideoWorker mide cuánto tarda cada evaluate(); si la composición no
+cabe en el intervalo de frame, el gobernador baja un nivel de resolución
+de preview (1/2, 1/4, 1/8) y, si se permite, sustituye el vídeo de los
+clips por sus proxies. Solo sube cuando hay margen sostenido, para no
+oscilar entre niveles en cada frame (histéresis asimétrica: bajar es
+rápido, subir es lento). Al pausar se vuelve a calidad completa.
+"""
+
+# Etiquetas = opciones de Preferencias > Visor > Resolución de Preview
+LEVELS = (("Completa", 1.0), ("1/2", 0.5), ("1/4", 0.25), ("1/8", 0.125))
+
+
+def level_for_label(label):
+    for index, (name, _) in enumerate(LEVELS):
+        if name == label:
+            return index
+    return 0
+
+
+class QualityGovernor:
+    """
+    Steps the preview level from evaluate() latency vs. the frame budget.
+
+    - Down one level after DOWN_AFTER consecutive frames over budget.
+    - Up one level after UP_AFTER consecutive frames under
+      budget * UP_HEADROOM (the cheaper level must leave real slack).
+    - Never above `ceiling` (the preference) nor below the last level.
+    """
+    DOWN_AFTER = 3
+    UP_AFTER = 45
+    UP_HEADROOM = 0.5
+
+    def __init__(self, ceiling=0, adaptive=True, use_proxies=True):
+        self.ceiling = ceiling
+        self.adaptive = adaptive
+        self.use_proxies = use_proxies
+        self.level = ceiling
+        self.budget_s = 1.0 / 30.0
+        self._over = 0
+        self._under = 0
+
+    def reset(self, fps, playback_rate=1.0):
+        """Start of playback: back to the ceiling and a fresh frame budget."""
+        self.level = self.ceiling
+        self.budget_s = 1.0 / max(1.0, fps * max(0.1, playback_rate))
+        self._over = self._under = 0
+
+    @property
+    def scale(self):
+        return LEVELS[self.level][1]
+
+    @property
+    def label(self):
+        return LEVELS[self.level][0]
+
+    @property
+    def degraded(self):
+        """True once playback dropped below the preferred level (proxies kick in)."""
+        return self.level > self.ceiling
+
+    @property
+    def proxies_active(self):
+        return self.use_proxies and self.degraded
+
+    def record(self, latency_s):
+        """Feeds one evaluate() duration. Returns True if the level changed."""
+        if not self.adaptive:
+            return False
+        if latency_s > self.budget_s:
+            self._over += 1
+            self._under = 0
+            if self._over >= self.DOWN_AFTER and self.level < len(LEVELS) - 1:
+                self.level += 1
+                self._over = 0
+                return True
+        elif latency_s < self.budget_s * self.UP_HEADROOM:
+            self._under += 1
+            self._over = 0
+            if self._under >= self.UP_AFTER and self.level > self.ceiling:
+                self.level -= 1
+                self._under = 0
+                return True
+        else:
+            # Zona muerta: ni sobra ni falta, el nivel actual es el bueno
+            self._over = self._under = 0
+        return False
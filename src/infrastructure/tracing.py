@@ -0,0 +1,183 @@
+"""
+Grabación de trazas Chrome/Perfetto (spans) del motor C++ y de los workers Python.
+
+    from src.infrastructure import tracing
+    tracing.start()
+    with tracing.span("evaluate", t=1.5):
+        ...
+    tracing.stop()
+    tracing.save("trace.json")      # abrir en https://ui.perfetto.dev
+
+o directamente tracing.record_for(5) (lo que usan el menú y el terminal).
+
+Desactivado, span() devuelve un contextmanager vacío compartido: el coste es
+una comprobación de bool. Los spans del núcleo se graban en C++
+(rocky_core.trace_*) y se fusionan aquí al parar, con el reloj alineado y los
+mismos ids de hilo del sistema (threading.get_native_id).
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+try:
+    import rocky_core
+except ImportError:
+    rocky_core = None
+
+_NULL_SPAN = contextlib.nullcontext()
+
+_lock = threading.Lock()
+_enabled = False
+_events = []          # (name, args, start_us, dur_us, tid)
+_thread_names = {}    # tid -> nombre
+_t0_us = 0.0
+_core_offset_us = 0.0  # perf_counter_us - rocky_core.trace_clock_us
+_stop_timer = None
+
+
+def _now_us():
+    return time.perf_counter_ns() / 1000.0
+
+
+def _has_core_tracing():
+    return rocky_core is not None and hasattr(rocky_core, "trace_start")
+
+
+def enabled():
+    return _enabled
+
+
+def set_thread_name(name):
+    """Names the calling thread in the trace (Perfetto track title)."""
+    with _lock:
+        _thread_names[threading.get_native_id()] = name
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, *exc):
+        end = _now_us()
+        if _enabled:
+            with _lock:
+                _events.append((self.name, self.args, self.start, end - self.start,
+                                threading.get_native_id()))
+        return False
+
+
+def span(name, **args):
+    """Context manager recording `name` (with optional args) while tracing is on."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def start():
+    """Clears previous events and starts recording in Python and in the core."""
+    global _enabled, _t0_us, _core_offset_us
+    with _lock:
+        _events.clear()
+        _t0_us = _now_us()
+        if _has_core_tracing():
+            _core_offset_us = _now_us() - rocky_core.trace_clock_us()
+            rocky_core.trace_start()
+        _enabled = True
+    set_thread_name(threading.current_thread().name)
+
+
+def stop():
+    """Stops recording and pulls the C++ spans into the Python buffer."""
+    global _enabled
+    with _lock:
+        if not _enabled:
+            return
+        _enabled = False
+        if _has_core_tracing():
+            rocky_core.trace_stop()
+            for name, detail, start_us, dur_us, tid in rocky_core.trace_collect():
+                args = {"clip": detail} if detail else {}
+                _events.append((name, args, start_us + _core_offset_us, dur_us, tid))
+            dropped = rocky_core.trace_dropped()
+            if dropped:
+                print(f"Tracing: el núcleo descartó {dropped} eventos (buffer lleno)")
+
+
+def to_chrome_trace():
+    """Chrome trace JSON object ("X" complete events + thread_name metadata)."""
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+        names = dict(_thread_names)
+    trace_events = [
+        {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "Rocky"}}
+    ]
+    for tid, name in names.items():
+        trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                             "args": {"name": name}})
+    for name, args, start_us, dur_us, tid in sorted(events, key=lambda e: e[2]):
+        trace_events.append({"name": name, "ph": "X", "pid": pid, "tid": tid,
+                             "ts": round(start_us - _t0_us, 3), "dur": round(dur_us, 3),
+                             "args": args})
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def default_path():
+    folder = os.path.join(os.path.expanduser("~"), ".rocky", "traces")
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, time.strftime("trace_%Y%m%d_%H%M%S.json"))
+
+
+def save(path=None):
+    """Writes the recorded events as Chrome trace JSON and returns the path."""
+    path = path or default_path()
+    data = to_chrome_trace()
+    with open(path, "w") as f:
+        json.dump(data, f)
+    print(f"Tracing: {len(data['traceEvents'])} eventos guardados en {path}")
+    return path
+
+
+def record_for(seconds, path=None, on_done=None):
+    """
+    Records for `seconds` without blocking the caller. When the time is up the
+    trace is saved and on_done(path) is called FROM A TIMER THREAD (path is
+    None if saving failed); Qt callers must marshal it, e.g. via a Signal.
+    Returns the output path. Raises RuntimeError if a recording is running.
+    """
+    global _stop_timer
+    path = path or default_path()
+
+    def finish():
+        global _stop_timer
+        stop()
+        saved = None
+        try:
+            saved = save(path)
+        except OSError as e:
+            print(f"Tracing: no se pudo guardar {path}: {e}")
+        with _lock:
+            _stop_timer = None
+        if on_done:
+            on_done(saved)
+
+    timer = threading.Timer(seconds, finish)
+    timer.daemon = True
+    with _lock:
+        # CRITICAL: start() borra los eventos; otra grabación en curso perdería los
+        # suyos y su timer pararía esta antes de tiempo
+        if _enabled or _stop_timer is not None:
+            raise RuntimeError("Ya se está grabando una traza")
+        _stop_timer = timer
+    start()
+    timer.start()
+    return path
@@ -1,18 +1,58 @@
 from PySide6.QtCore import QThread, Signal
 import os
-import json
-import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import rocky_core
 from ..ffmpeg_utils import FFmpegUtils
+from ..export.engine_factory import create_media_source
+
+IMAGE_EXTENSIONS = ["jpg", "jpeg", "png", "gif", "bmp", "webp"]
+
+
+def probe_for_import(file_path, fps):
+    """
+    Returns (duration_frames, width, height, rotation, fps) for a media file.
+    Multi-stage: cached/in-process probe first, engine fallback if it fails.
+    """
+    # Result placeholders
+    w, h, rot, dur_frames = 1920, 1080, 0, 300
+
+    ext = os.path.basename(file_path).lower().split('.')[-1]
+    is_image = ext in IMAGE_EXTENSIONS
+
+    if not is_image:
+        # STAGE 1: Robust Full Probe (Returns NATIVE dimensions)
+        specs = FFmpegUtils.get_media_specs(file_path)
+        w, h, rot, fps = specs['width'], specs['height'], specs['rotation'], specs['fps']
+
+        # Apply swap for STAGE 1 (ffprobe)
+        if abs(rot) == 90 or abs(rot) == 270:
+            w, h = h, w
+
+        dur_sec = specs['duration']
+        dur_frames = int(dur_sec * fps)
+
+        # STAGE 2: Emergency Fallback using Engine (Returns VISUAL dimensions)
+        if w <= 0 or h <= 0:
+            try:
+                temp_src = rocky_core.VideoSource(file_path)
+                # NO SWAP NEEDED HERE - Engine getters are now visual-aware
+                w = temp_src.get_width()
+                h = temp_src.get_height()
+                rot = temp_src.get_rotation()
+            except:
+                pass
+
+    return dur_frames, w, h, rot, fps
+
 
 class MediaImportWorker(QThread):
     """
     ULTRA-FAST & RESILIENT Media Prober.
-    Aims for <1s response while providing multi-stage fallbacks to 
+    Aims for <1s response while providing multi-stage fallbacks to
     prevent timeouts from blocking the project.
     """
     # Emits: file_path, duration_frames, source (None), width, height, rotation, fps
-    finished = Signal(str, float, object, int, int, int, float) 
+    finished = Signal(str, float, object, int, int, int, float)
     error = Signal(str, str)
 
     def __init__(self, file_path, fps=30.0):
@@ -20,44 +60,70 @@ class MediaImportWorker(QThread):
         self.file_path = file_path
         self.fps = fps
         self._stopped = False
-        
+
     def stop(self):
         self._stopped = True
 
     def run(self):
-        # Result placeholders
-        w, h, rot, fps, dur_frames = 1920, 1080, 0, self.fps, 300
-        
         try:
-            ext = os.path.basename(self.file_path).lower().split('.')[-1]
-            is_image = ext in ["jpg", "jpeg", "png", "gif", "bmp", "webp"]
-            
-            if not is_image:
-                # STAGE 1: Robust Full Probe (Returns NATIVE dimensions)
-                specs = FFmpegUtils.get_media_specs(self.file_path)
-                w, h, rot, fps = specs['width'], specs['height'], specs['rotation'], specs['fps']
-                
-                # Apply swap for STAGE 1 (ffprobe)
-                if abs(rot) == 90 or abs(rot) == 270:
-                    w, h = h, w
-                    
-                dur_sec = specs['duration']
-                dur_frames = int(dur_sec * fps)
-                
-                # STAGE 2: Emergency Fallback using Engine (Returns VISUAL dimensions)
-                if w <= 0 or h <= 0:
-                    try:
-                        temp_src = rocky_core.VideoSource(self.file_path)
-                        # NO SWAP NEEDED HERE - Engine getters are now visual-aware
-                        w = temp_src.get_width()
-                        h = temp_src.get_height()
-                        rot = temp_src.get_rotation()
-                    except:
-                        pass
-            
+            dur_frames, w, h, rot, fps = probe_for_import(self.file_path, self.fps)
             # Sub-second emission
             self.finished.emit(self.file_path, float(dur_frames), None, w, h, rot, float(fps))
-            
+
         except Exception as e:
             # Absolute last resort for worker survival
             self.error.emit(self.file_path, str(e))
+
+
+class BatchImportWorker(QThread):
+    """
+    Probes many files in parallel (bounded pool) for a bulk import and opens
+    their engine sources off the UI thread. rocky_core.probe releases the
+    GIL, so the pool really overlaps the container reads. Emits a single
+    `finished` with one result dict per input path (input order) so the UI
+    can place every clip in one model transaction.
+    """
+    progress = Signal(int, int)  # done, total
+    finished = Signal(list)
+
+    MAX_PARALLEL = 8
+
+    def __init__(self, file_paths, fps=30.0, source_cache=None):
+        super().__init__()
+        self.file_paths = list(file_paths)
+        self.fps = fps
+        # Solo lectura: rutas que la UI ya tiene abiertas
+        self.known_sources = set(source_cache or ())
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    def _probe_one(self, path):
+        if self._stopped:
+            return {"path": path, "error": "cancelled"}
+        try:
+            dur_frames, w, h, rot, fps = probe_for_import(path, self.fps)
+            result = {"path": path, "duration": float(dur_frames), "width": w, "height": h,
+                      "rotation": rot, "fps": float(fps), "source": None}
+            if path not in self.known_sources:
+                # Abrir el decoder aquí evita cientos de aperturas en el hilo de UI
+                result["source"] = create_media_source(path)
+            return result
+        except Exception as e:
+            return {"path": path, "error": str(e)}
+
+    def run(self):
+        total = len(self.file_paths)
+        results = [None] * total
+        done = 0
+        # Acotado por E/S, no por CPU: el probe espera al disco sin el GIL
+        workers = max(1, min(self.MAX_PARALLEL, total))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rocky-import") as pool:
+            futures = {pool.submit(self._probe_one, p): i for i, p in enumerate(self.file_paths)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                done += 1
+                self.progress.emit(done, total)
+        if not self._stopped:
+            self.finished.emit(results)
@@ -0,0 +1,175 @@
+"""
+Workers de reproducción (audio y vídeo) y el cálculo del reloj maestro.
+
+Solo dependen de QtCore: RockyApp los usa con el QAudioSink real y el
+benchmark de reproducción (benchmarks/playback_bench.py) con un reloj de
+audio simulado.
+"""
+import time
+
+from PySide6.QtCore import QThread, Signal, QMutex, QMutexLocker
+
+from .. import tracing
+
+
+def playback_clock_frame(start_frame, start_audio_us, audio_us, fps, rate=1.0):
+    """
+    Timeline frame for the current audio clock reading.
+    The audio device clock is the master: video follows whatever it reports.
+    """
+    elapsed_us = max(0, audio_us - start_audio_us)
+    return start_frame + (elapsed_us / 1_000_000.0) * fps * rate
+
+
+class AudioWorker(QThread):
+    def __init__(self, engine, player, model):
+        super().__init__()
+        self.engine = engine
+        self.player = player
+        self.model = model
+        self.running = False
+        self.last_audio_render_time = -1.0
+        self.fps = 30.0
+
+    def _resample_stereo(self, data, target_len):
+        if data is None or data.size == 0 or target_len <= 0:
+            return data
+            
+        import rocky_core
+        # Direct C++ call: No-copy where possible and multithreaded-safe
+        return rocky_core.RockyEngine.resample_audio(data, target_len)
+
+    def run(self):
+        self.running = True
+        tracing.set_thread_name("AudioWorker")
+        while self.running and not self.isInterruptionRequested():
+            if not self.model.blueline.playing:
+                self.msleep(50)
+                continue
+
+            current_buffer_ms = self.player.get_buffer_duration_ms()
+            
+            # Use shared playback rate
+            rate = getattr(self.model.blueline, 'playback_rate', 1.0)
+            
+            # Reducimos drásticamente el buffer para reaccionar rápido (Objetivo: 300ms)
+            if current_buffer_ms < 150:
+                missing_ms = 300 - current_buffer_ms
+                missing_duration = missing_ms / 1000.0 # Physical time to fill
+                
+                try:
+                    if not hasattr(self.model, 'audio_samples_rendered'):
+                        self.model.audio_samples_rendered = 0
+                        
+                    render_start_time = self.model.audio_samples_rendered / 44100.0
+                    
+                    # SCALE timeline duration by rate
+                    # If we need 0.5s of real audio but playing at 2x, we need 1.0s of content
+                    content_duration = missing_duration * rate
+                    
+                    if content_duration > 0:
+                        # CRITICAL FIX: We do NOT use the Python locker here.
+                        # The C++ RockyEngine HAS its own internal std::mutex for render_audio.
+                        # Using the Python engine_lock here causes deadlocks with the GIL 
+                        # because render_audio releases the GIL internally.
+                        with tracing.span("render_audio", t=render_start_time, buffer_ms=current_buffer_ms):
+                            audio_content = self.engine.render_audio(render_start_time, content_duration)
+                        
+                        if audio_content is not None and audio_content.size > 0:
+                            # Resample timeline content to fit physical time
+                            target_sample_count = int(missing_duration * 44100)
+                            
+                            if rate != 1.0:
+                                audio_final = self._resample_stereo(audio_content, target_sample_count)
+                            else:
+                                audio_final = audio_content
+                            
+                            self.player.write_samples(audio_final)
+                            # Update tracking based on TIMELINE samples actually rendered:
+                            # render_audio redondea (lround), int() truncaría y el siguiente
+                            # chunk pediría una muestra antes del final de este (seek + muestra doble)
+                            self.model.audio_samples_rendered += audio_content.size // 2
+                    else:
+                        # If rate is 0, we just wait
+                        pass
+                        
+                except Exception as e:
+                    print(f"AudioWorker Error: {e}")
+            
+            self.msleep(20)
+        
+
+    def start_playback(self, start_time, fps, rate=1.0):
+        self.fps = fps
+        self.player.clear_buffer()
+        # Convertimos el tiempo inicial a muestras exactas
+        self.model.audio_samples_rendered = int(start_time * 44100)
+        
+        # Pre-buffer inicial muy potente (1.2s) para garantizar arranque suave
+        initial = self.engine.render_audio(start_time, 1.2)
+        self.player.write_samples(initial)
+
+        self.model.audio_samples_rendered += (initial.size // 2)
+        
+        self.player.sink.resume()
+
+    def stop_playback(self):
+        self.player.sink.suspend()
+
+class VideoWorker(QThread):
+    """
+    Handles video frame evaluation in a background thread to prevent UI stutter.
+    Communicates with the UI thread via signals.
+    """
+    frame_ready = Signal(object)
+    # timestamp, segundos de evaluate() (lo consume el QualityGovernor)
+    frame_timing = Signal(float, float)
+
+    def __init__(self, engine, engine_lock):
+        super().__init__()
+        self.engine = engine
+        self.engine_lock = engine_lock
+        self.running = False
+        self._target_timestamp = -1.0
+        self._mutex = QMutex()
+        self._has_new_request = False
+
+    def request_frame(self, timestamp):
+        """Asynchronously requests a frame for the given timestamp."""
+        locker = QMutexLocker(self._mutex)
+        self._target_timestamp = timestamp
+        self._has_new_request = True
+
+    def run(self):
+        self.running = True
+        last_processed = -1.0
+        tracing.set_thread_name("VideoWorker")
+        
+        while self.running and not self.isInterruptionRequested():
+            timestamp = -1.0
+            locker = QMutexLocker(self._mutex)
+            if self._has_new_request:
+                timestamp = self._target_timestamp
+                self._has_new_request = False
+            del locker
+
+            if timestamp != -1.0 and timestamp != last_processed:
+                try:
+                    # HEAVY OPERATION: Evaluate project state at this timestamp
+                    # This involves FFmpeg decoding and C++ compositing.
+                    with tracing.span("evaluate", t=timestamp):
+                        locker = QMutexLocker(self.engine_lock)
+                        started = time.perf_counter()
+                        frame = self.engine.evaluate(timestamp)
+                        elapsed = time.perf_counter() - started
+                        del locker
+                    
+                    self.frame_ready.emit(frame)
+                    self.frame_timing.emit(timestamp, elapsed)
+                    last_processed = timestamp
+                except Exception as e:
+                    print(f"VideoWorker Error: {e}")
+            
+            # Tiny sleep to prevent 100% CPU usage in the polling loop
+            # and allow the GIL to be shared.
+            self.msleep(2)
@@ -0,0 +1,34 @@
+from PySide6.QtCore import QThread, Signal
+
+from ..export.prerender import prerender_range
+
+
+class PrerenderWorker(QThread):
+    """Background pre-render of a timeline range into the render cache."""
+    progress = Signal(int)
+    finished = Signal(object)  # PrerenderEntry
+    error = Signal(str)
+
+    def __init__(self, model, start_frame, end_frame, fps, width, height):
+        super().__init__()
+        # Snapshot: el usuario puede seguir editando mientras se renderiza.
+        # Si toca el rango, la firma no coincidirá y la entrada se descartará.
+        self.model = model
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.fps = fps
+        self.width = width
+        self.height = height
+
+    def run(self):
+        try:
+            entry = prerender_range(
+                self.model, self.start_frame, self.end_frame, self.fps, self.width, self.height,
+                on_progress=lambda done, total: self.progress.emit(int(done / max(1, total) * 100)),
+                is_cancelled=self.isInterruptionRequested
+            )
+            if entry is not None:
+                self.finished.emit(entry)
+        except Exception as e:
+            print(f"PrerenderWorker Exception: {e}")
+            self.error.emit(str(e))
@@ -0,0 +1,27 @@
+from PySide6.QtCore import QThread, Signal
+
+from .. import project_io
+
+
+class ProjectSaveWorker(QThread):
+    """
+    Encodes and writes a project snapshot off the UI thread (save and autosave).
+    The snapshot is the TimelineModel.to_dict() taken on the UI thread, so
+    editing can continue while the file is written.
+    """
+    finished = Signal(str)  # path
+    error = Signal(str)
+
+    def __init__(self, snapshot, path, autosave=False):
+        super().__init__()
+        self.snapshot = snapshot
+        self.path = path
+        self.autosave = autosave
+
+    def run(self):
+        try:
+            project_io.save(self.snapshot, self.path)
+            self.finished.emit(self.path)
+        except Exception as e:
+            print(f"ProjectSaveWorker Exception: {e}")
+            self.error.emit(str(e))
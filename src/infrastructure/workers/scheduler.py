@@ -0,0 +1,245 @@
+import heapq
+import itertools
+import os
+
+from PySide6.QtCore import QObject, Signal, SIGNAL
+
+
+class JobClass:
+    IMPORT = "import"
+    WAVEFORM = "waveform"
+    THUMBNAIL = "thumbnail"
+    PROXY = "proxy"
+    PRERENDER = "prerender"
+
+
+# Hilos simultáneos por clase. Probe/miniaturas/waveform son cortos y de E/S;
+# proxies y pre-render lanzan encoders que ya usan varios núcleos cada uno.
+_CPUS = os.cpu_count() or 4
+DEFAULT_LIMITS = {
+    JobClass.IMPORT: 4,
+    JobClass.WAVEFORM: max(1, min(4, _CPUS // 4)),
+    JobClass.THUMBNAIL: max(1, min(4, _CPUS // 4)),
+    JobClass.PROXY: max(1, min(2, _CPUS // 8)),
+    JobClass.PRERENDER: 1,
+}
+
+# Menor = antes
+PRIORITY_VISIBLE = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BACKGROUND = 20
+
+
+class Job:
+    """One unit of background work; several requesters may share it (same key)."""
+    __slots__ = ("job_class", "key", "factory", "priority", "seq", "subscribers",
+                 "error_subscribers", "worker", "cancelled")
+
+    def __init__(self, job_class, key, factory, priority, seq):
+        self.job_class = job_class
+        self.key = key
+        self.factory = factory
+        self.priority = priority
+        self.seq = seq
+        self.subscribers = []
+        self.error_subscribers = []
+        self.worker = None
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class JobScheduler(QObject):
+    """
+    Central queue for the media background workers (import probes, waveforms,
+    filmstrips, proxies, pre-renders).
+
+    - Per-class concurrency limits: a 300-clip project no longer starts
+      hundreds of threads and ffmpeg processes at once.
+    - Priorities: pending jobs start lowest-priority-number first (visible
+      clips before the rest), FIFO within a priority.
+    - De-duplication by (class, key): a job for a media path that is already
+      queued or running gets the new requester as one more subscriber.
+    - Cancellation of pending jobs (dropped) and running ones (stop()).
+    - progress(done, total) over the current batch; idle() when it drains.
+
+    Workers stay plain QThreads with their own `finished`/`error` signals.
+    `factory()` builds the worker on the UI thread when a slot frees up;
+    every subscriber is called with the worker's `finished` arguments.
+    """
+    progress = Signal(int, int)  # done, total
+    idle = Signal()
+
+    def __init__(self, limits=None, parent=None):
+        # limits: job_class -> int, o callable() -> int evaluado en cada pump
+        super().__init__(parent)
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self._seq = itertools.count()
+        self._pending = {}   # job_class -> heap of Job
+        self._running = {}   # job_class -> set of Job
+        self._jobs = {}      # (job_class, key) -> Job (pending o en curso)
+        self._by_worker = {}
+        self._done = 0
+        self._total = 0
+
+    # ------------------------------------------------------------------
+    def submit(self, job_class, key, factory, on_result=None, on_error=None,
+               priority=PRIORITY_NORMAL):
+        """
+        Queues `factory` (-> QThread worker) unless (job_class, key) is already
+        queued/running, in which case the callbacks join that job. Returns the Job.
+        """
+        job = self._jobs.get((job_class, key))
+        if job is None:
+            job = Job(job_class, key, factory, priority, next(self._seq))
+            self._jobs[(job_class, key)] = job
+            heapq.heappush(self._pending.setdefault(job_class, []), job)
+            self._total += 1
+        elif job.worker is None and priority < job.priority:
+            self._reprioritize(job, priority)
+        if on_result is not None:
+            job.subscribers.append(on_result)
+        if on_error is not None:
+            job.error_subscribers.append(on_error)
+        self._pump(job_class)
+        self.progress.emit(self._done, self._total)
+        return job
+
+    def set_priority(self, job_class, key, priority):
+        """Raises/lowers a job that has not started yet (e.g. it scrolled into view)."""
+        job = self._jobs.get((job_class, key))
+        if job is not None and job.worker is None and job.priority != priority:
+            self._reprioritize(job, priority)
+
+    def is_active(self, job_class, key):
+        return (job_class, key) in self._jobs
+
+    def pending_count(self, job_class=None):
+        classes = [job_class] if job_class else list(self._pending)
+        return sum(1 for c in classes for j in self._pending.get(c, ()) if not j.cancelled)
+
+    def running_count(self, job_class=None):
+        classes = [job_class] if job_class else list(self._running)
+        return sum(len(self._running.get(c, ())) for c in classes)
+
+    # ------------------------------------------------------------------
+    def cancel(self, job_class, key):
+        job = self._jobs.get((job_class, key))
+        if job is not None:
+            self._cancel_job(job)
+
+    def cancel_all(self, job_class=None):
+        for job in list(self._jobs.values()):
+            if job_class is None or job.job_class == job_class:
+                self._cancel_job(job)
+
+    def shutdown(self, timeout_ms=3000):
+        """Cancels everything and joins the running workers (app exit)."""
+        self.cancel_all()
+        for running in self._running.values():
+            for job in list(running):
+                worker = job.worker
+                try:
+                    if not worker.wait(timeout_ms):
+                        print(f"WARNING: Worker {worker} timed out, forcing termination...", flush=True)
+                        worker.terminate()
+                        worker.wait(500)
+                except Exception as e:
+                    print(f"ERROR: Failed to cleanup worker {worker}: {e}")
+        self._running.clear()
+        self._by_worker.clear()
+
+    # ------------------------------------------------------------------
+    def _reprioritize(self, job, priority):
+        heap = self._pending.get(job.job_class, [])
+        job.priority = priority
+        heapq.heapify(heap)
+
+    def _cancel_job(self, job):
+        job.cancelled = True
+        job.subscribers.clear()
+        job.error_subscribers.clear()
+        self._jobs.pop((job.job_class, job.key), None)
+        if job.worker is None:
+            # Se descarta al sacarlo del heap
+            self._done += 1
+            self._emit_progress()
+            return
+        worker = job.worker
+        if hasattr(worker, "stop"):
+            worker.stop()
+        else:
+            worker.requestInterruption()
+
+    def _pump(self, job_class):
+        heap = self._pending.get(job_class)
+        running = self._running.setdefault(job_class, set())
+        limit = self.limits.get(job_class, 1)
+        if callable(limit):
+            # Límites dinámicos (p.ej. proxies: según el encoder detectado)
+            limit = max(1, limit())
+        while heap and len(running) < limit:
+            job = heapq.heappop(heap)
+            if job.cancelled:
+                continue
+            try:
+                worker = job.factory()
+            except Exception as e:
+                print(f"JobScheduler: could not create {job_class} job for {job.key}: {e}")
+                self._jobs.pop((job_class, job.key), None)
+                self._done += 1
+                continue
+            job.worker = worker
+            job.factory = None
+            running.add(job)
+            self._by_worker[worker] = job
+            worker.finished.connect(self._on_worker_result)
+            if hasattr(worker, "error"):
+                worker.error.connect(self._on_worker_error)
+            # Los workers redefinen `finished` con argumentos: el fin del hilo
+            # se escucha por la firma de QThread (se emite también si run() falla)
+            self.connect(worker, SIGNAL("finished()"), self._on_thread_finished)
+            worker.start()
+
+    def _on_worker_result(self, *args):
+        job = self._by_worker.get(self.sender())
+        if job is None or job.cancelled:
+            return
+        for callback in job.subscribers:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"JobScheduler: {job.job_class} callback failed for {job.key}: {e}")
+
+    def _on_worker_error(self, *args):
+        job = self._by_worker.get(self.sender())
+        if job is None or job.cancelled:
+            return
+        for callback in job.error_subscribers:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"JobScheduler: {job.job_class} error callback failed for {job.key}: {e}")
+
+    def _on_thread_finished(self):
+        worker = self.sender()
+        job = self._by_worker.pop(worker, None)
+        if job is None:
+            return
+        self._running.get(job.job_class, set()).discard(job)
+        if self._jobs.get((job.job_class, job.key)) is job:
+            del self._jobs[(job.job_class, job.key)]
+        self._done += 1
+        job.worker = None
+        worker.deleteLater()
+        self._pump(job.job_class)
+        self._emit_progress()
+
+    def _emit_progress(self):
+        self.progress.emit(self._done, self._total)
+        if not self._jobs:
+            self._done = self._total = 0
+            self.idle.emit()
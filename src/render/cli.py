@@ -0,0 +1,201 @@
+"""
+Render headless (sin Qt ni display).
+
+    python -m src.render project.rocky out.mp4 --width 1920 --height 1080 --fps 30
+    python -m src.render --queue jobs.json --jobs 2
+
+El motor se construye directamente desde TimelineModel.from_dict y el trabajo
+lo hace RenderJob, igual que en la aplicación. El progreso sale por stdout
+como JSON lines (un objeto por línea); todo lo demás (logs de Python y del
+core) se desvía a stderr para no romper ese stream.
+
+Fichero de cola: una lista JSON o un objeto JSON por línea, con las claves
+project, output y opcionalmente width, height, fps, high_quality, segments,
+workers, smart_render.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..infrastructure import project_io
+
+DEFAULT_WIDTH = 1920
+DEFAULT_HEIGHT = 1080
+DEFAULT_FPS = 30.0
+PROGRESS_INTERVAL = 0.5  # s entre eventos de progreso de un mismo trabajo
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_CANCELLED = 130
+
+
+class ProgressEmitter:
+    """Thread-safe JSON-lines writer on the real stdout."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        fields = {"event": event, "time": round(time.time(), 3), **fields}
+        line = json.dumps(fields, ensure_ascii=False)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def _isolate_stdout():
+    """
+    Moves fd 1 to a private descriptor for the JSON stream and points fd 1
+    (print, C++ std::cout, ffmpeg children) at stderr.
+    """
+    sys.stdout.flush()
+    json_fd = os.dup(1)
+    os.dup2(2, 1)
+    sys.stdout = os.fdopen(1, "w", buffering=1, closefd=False)
+    return os.fdopen(json_fd, "w", buffering=1, encoding="utf-8")
+
+
+def load_queue(path):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        specs = json.loads(text)
+    else:
+        specs = [json.loads(line) for line in text.splitlines() if line.strip()]
+    # Rutas relativas: respecto al fichero de cola, no al directorio actual
+    base = os.path.dirname(os.path.abspath(path))
+    for spec in specs:
+        for key in ("project", "output"):
+            if spec.get(key) and not os.path.isabs(spec[key]):
+                spec[key] = os.path.join(base, spec[key])
+    return specs
+
+
+def load_project(path):
+    return project_io.load_model(path)
+
+
+def run_job(job_id, spec, emitter, cancel_event):
+    """Renders one queue entry. Returns 'done', 'failed' or 'cancelled'."""
+    # Import diferido: el parseo de argumentos no necesita el core compilado
+    from ..infrastructure.export.render_job import RenderJob
+
+    output = spec["output"]
+    if cancel_event.is_set():
+        emitter.emit("cancelled", job=job_id, output=output)
+        return "cancelled"
+    try:
+        model = load_project(spec["project"])
+        total_frames = model.get_max_frame()
+        if total_frames <= 0:
+            raise ValueError("El timeline está vacío.")
+
+        missing = sorted({c.file_path for c in model.clips
+                          if c.file_path and not os.path.exists(c.file_path)})
+        emitter.emit("start", job=job_id, project=spec["project"], output=output,
+                     total_frames=total_frames, missing_media=missing)
+
+        started = time.monotonic()
+        last = {"t": 0.0}
+
+        def on_progress(done, total):
+            now = time.monotonic()
+            if now - last["t"] < PROGRESS_INTERVAL and done < total:
+                return
+            last["t"] = now
+            elapsed = max(1e-6, now - started)
+            emitter.emit("progress", job=job_id, frames=int(done), total=int(total),
+                         percent=round(100.0 * done / max(1, total), 1),
+                         fps=round(done / elapsed, 2))
+
+        job = RenderJob(
+            output, total_frames,
+            float(spec.get("fps", DEFAULT_FPS)),
+            int(spec.get("width", DEFAULT_WIDTH)), int(spec.get("height", DEFAULT_HEIGHT)),
+            high_quality=bool(spec.get("high_quality", False)),
+            model=model,
+            workers=spec.get("workers"),
+            on_progress=on_progress,
+            is_cancelled=cancel_event.is_set,
+            smart_render=bool(spec.get("smart_render", True)),
+            segments=int(spec.get("segments", 1))
+        )
+        if not job.run():
+            emitter.emit("cancelled", job=job_id, output=output)
+            return "cancelled"
+
+        emitter.emit("done", job=job_id, output=output,
+                     seconds=round(time.monotonic() - started, 3))
+        return "done"
+    except Exception as e:
+        emitter.emit("error", job=job_id, output=output, message=str(e))
+        return "failed"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.render",
+                                     description="Rocky headless renderer")
+    parser.add_argument("project", nargs="?", help="Project file (.rocky / .json)")
+    parser.add_argument("output", nargs="?", help="Output video file")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT)
+    parser.add_argument("--fps", type=float, default=DEFAULT_FPS)
+    parser.add_argument("--high-quality", action="store_true")
+    parser.add_argument("--segments", type=int, default=1,
+                        help="Parallel segment processes (1 = single encoder)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Render threads per encoder (default: all cores)")
+    parser.add_argument("--no-smart-render", action="store_true",
+                        help="Always re-encode, never stream-copy untouched spans")
+    parser.add_argument("--queue", help="Queue file with one job per entry")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Queue entries rendered at the same time")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.queue:
+        specs = load_queue(args.queue)
+    elif args.project and args.output:
+        specs = [{
+            "project": args.project, "output": args.output,
+            "width": args.width, "height": args.height, "fps": args.fps,
+            "high_quality": args.high_quality, "segments": args.segments,
+            "workers": args.workers, "smart_render": not args.no_smart_render,
+        }]
+    else:
+        parser.error("project and output are required (or --queue)")
+
+    emitter = ProgressEmitter(_isolate_stdout())
+
+    cancel_event = threading.Event()
+
+    def on_signal(signum, frame):
+        cancel_event.set()
+    signal.signal(signal.SIGINT, on_signal)
+    signal.signal(signal.SIGTERM, on_signal)
+
+    emitter.emit("queue", jobs=len(specs), concurrency=max(1, args.jobs))
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = [pool.submit(run_job, n, spec, emitter, cancel_event)
+                   for n, spec in enumerate(specs)]
+        # Esperar con timeout: deja que las señales lleguen al hilo principal
+        while not all(f.done() for f in futures):
+            time.sleep(0.2)
+        results = [f.result() for f in futures]
+
+    summary = {status: results.count(status) for status in ("done", "failed", "cancelled")}
+    emitter.emit("finished", **summary)
+
+    if summary["cancelled"]:
+        return EXIT_CANCELLED
+    return EXIT_FAILED if summary["failed"] else EXIT_OK
@@ -140,6 +140,10 @@ class ExportDialog(QDialog):
         self.cb_hq.setChecked(True)
         layout.addWidget(self.cb_hq)
 
+        self.cb_segmented = QCheckBox("Render por segmentos en paralelo (multiproceso)")
+        self.cb_segmented.setChecked(False)
+        layout.addWidget(self.cb_segmented)
+
         layout.addStretch()
 
         # Action Bar
@@ -175,5 +179,6 @@ class ExportDialog(QDialog):
             "width": w,
             "height": h,
             "codec": self.codec_combo.currentText(),
-            "high_quality": self.cb_hq.isChecked()
+            "high_quality": self.cb_hq.isChecked(),
+            "segmented": self.cb_segmented.isChecked()
         }
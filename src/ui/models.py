@@ -1,7 +1,14 @@
+import operator
+from bisect import bisect_left, bisect_right
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class TrackType(Enum):
     """Enumeration of supported timeline track domains."""
     VIDEO = 1
@@ -31,7 +38,7 @@ class TimeFormat(Enum):
 
 
 
-@dataclass
+@dataclass(slots=True)
 class TimelineMarker:
     """
     A named point in absolute time.
@@ -40,7 +47,7 @@ class TimelineMarker:
     name: str = ""
     color: str = "#FF9900" # Orange default
 
-@dataclass
+@dataclass(slots=True)
 class Transform:
     """Spatial properties for a clip."""
     x: float = 0.0
@@ -74,7 +81,7 @@ class Transform:
             data.get("anchor_y", 0.5)
         )
 
-@dataclass
+@dataclass(slots=True)
 class TimelineRegion:
     """
     A named time range.
@@ -84,23 +91,64 @@ class TimelineRegion:
     name: str = ""
     color: str = "#00AAFF" # Blue default
 
+def _columnar(slot: str, column: str, indexed: bool = False) -> property:
+    """
+    Attribute stored in a slot and mirrored into ClipColumns.<column> when the
+    clip belongs to a model with a columnar store. Reads never touch NumPy.
+    `indexed` fields also move the clip inside the model's ClipIndex.
+    """
+    def fset(self, value):
+        old = getattr(self, slot)
+        setattr(self, slot, value)
+        store = self._columns
+        if store is not None:
+            getattr(store, column)[self._row] = value
+        if indexed and self._index is not None and value != old:
+            self._index.moved(self, slot, old)
+    return property(operator.attrgetter(slot), fset)
+
+
 class TimelineClip:
     """
     Representation of a media segment on the timeline.
     Holds spatial (track), temporal, and aesthetic (opacity/fade) properties.
     """
+    # OPTIMIZACIÓN: __slots__ (sin __dict__ por clip). Con 100k clips ahorra
+    # memoria y acelera el acceso a atributos en painter/hit-test/serializador.
+    __slots__ = (
+        "name", "_start_frame", "_duration_frames", "_track_index", "_source_offset_frames",
+        "proxy_status", "proxy_path", "use_proxy", "media_source_id", "file_path",
+        "start_opacity", "end_opacity", "fade_in_frames", "fade_out_frames",
+        "fade_in_type", "fade_out_type", "opacity_nodes", "opacity_level",
+        "linked_to", "selected", "is_fx_active",
+        "waveform", "waveform_computing", "thumbnails", "thumbnails_computing",
+        "source_duration_frames", "effects", "transform",
+        "source_width", "source_height", "source_rotation", "source_fps",
+        "_columns", "_row", "_index",
+    )
+
+    # Campos temporales con espejo columnar (ver ClipColumns)
+    start_frame = _columnar("_start_frame", "start", indexed=True)
+    duration_frames = _columnar("_duration_frames", "duration", indexed=True)
+    track_index = _columnar("_track_index", "track", indexed=True)
+    source_offset_frames = _columnar("_source_offset_frames", "offset")
+
     def __init__(self, name: str, start_frame: int, duration_frames: int, track_index: int):
+        self._columns = None
+        self._row = -1
+        self._index = None
         self.name = name
-        self.start_frame = start_frame
-        self.duration_frames = duration_frames
-        self.track_index = track_index
+        # Slots directos: todavía no pertenece a ningún almacén/índice
+        self._start_frame = start_frame
+        self._duration_frames = duration_frames
+        self._track_index = track_index
         # Status: 0=None, 1=Generating, 2=Ready, 3=Error
         self.proxy_status = 0 
         self.proxy_path = None
         self.use_proxy = False
         
         # Source Mapping
-        self.source_offset_frames = 0
+        self._source_offset_frames = 0
         self.media_source_id = None
         self.file_path = None
         self.proxy_path = None
@@ -164,10 +212,11 @@ class TimelineClip:
             "fade_out_frames": self.fade_out_frames,
             "fade_in_type": self.fade_in_type.value,
             "fade_out_type": self.fade_out_type.value,
-            "opacity_nodes": self.opacity_nodes,
+            # Copias: el dict es una instantánea que se guarda en otro hilo
+            "opacity_nodes": [list(n) for n in self.opacity_nodes],
             "opacity_level": self.opacity_level,
             "use_proxy": self.use_proxy,
-            "effects": self.effects,
+            "effects": [dict(e) for e in self.effects],
             "transform": self.transform.to_dict(),
             "source_width": self.source_width,
             "source_height": self.source_height,
@@ -245,6 +294,240 @@ class TimelineClip:
     # REMOVED per user request (Step 234)
     pass
 
+
+class ClipColumns:
+    """
+    Columnar (NumPy) mirror of the clips' temporal fields, for vectorized bulk
+    queries (max frame, clips in a range, ripple shifts).
+
+    TimelineClip keeps its own values (attribute reads stay plain slot reads);
+    the setters of start_frame/duration_frames/track_index/source_offset_frames
+    write through to the row of an attached clip. Rows are unordered: removal
+    moves the last row into the hole.
+    """
+    __slots__ = ("start", "duration", "track", "offset", "clips")
+
+    def __init__(self, clips=()):
+        clips = list(clips)
+        capacity = max(64, len(clips) * 2)
+        self.start = np.zeros(capacity, dtype=np.float64)
+        self.duration = np.zeros(capacity, dtype=np.float64)
+        self.track = np.zeros(capacity, dtype=np.int64)
+        self.offset = np.zeros(capacity, dtype=np.float64)
+        self.clips = []  # row -> clip
+        n = len(clips)
+        if n:
+            self.start[:n] = [c._start_frame for c in clips]
+            self.duration[:n] = [c._duration_frames for c in clips]
+            self.track[:n] = [c._track_index for c in clips]
+            self.offset[:n] = [c._source_offset_frames for c in clips]
+            for row, clip in enumerate(clips):
+                clip._columns = self
+                clip._row = row
+            self.clips = clips
+
+    def __len__(self):
+        return len(self.clips)
+
+    def _grow(self):
+        capacity = len(self.start) * 2
+        for column in ("start", "duration", "track", "offset"):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, column, new)
+
+    def attach(self, clip: 'TimelineClip'):
+        row = len(self.clips)
+        if row >= len(self.start):
+            self._grow()
+        self.start[row] = clip._start_frame
+        self.duration[row] = clip._duration_frames
+        self.track[row] = clip._track_index
+        self.offset[row] = clip._source_offset_frames
+        self.clips.append(clip)
+        clip._columns = self
+        clip._row = row
+
+    def detach(self, clip: 'TimelineClip'):
+        if clip._columns is not self:
+            return
+        row, last = clip._row, len(self.clips) - 1
+        if row != last:
+            moved = self.clips[last]
+            self.start[row] = self.start[last]
+            self.duration[row] = self.duration[last]
+            self.track[row] = self.track[last]
+            self.offset[row] = self.offset[last]
+            self.clips[row] = moved
+            moved._row = row
+        self.clips.pop()
+        clip._columns = None
+        clip._row = -1
+
+    def release(self):
+        """Detaches every clip (the store is being discarded)."""
+        for clip in self.clips:
+            clip._columns = None
+            clip._row = -1
+        self.clips = []
+
+    def max_end(self) -> float:
+        n = len(self.clips)
+        if n == 0:
+            return 0.0
+        return float(np.max(self.start[:n] + self.duration[:n]))
+
+    def rows_in_range(self, start_frame: float, end_frame: float, track_index: Optional[int] = None):
+        """Rows of clips overlapping [start_frame, end_frame)."""
+        n = len(self.clips)
+        start = self.start[:n]
+        mask = (start < end_frame) & (start + self.duration[:n] > start_frame)
+        if track_index is not None:
+            mask &= self.track[:n] == track_index
+        return np.flatnonzero(mask)
+
+class _TrackIntervals:
+    """One track of ClipIndex: parallel lists sorted by start and by end frame."""
+    __slots__ = ("starts", "by_start", "ends", "by_end", "max_duration")
+
+    def __init__(self):
+        self.starts, self.by_start = [], []
+        self.ends, self.by_end = [], []
+        # Cota superior de la duración (no baja al quitar clips): acota la
+        # búsqueda hacia atrás en overlapping()
+        self.max_duration = 0
+
+    @staticmethod
+    def _insert(keys, items, key, clip):
+        i = bisect_right(keys, key)
+        keys.insert(i, key)
+        items.insert(i, clip)
+
+    @staticmethod
+    def _remove(keys, items, key, clip):
+        i = bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key:
+            if items[i] is clip:
+                del keys[i]
+                del items[i]
+                return
+            i += 1
+        raise KeyError("clip not in index")
+
+    def add(self, clip, start, duration):
+        self._insert(self.starts, self.by_start, start, clip)
+        self._insert(self.ends, self.by_end, start + duration, clip)
+        if duration > self.max_duration:
+            self.max_duration = duration
+
+    def remove(self, clip, start, duration):
+        self._remove(self.starts, self.by_start, start, clip)
+        self._remove(self.ends, self.by_end, start + duration, clip)
+
+
+class ClipIndex:
+    """
+    Per-track interval index of the timeline clips, ordered by start frame.
+
+    Range queries (painter culling, hit-testing, crossfade detection) and
+    nearest-edge queries (snapping) are O(log n + k) instead of a scan of
+    TimelineModel.clips. add_clip/remove_clip update it, and the
+    start_frame/duration_frames/track_index setters move the clip in place.
+    """
+    __slots__ = ("tracks", "count")
+
+    def __init__(self, clips=()):
+        self.tracks = {}
+        self.count = 0
+        per_track = {}
+        for clip in clips:
+            per_track.setdefault(clip._track_index, []).append(clip)
+        for track, track_clips in per_track.items():
+            t = self.tracks[track] = _TrackIntervals()
+            track_clips.sort(key=operator.attrgetter("_start_frame"))
+            t.by_start = track_clips
+            t.starts = [c._start_frame for c in track_clips]
+            t.by_end = sorted(track_clips, key=lambda c: c._start_frame + c._duration_frames)
+            t.ends = [c._start_frame + c._duration_frames for c in t.by_end]
+            t.max_duration = max(c._duration_frames for c in track_clips)
+            for clip in track_clips:
+                clip._index = self
+            self.count += len(track_clips)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, clip: 'TimelineClip'):
+        track = self.tracks.get(clip._track_index)
+        if track is None:
+            track = self.tracks[clip._track_index] = _TrackIntervals()
+        track.add(clip, clip._start_frame, clip._duration_frames)
+        clip._index = self
+        self.count += 1
+
+    def remove(self, clip: 'TimelineClip'):
+        if clip._index is not self:
+            return
+        self.tracks[clip._track_index].remove(clip, clip._start_frame, clip._duration_frames)
+        clip._index = None
+        self.count -= 1
+
+    def moved(self, clip: 'TimelineClip', slot: str, old_value):
+        """Called by the setters after `slot` changed from old_value."""
+        start, duration, track = clip._start_frame, clip._duration_frames, clip._track_index
+        if slot == "_start_frame":
+            start = old_value
+        elif slot == "_duration_frames":
+            duration = old_value
+        else:
+            track = old_value
+        self.tracks[track].remove(clip, start, duration)
+        new_track = self.tracks.get(clip._track_index)
+        if new_track is None:
+            new_track = self.tracks[clip._track_index] = _TrackIntervals()
+        new_track.add(clip, clip._start_frame, clip._duration_frames)
+
+    def release(self):
+        for track in self.tracks.values():
+            for clip in track.by_start:
+                clip._index = None
+        self.tracks = {}
+        self.count = 0
+
+    def overlapping(self, track_index: int, lo: float, hi: float) -> List['TimelineClip']:
+        """Clips of a track with start <= hi and end >= lo, ordered by start."""
+        track = self.tracks.get(track_index)
+        if track is None:
+            return []
+        first = bisect_left(track.starts, lo - track.max_duration)
+        last = bisect_right(track.starts, hi)
+        return [c for c in track.by_start[first:last]
+                if c._start_frame + c._duration_frames >= lo]
+
+    def nearest_edge(self, frame: float, exclude=None, tracks=None):
+        """
+        Closest clip start/end to `frame` over `tracks` (all by default),
+        ignoring the clip `exclude`. Returns the edge frame or None.
+        """
+        best, best_dist = None, None
+        for track_index in (self.tracks if tracks is None else tracks):
+            track = self.tracks.get(track_index)
+            if track is None:
+                continue
+            for keys, items in ((track.starts, track.by_start), (track.ends, track.by_end)):
+                i = bisect_left(keys, frame)
+                # Vecino a la izquierda y a la derecha, saltando el clip excluido
+                for j, step in ((i - 1, -1), (i, 1)):
+                    while 0 <= j < len(keys) and items[j] is exclude:
+                        j += step
+                    if 0 <= j < len(keys):
+                        dist = abs(keys[j] - frame)
+                        if best_dist is None or dist < best_dist:
+                            best, best_dist = keys[j], dist
+        return best
+
+
 class BlueLine:
     """
     Represents the project-wide master temporal controller (The Playhead).
@@ -272,6 +555,12 @@ class TimelineModel:
         self.blueline = BlueLine()
         self.audio_samples_rendered = 0
         self.layout_revision = 0
+
+        # Almacén columnar opcional (NumPy), construido en la primera consulta masiva
+        self.use_columns = np is not None
+        self._columns: Optional[ClipColumns] = None
+        # Índice de intervalos por pista (se construye en la primera consulta)
+        self._index: Optional[ClipIndex] = None
         
         # Ruler Features
         self.time_format = TimeFormat.TIMECODE
@@ -285,6 +574,8 @@ class TimelineModel:
             self.track_heights.pop(index)
             
             # Remove clips on the deleted track
+            self._drop_columns()
+            self._drop_index()
             self.clips = [c for c in self.clips if c.track_index != index]
             
             # Shift track_index for clips on subsequent tracks
@@ -305,20 +596,129 @@ class TimelineModel:
     def add_clip(self, clip: TimelineClip):
         """Appends a clip and increments state revision."""
         self.clips.append(clip)
+        if self._columns is not None:
+            self._columns.attach(clip)
+        if self._index is not None:
+            self._index.add(clip)
         self.layout_revision += 1
         
+    def add_clips(self, clips):
+        """
+        Appends many clips as one change (bulk import): one revision bump, and
+        the interval index is rebuilt once on next use instead of per clip.
+        """
+        clips = list(clips)
+        if not clips:
+            return
+        self.clips.extend(clips)
+        if self._columns is not None:
+            for clip in clips:
+                self._columns.attach(clip)
+        self._drop_index()
+        self.layout_revision += 1
+
     def remove_clip(self, clip: TimelineClip):
         """Removes a clip and increments state revision."""
         if clip in self.clips:
             self.clips.remove(clip)
+            if self._columns is not None:
+                self._columns.detach(clip)
+            if self._index is not None:
+                self._index.remove(clip)
+            self.layout_revision += 1
+
+    # --- Columnar store -----------------------------------------------------
+
+    @property
+    def columns(self) -> Optional[ClipColumns]:
+        """
+        Columnar mirror of self.clips, or None when disabled / NumPy missing.
+        add_clip/remove_clip keep it in sync; if self.clips was changed
+        directly (different length) it is rebuilt here.
+        """
+        if not self.use_columns:
+            return None
+        if self._columns is None or len(self._columns) != len(self.clips):
+            self._drop_columns()
+            self._columns = ClipColumns(self.clips)
+        return self._columns
+
+    def _drop_columns(self):
+        if self._columns is not None:
+            self._columns.release()
+            self._columns = None
+
+    # --- Interval index -----------------------------------------------------
+
+    @property
+    def index(self) -> ClipIndex:
+        """
+        Per-track interval index of self.clips (see ClipIndex), kept in sync
+        like `columns` and rebuilt if self.clips was changed directly.
+        """
+        if self._index is None or len(self._index) != len(self.clips):
+            self._drop_index()
+            self._index = ClipIndex(self.clips)
+        return self._index
+
+    def _drop_index(self):
+        if self._index is not None:
+            self._index.release()
+            self._index = None
+
+    def clips_on_track(self, track_index: int, start_frame: float, end_frame: float) -> List[TimelineClip]:
+        """Clips of a track touching [start_frame, end_frame] (inclusive), by start frame."""
+        return self.index.overlapping(track_index, start_frame, end_frame)
+
+    def nearest_edge(self, frame: float, exclude: Optional[TimelineClip] = None,
+                     tracks=None) -> Optional[float]:
+        """Closest clip start/end frame to `frame` (for snapping)."""
+        return self.index.nearest_edge(frame, exclude, tracks)
+
+    def clips_in_range(self, start_frame: float, end_frame: float,
+                       track_index: Optional[int] = None) -> List[TimelineClip]:
+        """Clips overlapping [start_frame, end_frame), optionally on one track."""
+        cols = self.columns
+        if cols is not None:
+            return [cols.clips[r] for r in cols.rows_in_range(start_frame, end_frame, track_index)]
+        return [c for c in self.clips
+                if c.start_frame < end_frame and c.start_frame + c.duration_frames > start_frame
+                and (track_index is None or c.track_index == track_index)]
+
+    def ripple_shift(self, from_frame: float, delta: int,
+                     track_index: Optional[int] = None) -> List[TimelineClip]:
+        """
+        Moves every clip starting at or after from_frame by delta frames
+        (ripple insert/delete). Returns the shifted clips.
+        """
+        cols = self.columns
+        if cols is not None:
+            n = len(cols)
+            mask = cols.start[:n] >= from_frame
+            if track_index is not None:
+                mask &= cols.track[:n] == track_index
+            rows = np.flatnonzero(mask)
+            cols.start[rows] += delta
+            shifted = [cols.clips[r] for r in rows]
+            for clip in shifted:
+                clip._start_frame += delta  # la columna ya está actualizada
+            if shifted:
+                self._drop_index()  # escritura directa al slot: se reconstruye
+        else:
+            shifted = [c for c in self.clips if c.start_frame >= from_frame
+                       and (track_index is None or c.track_index == track_index)]
+            for clip in shifted:
+                clip.start_frame += delta
+        if shifted:
             self.layout_revision += 1
+        return shifted
 
     def to_dict(self) -> dict:
         """Serializes the entire project state."""
         return {
             "version": "1.0",
             "track_types": [tt.value for tt in self.track_types],
-            "track_heights": self.track_heights,
+            "track_heights": list(self.track_heights),
             "clips": [clip.to_dict() for clip in self.clips]
         }
 
@@ -339,6 +739,9 @@ class TimelineModel:
 
     def get_max_frame(self) -> int:
         """Calculates the end boundary of the last clip in the project."""
+        cols = self.columns
+        if cols is not None:
+            return int(cols.max_end())
         max_f = 0
         for clip in self.clips:
             end = clip.start_frame + clip.duration_frames
@@ -6,6 +6,8 @@ from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QTextCursor
 import os
 
+from ..infrastructure import tracing
+
 class ConsoleEditor(QPlainTextEdit):
     """Subclass to handle terminal-specific keyboard events."""
     execute_requested = Signal(str)
@@ -66,12 +68,13 @@ class PythonTerminalPanel(QWidget):
         
         layout.addWidget(self.editor)
         
-        self.intro_text = "Rocky Video Editor - Python Terminal\nType commands below. 'app' and 'model' are available.\n"
+        self.intro_text = ("Rocky Video Editor - Python Terminal\nType commands below. 'app' and 'model' are available.\n"
+                           "trace(seconds=5) records a Chrome/Perfetto performance trace.\n")
         self.editor.setPlainText(self.intro_text + ">>> ")
         self.move_cursor_to_end()
         self.editor.setFocus()
         
-        self.locals = {}
+        self.locals = {"trace": self.trace}
         
     def move_cursor_to_end(self):
         self.editor.moveCursor(QTextCursor.End)
@@ -125,5 +128,16 @@ class PythonTerminalPanel(QWidget):
         self.editor.appendPlainText(">>> ")
         self.move_cursor_to_end()
 
+    @staticmethod
+    def trace(seconds=5, path=None):
+        """Records `seconds` of engine + worker spans; returns the JSON path."""
+        try:
+            path = tracing.record_for(seconds, path)
+        except RuntimeError as e:
+            print(e)
+            return None
+        print(f"Grabando traza durante {seconds} s -> {path}")
+        return path
+
     def update_context(self, selection):
         self.locals['selection'] = selection
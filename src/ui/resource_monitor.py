@@ -1,5 +1,5 @@
 import os
-import random
+import time
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel
 from PySide6.QtCore import Qt, QTimer, QSize
 from PySide6.QtGui import QFont, QPixmap, QColor, QLinearGradient, QMovie
@@ -7,6 +7,22 @@ try:
     import psutil
 except ImportError:
     psutil = None
+try:
+    import rocky_core
+except ImportError:
+    rocky_core = None
+
+# (clave en rocky_core.get_stats()["stages"], etiqueta)
+ENGINE_STAGES = [
+    ("decode", "DECODE"),
+    ("scale", "SCALE"),
+    ("transform", "TRANSFORM"),
+    ("effect", "EFFECT"),
+    ("blend", "BLEND"),
+    ("audio_decode", "AUDIO_DEC"),
+    ("mix", "MIX"),
+]
+STATS_INTERVAL = 0.5  # s entre muestras de rocky_core.get_stats()
 
 class ResourceMonitorPanel(QWidget):
     """
@@ -63,19 +79,16 @@ class ResourceMonitorPanel(QWidget):
         text_layout.setContentsMargins(0, 0, 0, 0)
         text_layout.setSpacing(4) # Reduced from 8
         
+        # Línea de estado + bloque de etapas del motor (ms por frame, en vivo)
         self.tech_labels = []
-        tech_lines = [
-            "KERNEL_HOST: ROCKY_X86_64",
-            "STATUS: OPTIMIZED",
-            "CPU_THREAD_POOL: 9_THREADS",
-            "IO_STREAM: ASYNC_ACTIVE",
-            "MEM_PROTECT: ENABLED"
-        ]
-        for line in tech_lines:
+        for line in ("ENGINE: IDLE", self._format_stages(None)):
             lbl = QLabel(line)
             lbl.setStyleSheet("color: #49d4e5; font-family: 'Courier New'; font-size: 11px; font-weight: bold; border: none; background: transparent;")
             text_layout.addWidget(lbl)
             self.tech_labels.append(lbl)
+        self.status_label, self.stages_label = self.tech_labels
+        self._last_stats = None
+        self._last_stats_time = 0.0
         
         text_layout.addStretch()
         content_layout.addWidget(text_widget, 2)
@@ -137,14 +150,57 @@ class ResourceMonitorPanel(QWidget):
             cpu_val = psutil.cpu_percent()
             ram_val = psutil.virtual_memory().percent
         else:
-            self.tech_labels[1].setText("STATUS: PSUTIL_NOT_FOUND")
+            self.status_label.setText("STATUS: PSUTIL_NOT_FOUND")
 
         self._set_bar_level(self.cpu_bar, cpu_val)
         self._set_bar_level(self.ram_bar, ram_val)
         
-        # 3. Dynamic Technical Mood Updates
-        if random.random() > 0.95:
-             self.tech_labels[0].setText(f"KERNEL_HOST: NODE_{random.randint(10, 99)}")
+        # 3. Engine per-stage telemetry (más lento que las barras: legible)
+        now = time.monotonic()
+        if now - self._last_stats_time >= STATS_INTERVAL:
+            self._last_stats_time = now
+            self._update_engine_stats()
+
+    def _update_engine_stats(self):
+        # El .pyd precompilado puede no tener instrumentación
+        if rocky_core is None or not hasattr(rocky_core, "get_stats"):
+            self.status_label.setText("ENGINE: STATS_UNAVAILABLE")
+            return
+
+        stats = rocky_core.get_stats()
+        prev, self._last_stats = self._last_stats, stats
+        if prev is None:
+            return
+
+        frames = stats["frames"] - prev["frames"]
+        dt = max(1e-6, stats["elapsed_s"] - prev["elapsed_s"])
+        if frames <= 0:
+            self.status_label.setText(f"ENGINE: IDLE  DEC {stats['open_decoders']}")
+            self.stages_label.setText(self._format_stages(None))
+            return
+
+        per_frame = {}
+        for key, _ in ENGINE_STAGES:
+            delta_ms = stats["stages"][key]["ms"] - prev["stages"][key]["ms"]
+            per_frame[key] = delta_ms / frames
+        hits = ((stats["frame_cache_hits"] - prev["frame_cache_hits"]) +
+                (stats["render_cache_hits"] - prev["render_cache_hits"]))
+        seeks = stats["seeks"] - prev["seeks"]
+        # Paquetes que un seek intra-only no llegó a decodificar (.pyd nuevo)
+        skipped = stats.get("packets_skipped", 0) - prev.get("packets_skipped", 0)
+
+        self.status_label.setText(
+            f"ENGINE: {frames / dt:5.1f} FPS  SEEK {seeks}  SKIP {skipped}  HIT {hits}  DEC {stats['open_decoders']}")
+        self.stages_label.setText(self._format_stages(per_frame))
+
+    @staticmethod
+    def _format_stages(per_frame):
+        """Per-stage ms/frame block. Times are summed over threads (CPU work)."""
+        lines = []
+        for key, label in ENGINE_STAGES:
+            value = f"{per_frame[key]:6.2f}" if per_frame else "    --"
+            lines.append(f"{label:<10}{value} ms/f")
+        return "\n".join(lines)
 
     def _set_bar_level(self, bar_container, percent):
         max_h = 120
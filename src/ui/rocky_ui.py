@@ -1,32 +1,11 @@
 import sys
 import os
-import random
 import time
 
 # Ensure we can load DLLs for version 3.8+ on Windows AND find FFmpeg in PATH
 if os.name == 'nt':
-    try:
-        if getattr(sys, 'frozen', False):
-            # PyInstaller mode: Root is _MEIPASS
-            project_root = sys._MEIPASS
-        else:
-            # Dev mode: Root is two levels up from this file relative to src/ui/rocky_ui.py
-            project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-
-        ffmpeg_bin = os.path.join(project_root, "external", "ffmpeg", "bin")
-        
-        if os.path.isdir(ffmpeg_bin):
-            # 1. Allow Python to load DLLs (for rocky_core extension)
-            if hasattr(os, 'add_dll_directory'):
-                os.add_dll_directory(ffmpeg_bin)
-                print(f"Added DLL directory: {ffmpeg_bin}", flush=True)
-            
-            # 2. Allow subprocess calls (like ffmpeg -version) to find the binary
-            os.environ["PATH"] = ffmpeg_bin + os.pathsep + os.environ["PATH"]
-            print(f"Added FFmpeg to PATH: {ffmpeg_bin}", flush=True)
-            
-    except Exception as e:
-        print(f"Failed to setup FFmpeg paths: {e}", flush=True)
+    from ..infrastructure.native_paths import register_dll_directories
+    register_dll_directories()
 
 import rocky_core
 
@@ -34,7 +13,6 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
                              QApplication, QScrollArea, QFrame, QMainWindow, QLabel, QFileDialog, QProgressDialog, QMessageBox)
 from PySide6.QtGui import QImage, QPixmap, QIcon, QPainter, QPainterPath, QPen, QColor
 import subprocess
-import json
 from PySide6.QtCore import Qt, QTimer, QIODevice, QByteArray, QMutex, QMutexLocker, QRectF, QThread, Signal
 from PySide6.QtMultimedia import QAudioFormat, QAudioOutput, QAudioSource, QAudioSink
 import numpy as np
@@ -44,7 +22,7 @@ from .models import TimelineModel, TrackType
 from .sidebar import SidebarPanel
 from .ruler import TimelineRuler
 from .master_meter import MasterMeterPanel
-from .viewer import ViewerPanel
+from .viewer import ViewerPanel, SharedFrame
 from .toolbar import RockyToolbar
 from .settings_dialog import SettingsDialog
 from .styles import MODERN_LABEL
@@ -53,10 +31,25 @@ from .editor_panel import EditorPanel
 from . import design_tokens as dt
 from .panels import RockyPanel # New Panel System
  
-from ..infrastructure.workers.import_worker import MediaImportWorker 
+from ..infrastructure.workers.import_worker import MediaImportWorker, BatchImportWorker
 from ..infrastructure.workers.waveform import WaveformWorker
 from ..infrastructure.workers.thumbnail import ThumbnailWorker 
 from ..infrastructure.workers.proxy_gen import ProxyWorker 
+from ..infrastructure.workers.prerender_worker import PrerenderWorker
+from ..infrastructure.workers.playback import AudioWorker, VideoWorker, playback_clock_frame
+from ..infrastructure.export.engine_factory import create_media_source, populate_engine
+from ..infrastructure.export.render_job import RenderJob
+from ..infrastructure.export.segment_export import default_segment_count
+from ..infrastructure.export.prerender import PrerenderCache
+from ..infrastructure import tracing
+from ..infrastructure import project_io
+from ..infrastructure import filmstrip
+from ..infrastructure import preferences
+from ..infrastructure import proxy_cache
+from ..infrastructure.quality_governor import QualityGovernor, level_for_label
+from ..infrastructure.workers.project_save import ProjectSaveWorker
+from ..infrastructure.workers.scheduler import (JobScheduler, JobClass, PRIORITY_VISIBLE,
+                                                PRIORITY_NORMAL, PRIORITY_BACKGROUND)
 from .welcome_screen import WelcomeScreen
 
 # ... (previous imports)
@@ -137,154 +130,14 @@ class AudioPlayer(QIODevice):
         """Returns the hardware audio clock time in microseconds."""
         return self.sink.processedUSecs()
 
-class AudioWorker(QThread):
-    def __init__(self, engine, player, model):
-        super().__init__()
-        self.engine = engine
-        self.player = player
-        self.model = model
-        self.running = False
-        self.last_audio_render_time = -1.0
-        self.fps = 30.0
-
-    def _resample_stereo(self, data, target_len):
-        if data is None or data.size == 0 or target_len <= 0:
-            return data
-            
-        import rocky_core
-        # Direct C++ call: No-copy where possible and multithreaded-safe
-        return rocky_core.RockyEngine.resample_audio(data, target_len)
-
-    def run(self):
-        self.running = True
-        while self.running and not self.isInterruptionRequested():
-            if not self.model.blueline.playing:
-                self.msleep(50)
-                continue
-
-            current_buffer_ms = self.player.get_buffer_duration_ms()
-            
-            # Use shared playback rate
-            rate = getattr(self.model.blueline, 'playback_rate', 1.0)
-            
-            # Reducimos drásticamente el buffer para reaccionar rápido (Objetivo: 300ms)
-            if current_buffer_ms < 150:
-                missing_ms = 300 - current_buffer_ms
-                missing_duration = missing_ms / 1000.0 # Physical time to fill
-                
-                try:
-                    if not hasattr(self.model, 'audio_samples_rendered'):
-                        self.model.audio_samples_rendered = 0
-                        
-                    render_start_time = self.model.audio_samples_rendered / 44100.0
-                    
-                    # SCALE timeline duration by rate
-                    # If we need 0.5s of real audio but playing at 2x, we need 1.0s of content
-                    content_duration = missing_duration * rate
-                    
-                    if content_duration > 0:
-                        # CRITICAL FIX: We do NOT use the Python locker here.
-                        # The C++ RockyEngine HAS its own internal std::mutex for render_audio.
-                        # Using the Python engine_lock here causes deadlocks with the GIL 
-                        # because render_audio releases the GIL internally.
-                        audio_content = self.engine.render_audio(render_start_time, content_duration)
-                        
-                        if audio_content is not None and audio_content.size > 0:
-                            # Resample timeline content to fit physical time
-                            target_sample_count = int(missing_duration * 44100)
-                            
-                            if rate != 1.0:
-                                audio_final = self._resample_stereo(audio_content, target_sample_count)
-                            else:
-                                audio_final = audio_content
-                            
-                            self.player.write_samples(audio_final)
-                            # Update tracking based on TIMELINE time consumed
-                            self.model.audio_samples_rendered += int(content_duration * 44100)
-                    else:
-                        # If rate is 0, we just wait
-                        pass
-                        
-                except Exception as e:
-                    print(f"AudioWorker Error: {e}")
-            
-            self.msleep(20)
-        
-
-    def start_playback(self, start_time, fps, rate=1.0):
-        self.fps = fps
-        self.player.clear_buffer()
-        # Convertimos el tiempo inicial a muestras exactas
-        self.model.audio_samples_rendered = int(start_time * 44100)
-        
-        # Pre-buffer inicial muy potente (1.2s) para garantizar arranque suave
-        initial = self.engine.render_audio(start_time, 1.2)
-        self.player.write_samples(initial)
-
-        self.model.audio_samples_rendered += (initial.size // 2)
-        
-        self.player.sink.resume()
-
-    def stop_playback(self):
-        self.player.sink.suspend()
-
-class VideoWorker(QThread):
-    """
-    Handles video frame evaluation in a background thread to prevent UI stutter.
-    Communicates with the UI thread via signals.
-    """
-    frame_ready = Signal(object)
-
-    def __init__(self, engine, engine_lock):
-        super().__init__()
-        self.engine = engine
-        self.engine_lock = engine_lock
-        self.running = False
-        self._target_timestamp = -1.0
-        self._mutex = QMutex()
-        self._has_new_request = False
-
-    def request_frame(self, timestamp):
-        """Asynchronously requests a frame for the given timestamp."""
-        locker = QMutexLocker(self._mutex)
-        self._target_timestamp = timestamp
-        self._has_new_request = True
-
-    def run(self):
-        self.running = True
-        last_processed = -1.0
-        
-        while self.running and not self.isInterruptionRequested():
-            timestamp = -1.0
-            locker = QMutexLocker(self._mutex)
-            if self._has_new_request:
-                timestamp = self._target_timestamp
-                self._has_new_request = False
-            del locker
-
-            if timestamp != -1.0 and timestamp != last_processed:
-                try:
-                    # HEAVY OPERATION: Evaluate project state at this timestamp
-                    # This involves FFmpeg decoding and C++ compositing.
-                    locker = QMutexLocker(self.engine_lock)
-                    frame = self.engine.evaluate(timestamp)
-                    del locker
-                    
-                    self.frame_ready.emit(frame)
-                    last_processed = timestamp
-                except Exception as e:
-                    print(f"VideoWorker Error: {e}")
-            
-            # Tiny sleep to prevent 100% CPU usage in the polling loop
-            # and allow the GIL to be shared.
-            self.msleep(2)
-
 class RenderWorker(QThread):
+    """Qt adapter over RenderJob: progress -> Signal, cancel -> requestInterruption()."""
     progress = Signal(int)
     finished = Signal(str)
     error = Signal(str)
 
-    def __init__(self, engine, engine_lock, output_path, total_frames, fps, width, height, high_quality=False):
+    def __init__(self, engine, engine_lock, output_path, total_frames, fps, width, height, high_quality=False,
+                 model=None, master_gain=1.0, workers=None, segments=1):
         super().__init__()
         self.engine = engine
         self.engine_lock = engine_lock
@@ -294,165 +147,43 @@ class RenderWorker(QThread):
         self.width = width
         self.height = height
         self.high_quality = high_quality
+        # Snapshot (TimelineModel) del proyecto: permite crear un motor por hilo.
+        # Sin él se renderiza secuencialmente con el motor compartido.
+        self.model = model
+        self.master_gain = master_gain
+        self.workers = workers
+        # >1: exportación por segmentos en procesos independientes
+        self.segments = segments
 
-    def run(self):
-        # 0. Robust FFmpeg Detection
-        from ..infrastructure.ffmpeg_utils import FFmpegUtils
-        ffmpeg_exe = FFmpegUtils.get_ffmpeg_path()
+    def _on_job_progress(self, done, total):
+        self.progress.emit(int((done / max(1, total)) * 100))
 
-        audio_temp_path = self.output_path + ".audio.tmp"
-        
+    def run(self):
+        job = RenderJob(
+            self.output_path, self.total_frames, self.fps, self.width, self.height,
+            high_quality=self.high_quality, model=self.model, master_gain=self.master_gain,
+            workers=self.workers, engine=self.engine,
+            engine_guard=lambda: QMutexLocker(self.engine_lock),
+            on_progress=self._on_job_progress, is_cancelled=self.isInterruptionRequested,
+            segments=self.segments
+        )
         try:
-            # 1. Ensure dimensions are aligned to 32 (Ultra-Safe HW Alignment)
-            # Some media engines (AMD/Intel) prefer 32 or 64 alignment for strides.
-            # 32 is a safe bet for 99% of hardware.
-            self.width = (self.width // 32) * 32
-            self.height = (self.height // 32) * 32
-            
-            # Prevent 0 dimensions
-            if self.width <= 0: self.width = 1280
-            if self.height <= 0: self.height = 720
-
-            # Sync engine resolution for RENDER
-            locker = QMutexLocker(self.engine_lock)
-            self.engine.set_resolution(self.width, self.height)
-            if locker: del locker
-            
-            # 2. Render Audio (Rápido)
-            duration = self.total_frames / self.fps
-            audio_samples = self.engine.render_audio(0, duration)
-            with open(audio_temp_path, 'wb') as f:
-                f.write(audio_samples.tobytes())
-                
-            # 3. Configurar FFmpeg
-            # Hardware Acceleration Logic
-            enc_config = FFmpegUtils.get_export_config(self.high_quality)
-            
-            # Explicitly force pixel format conversion via filter to prevent HW encoder 
-            # from receiving raw RGBA if it expects NV12/YUV.
-            # We map input (rgba) -> Filter (format=pix_fmt) -> Encoder
-            
-            command = [
-                ffmpeg_exe, '-y',
-                '-f', 'rawvideo',
-                '-vcodec', 'rawvideo',
-                '-s', f'{self.width}x{self.height}',
-                '-pix_fmt', 'rgba', # Input from Engine is ALWAYS RGBA
-                '-r', str(self.fps),
-                '-i', '-', # Stdin 0
-                '-f', 'f32le',
-                '-ar', '44100',
-                '-ac', '2',
-                '-i', audio_temp_path, # Input 1
-                '-vf', f'format={enc_config.pix_fmt}', # Force SW conversion before encoder
-                '-c:v', enc_config.codec
-            ]
-            
-            # Add Preset/Quality flags
-            command.extend(enc_config.preset_flag)
-            command.extend(enc_config.quality_flag)
-            
-            # Add Extra flags
-            command.extend(enc_config.extra_flags)
-            
-            # Common flags
-            command.extend([
-                '-pix_fmt', enc_config.pix_fmt,
-                '-c:a', 'aac',
-                '-b:a', '192k',
-                self.output_path
-            ])
-            
-            # Windows-specific: Hide console window
-            startupinfo = None
-            if sys.platform == "win32":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = 0 # SW_HIDE
-
-            # IMPORTANT: We avoid stderr=subprocess.PIPE to prevent deadlocks on Windows
-            # when the pipe buffer fills up. Instead, we'll redirect to a log file if needed,
-            # or just let it go to the parent console. For now, we'll use a temporary file
-            # to capture errors without blocking.
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix=".log", delete=False) as err_log:
-                err_log_path = err_log.name
-
-            with open(err_log_path, 'wb') as err_f:
-                process = subprocess.Popen(
-                    command, 
-                    stdin=subprocess.PIPE, 
-                    stdout=subprocess.DEVNULL, # We don't need stdout 
-                    stderr=err_f,
-                    startupinfo=startupinfo
-                )
-            
-                # 4. Renderizar Video Frame a Frame
-                for i in range(self.total_frames):
-                    if self.isInterruptionRequested():
-                        process.terminate()
-                        break
-                        
-                    timestamp = i / self.fps
-                    frame_data = self.engine.evaluate(timestamp)
-                    
-                    try:
-                        raw_bytes = frame_data.tobytes()
-                        # DEBUG: Verify exact byte alignment
-                        if i == 0:
-                            expected_bytes = self.width * self.height * 4
-                            actual_bytes = len(raw_bytes)
-                            if expected_bytes != actual_bytes:
-                                print("CRITICAL ERROR: Buffer Size Mismatch! This causes render artifacts/glitches.", flush=True)
-
-                        process.stdin.write(raw_bytes)
-                        
-                        # CRITICAL: Flush immediately after the first frame to ensure 
-                        # FFmpeg locks onto the stream start without buffer shift.
-                        if i == 0:
-                            process.stdin.flush()
-                            
-                        # Periodic flush to avoid large memory buildup 
-                        if i % 30 == 0:
-                            process.stdin.flush()
-                    except BrokenPipeError:
-                        break
-                        
-                    if i % 5 == 0:
-                        self.progress.emit(int((i / self.total_frames) * 100))
-                        
-                process.stdin.close()
-                process.wait()
-            
-            # Check for errors
-            if process.returncode != 0:
-                with open(err_log_path, 'r', errors='replace') as f:
-                    err_out = f.read()
-                self.error.emit(f"Fallo en FFmpeg (Code {process.returncode}):\n{err_out}")
-            else:
+            if job.run():
                 self.finished.emit(self.output_path)
-
-            # Cleanup
-            if os.path.exists(audio_temp_path):
-                os.remove(audio_temp_path)
-            if os.path.exists(err_log_path):
-                os.remove(err_log_path)
-
-                
         except Exception as e:
             print(f"RenderWorker Exception: {e}")
             self.error.emit(str(e))
-        finally:
-            # Note: We don't restore resolution here because the UI might have changed.
-            # The next time the user interacts with the UI or changes resolution, 
-            # it will be resynced. Or we could pass the original resolution to the worker.
-            pass
+        # Note: We don't restore resolution here because the UI might have changed.
+        # The next time the user interacts with the UI or changes resolution,
+        # it will be resynced.
 
 class RockyApp(QMainWindow):
     """
     Main application window for the Rocky Video Editor.
     Integrates the Python-based UI with the C++ high-performance rendering engine.
     """
+    # tracing.record_for termina en un hilo timer: el resultado vuelve al hilo UI por señal
+    trace_saved = Signal(object)
 
     @staticmethod
     @staticmethod
@@ -531,10 +262,22 @@ class RockyApp(QMainWindow):
         self.project_path = None
         self.media_source_cache = {} # Cache to avoid re-opening heavy 4K files
         self.fx_dialogs = {} # Track open FX windows {clip_id: dialog}
-        self._active_workers = [] # Unified tracking for all background threads
+        self._active_workers = [] # Threads fuera del scheduler (guardado)
+        # Import/waveform/filmstrip/proxy/pre-render: cola con límites por clase
+        # (los proxies escalan según el encoder hardware detectado)
+        self.jobs = JobScheduler(limits={JobClass.PROXY: proxy_cache.concurrency}, parent=self)
+        self.jobs.progress.connect(self._on_jobs_progress)
         self.viewer_registry = [] # Track all active viewer panels for frame broadcasting
         self.timeline_registry = [] # Track all active timeline widgets for playhead sync
         self.master_meter_registry = [] # Track all active master meter panels for gain sync
+        self.prerender_cache = PrerenderCache() # Rangos pre-renderizados (mezzanine intra)
+        self._save_worker = None # Guardado/autoguardado en curso (uno a la vez)
+        # Calidad adaptativa de reproducción (resolución de preview + proxies)
+        self.quality_governor = QualityGovernor()
+        self._preview_scale = 1.0
+        self._preview_proxies_on = False
+        self._load_preview_preferences()
+        self._last_saved_snapshot = None
         
         # PROJECT DIMENSIONS (Persistent State)
         self.p_width = 1920
@@ -607,6 +350,7 @@ class RockyApp(QMainWindow):
             # VIDEO WORKER: Async rendering to maintain 60fps UI
             self.video_worker = VideoWorker(self.engine, self.engine_lock)
             self.video_worker.frame_ready.connect(self._broadcast_frame)
+            self.video_worker.frame_timing.connect(self._on_frame_timing)
             
             self.audio_player.app_engine_lock = self.engine_lock # Share the lock
             return True
@@ -653,6 +397,8 @@ class RockyApp(QMainWindow):
             except: pass
         
         # 2. Stop ALL active background workers (Waveform, Thumbnails, Proxies, Import)
+        if hasattr(self, "jobs"):
+            self.jobs.shutdown()
         if hasattr(self, "_active_workers"):
             for worker in self._active_workers[:]: # Use slice to avoid modification issues
                 try:
@@ -828,7 +574,11 @@ class RockyApp(QMainWindow):
         self.toolbar.action_open.triggered.connect(self.on_open)
         self.toolbar.action_save.triggered.connect(self.on_save)
         self.toolbar.action_save_as.triggered.connect(self.on_save_as)
+        self.toolbar.action_export_json.triggered.connect(self.on_export_json)
         self.toolbar.action_render.triggered.connect(self.on_render)
+        self.toolbar.action_prerender.triggered.connect(self.on_prerender_selection)
+        self.toolbar.action_trace.triggered.connect(self.on_record_trace)
+        self.trace_saved.connect(self._finish_trace)
         self.toolbar.action_preferences.triggered.connect(self.on_settings)
         self.toolbar.action_welcome.triggered.connect(self.on_show_welcome)
         self.toolbar.btn_proxy.clicked.connect(self.on_proxy_toggle)
@@ -842,6 +592,14 @@ class RockyApp(QMainWindow):
         self.playback_timer = QTimer(self)
         self.playback_timer.timeout.connect(self.on_playback_tick)
         self.playback_timer.start(16) 
+
+        # Autoguardado en segundo plano (instantánea del modelo + escritura atómica)
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.timeout.connect(self.on_autosave)
+        self.autosave_timer.start(self.AUTOSAVE_INTERVAL_MS)
+
+        # Proxies que quedaron a medias en la sesión anterior
+        QTimer.singleShot(3000, self._resume_proxy_queue)
         
         # 3. Audio & Master Synchronization
         self.audio_player.level_updated.connect(self.on_audio_levels_received)
@@ -1034,22 +792,25 @@ class RockyApp(QMainWindow):
         Handles media file importation via the professional File Dialog.
         """
         file_filter = (
-            "Rocky Project (*.rocky);;"
+            "Rocky Project (*.rocky *.json);;"
             "All Media (*.mp4 *.mov *.mkv *.avi *.png *.jpg *.jpeg *.bmp *.webp *.mp3 *.wav *.aac *.m4a *.flac);;"
             "Video Files (*.mp4 *.mov *.mkv *.avi);;"
             "Audio Files (*.mp3 *.wav *.aac *.m4a *.flac);;"
             "Image Files (*.png *.jpg *.jpeg *.bmp *.webp);;"
             "All Files (*)"
         )
-        file_path, _ = QFileDialog.getOpenFileName(self, "Abrir Proyecto o Media", "", file_filter)
-        
-        if file_path:
-            if file_path.lower().endswith('.rocky'):
-                self.load_project(file_path)
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Abrir Proyecto o Media", "", file_filter)
+        
+        if file_paths:
+            projects = [p for p in file_paths if p.lower().endswith(('.rocky', '.json'))]
+            if projects:
+                self.load_project(projects[0])
+                return
+            start_frame = self.model.blueline.playhead_frame
+            if len(file_paths) == 1:
+                self.import_media(file_paths[0], start_frame)
             else:
-                start_frame = self.model.blueline.playhead_frame
-                self.import_media(file_path, start_frame)
-                self.status_label.setText(f"Importado: {os.path.basename(file_path)}")
+                self.import_media_batch(file_paths, start_frame)
 
     def import_media(self, file_path, start_frame, preferred_track_idx=-1):
         """
@@ -1057,18 +818,95 @@ class RockyApp(QMainWindow):
         """
         self.status_label.setText(f"Probing media: {os.path.basename(file_path)}...")
         
-        worker = MediaImportWorker(file_path, self.get_fps())
-        
+        fps = self.get_fps()
         # We need to pass the state (start_frame, preferred_track_idx) to the finish method
-        # We can use a lambda or partial to "bind" these values
         # Worker emits: path, duration, source, width, height, rotation, fps
-        worker.finished.connect(lambda path, dur, src, w, h, r, f: self._finish_import_logic(path, dur, src, w, h, r, f, start_frame, preferred_track_idx))
-        worker.error.connect(self._on_import_error)
-        
-        self._active_workers.append(worker)
-        # Use built-in finished for deletion safety
-        worker.finished.connect(lambda: self._safe_remove_worker(worker))
-        worker.start()
+        # (the same file imported twice shares one probe; each import places its own clip)
+        self.jobs.submit(
+            JobClass.IMPORT, file_path, lambda: MediaImportWorker(file_path, fps),
+            on_result=lambda path, dur, src, w, h, r, f: self._finish_import_logic(path, dur, src, w, h, r, f, start_frame, preferred_track_idx),
+            on_error=self._on_import_error,
+            priority=PRIORITY_VISIBLE)
+
+    def import_media_batch(self, file_paths, start_frame, preferred_track_idx=-1):
+        """
+        Bulk import (card dumps, multi-file drops): all files are probed in
+        parallel by one background job, then placed back to back in a single
+        model transaction followed by a single engine sync.
+        """
+        file_paths = [p for p in file_paths if p]
+        if len(file_paths) <= 1:
+            for path in file_paths:
+                self.import_media(path, start_frame, preferred_track_idx)
+            return
+
+        fps = self.get_fps()
+        known_sources = set(self.media_source_cache)
+
+        def make_worker():
+            worker = BatchImportWorker(file_paths, fps, known_sources)
+            worker.progress.connect(
+                lambda done, total: self.status_label.setText(f"Importando medios: {done}/{total}"))
+            return worker
+
+        self.status_label.setText(f"Importando {len(file_paths)} archivos...")
+        self.jobs.submit(
+            JobClass.IMPORT, tuple(file_paths), make_worker,
+            on_result=lambda results: self._finish_batch_import(results, start_frame, preferred_track_idx),
+            priority=PRIORITY_VISIBLE)
+
+    def _finish_batch_import(self, results, start_frame, preferred_track_idx):
+        """Places every probed file of a bulk import in one go (see import_media_batch)."""
+        from .models import TrackType
+
+        ok = [r for r in results if r and "error" not in r]
+        failed = [r for r in results if r and "error" in r]
+        for r in ok:
+            # Decoders abiertos por el worker: la sincronización del motor los reutiliza
+            if r["source"] is not None:
+                self.media_source_cache.setdefault(r["path"], r["source"])
+        if not ok:
+            self.status_label.setText("No se pudo importar ningún archivo")
+            return
+
+        kinds = [self._media_kind(r["path"]) for r in ok]
+        was_empty = (len(self.model.clips) == 0)
+        is_forced_vertical = False
+        first_visual = next((r for r, k in zip(ok, kinds)
+                             if k != "audio" and r["width"] > 0 and r["height"] > 0), None)
+        if was_empty and first_visual is not None:
+            is_forced_vertical = self._ask_project_resolution(
+                first_visual["width"], first_visual["height"], first_visual["rotation"], was_empty)
+
+        # Una pista de vídeo y una de audio para todo el lote (no dos por archivo)
+        v_track = a_track = -1
+        if any(k != "audio" for k in kinds):
+            v_track = self._import_track(TrackType.VIDEO, preferred_track_idx)
+        if any(k != "image" for k in kinds):
+            a_track = self._import_track(TrackType.AUDIO, preferred_track_idx)
+
+        clips = []
+        frame = start_frame
+        for r in ok:
+            forced = is_forced_vertical and r["width"] > r["height"]
+            new_clips = self._make_import_clips(r["path"], r["duration"], r["width"], r["height"],
+                                                r["rotation"], frame, v_track, a_track, forced)
+            clips.extend(new_clips)
+            frame += max(1, int(new_clips[0].duration_frames))
+
+        self.model.add_clips(clips)
+        self.on_structure_changed()
+        for clip in clips:
+            self._start_clip_analysis(clip)
+
+        self.timeline_widget.update()
+        QTimer.singleShot(100, lambda: self.timeline_widget.zoom_to_fit(animate=True))
+        self.status_label.setText(f"Importados {len(ok)} archivos")
+        if failed:
+            names = "\n".join(f"{os.path.basename(r['path'])}: {r['error']}" for r in failed[:10])
+            more = f"\n... y {len(failed) - 10} más" if len(failed) > 10 else ""
+            QMessageBox.warning(self, "Error de Importación",
+                                f"No se pudieron cargar {len(failed)} archivos:\n{names}{more}")
 
     def _on_import_error(self, path, message):
         self.status_label.setText(f"Error importando {os.path.basename(path)}")
@@ -1079,17 +917,9 @@ class RockyApp(QMainWindow):
         Completes the import process once metadata is available from the background thread.
         ULTRA-FAST: Avoids blocking calls on the UI thread.
         """
-        # Cleanup import worker (the sender)
-        sender = self.sender()
-        if hasattr(self, "_active_workers") and sender in self._active_workers:
-            self._active_workers.remove(sender)
-            sender.deleteLater()
-            
-        from .models import TimelineClip, TrackType
+        from .models import TrackType
         
-        is_forced_vertical = False
         file_name = os.path.basename(file_path)
-        ext = file_name.lower().split('.')[-1]
         
         # PERFORMANCE OPTIMIZATION: Do NOT instantiate C++ sources on the UI thread if possible.
         # We start by checking if it's already cached.
@@ -1099,99 +929,171 @@ class RockyApp(QMainWindow):
         was_empty = (len(self.model.clips) == 0)
         
         # SMART PROVISIONING: Ask to match resolution on first import
+        is_forced_vertical = False
         if was_empty and width > 0 and height > 0:
-            msg = QMessageBox()
-            msg.setWindowTitle("Configuración de Proyecto")
-            
-            # THE FIX: Calculate EFFECTIVE Visual Dimensions
-            vis_w = width
-            vis_h = height
-            rotation_mod = abs(rotation) % 360
-            
-            if rotation_mod == 90 or rotation_mod == 270:
-                vis_w, vis_h = height, width
-            
-            # Detect format and calculate aspect ratio
-            is_vertical = vis_h > vis_w
-            aspect_str = "VERTICAL" if is_vertical else "PANORÁMICO"
-            
-            # Calculate aspect ratio
-            from math import gcd
-            divisor = gcd(vis_w, vis_h)
-            aspect_w = vis_w // divisor
-            aspect_h = vis_h // divisor
-            
-            # Suggest common presets for vertical videos
-            suggested_res = (vis_w, vis_h)
-            preset_name = f"{vis_w}x{vis_h}"
-            
-            if is_vertical:
-                # Common vertical presets
-                common_vertical = {
-                    (1080, 1920): "Instagram/TikTok/YouTube Shorts (9:16)",
-                    (1080, 1350): "Instagram Post (4:5)",
-                    (720, 1280): "HD Vertical (9:16)",
-                }
-                # Check if it matches a common preset
-                if (vis_w, vis_h) in common_vertical:
-                    preset_name = common_vertical[(vis_w, vis_h)]
-                # Fuzzy Match for 9:16
-                elif abs(vis_w/vis_h - 9/16) < 0.05:
-                     if abs(vis_w - 1080) < 200:
-                         suggested_res = (1080, 1920)
-                         preset_name = "Instagram/TikTok/YouTube Shorts (1080x1920)"
-            
-            msg.setText(f"El medio detectado es {aspect_str} ({vis_w}x{vis_h}).")
-            
-            # --- USER CHOICE STRATEGY ---
-            # Instead of just Yes/No, we give 3 robust options.
-            # 1. Match Detected
-            # 2. force Vertical (Shorts)
-            # 3. Keep current
-            
-            btn_match = msg.addButton(f"Ajustar a {vis_w}x{vis_h}", QMessageBox.YesRole)
-            
-            # Smart "Force Vertical" button logic
-            # If we detected Horizontal, offer Vertical. If detected Vertical, offer Horizontal?
-            # Usually the problem is False Horizontal (Metadata missing).
-            
-            # Calculate the "Inverted" resolution for the Force button
-            force_w, force_h = vis_w, vis_h
-            if vis_w > vis_h: # If detected landscape, offer portrait
-                force_w, force_h = vis_h, vis_w
-            
-            btn_force_vert = msg.addButton(f"Forzar Video Vertical (Shorts)", QMessageBox.ActionRole)
-            btn_keep = msg.addButton("Mantener Actual", QMessageBox.NoRole)
-            
-            msg.setDefaultButton(btn_match)
-            
-            # Icon Logic
-            msg.setWindowIcon(self.windowIcon())
-            logo_path = self.get_resource_path(os.path.join("src", "img", "logo.png"))
-            if os.path.exists(logo_path):
-                src_pix = QPixmap(logo_path).scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                msg.setIconPixmap(src_pix)
-            
-            msg.exec() 
-            clicked = msg.clickedButton()
-            
-            if clicked == btn_match:
-                # Apply detected
-                self.on_resolution_changed(suggested_res[0], suggested_res[1])
-            elif clicked == btn_force_vert:
-                # Apply FORCED VERTICAL (1080x1920 usually)
-                self.on_resolution_changed(force_w, force_h)
-                # If we detected landscape but user forced vertical, we must rotate the clip content
-                if vis_w > vis_h:
-                    is_forced_vertical = True
+            is_forced_vertical = self._ask_project_resolution(width, height, rotation, was_empty)
+        
+        kind = self._media_kind(file_path)
+        v_track = a_track = -1
+        if kind == "video":
+            # 1. Video Track
+            v_track = self._import_track(TrackType.VIDEO, preferred_track_idx)
+            # 2. Audio Track
+            self.add_track(TrackType.AUDIO)
+            a_track = len(self.model.track_types) - 1
+        else:
+            required_type = TrackType.AUDIO if kind == "audio" else TrackType.VIDEO
+            t_idx = self._import_track(required_type, preferred_track_idx)
+            if kind == "audio":
+                a_track = t_idx
             else:
-                # Keep current (do nothing or default 1080p if first time)
-                if was_empty:
-                    self.on_resolution_changed(1920, 1080)
+                v_track = t_idx
+
+        clips = self._make_import_clips(file_path, duration, width, height, rotation,
+                                        start_frame, v_track, a_track, is_forced_vertical)
+        
+        # DEFERRED SOURCE LOADING: Avoid blocking UI thread
+        # We schedule the heavy load for the NEXT event loop cycle
+        if file_path not in self.media_source_cache:
+            QTimer.singleShot(0, lambda: self._instantiate_source(file_path))
         
-        is_audio = ext in ["mp3", "wav", "aac", "m4a", "flac"]
-        is_image = ext in ["jpg", "jpeg", "png", "gif", "bmp", "webp"]
-        is_video = not is_audio and not is_image
+        for clip in clips:
+            self.model.add_clip(clip)
+        # Trigger background workers (Async by nature)
+        for clip in clips:
+            self._start_clip_analysis(clip)
+        
+        self.timeline_widget.update()
+        self.on_structure_changed()
+        
+        # Trigger cinematic "Zoom to Fit" animation on every import
+        QTimer.singleShot(100, lambda: self.timeline_widget.zoom_to_fit(animate=True))
+        self.status_label.setText(f"Importado: {file_name}")
+
+    @staticmethod
+    def _media_kind(file_path):
+        ext = file_path.lower().split('.')[-1]
+        if ext in ["mp3", "wav", "aac", "m4a", "flac"]:
+            return "audio"
+        if ext in ["jpg", "jpeg", "png", "gif", "bmp", "webp"]:
+            return "image"
+        return "video"
+
+    def _import_track(self, required_type, preferred_track_idx):
+        """Preferred track if it has the right type, else a new track."""
+        if preferred_track_idx != -1 and preferred_track_idx < len(self.model.track_types):
+            if self.model.track_types[preferred_track_idx] == required_type:
+                return preferred_track_idx
+        self.add_track(required_type)
+        return len(self.model.track_types) - 1
+
+    def _ask_project_resolution(self, width, height, rotation, was_empty):
+        """
+        First import into an empty project: offers to match the media resolution.
+        Returns True if the user forced vertical on landscape media.
+        """
+        is_forced_vertical = False
+        msg = QMessageBox()
+        msg.setWindowTitle("Configuración de Proyecto")
+        
+        # THE FIX: Calculate EFFECTIVE Visual Dimensions
+        vis_w = width
+        vis_h = height
+        rotation_mod = abs(rotation) % 360
+        
+        if rotation_mod == 90 or rotation_mod == 270:
+            vis_w, vis_h = height, width
+        
+        # Detect format and calculate aspect ratio
+        is_vertical = vis_h > vis_w
+        aspect_str = "VERTICAL" if is_vertical else "PANORÁMICO"
+        
+        # Calculate aspect ratio
+        from math import gcd
+        divisor = gcd(vis_w, vis_h)
+        aspect_w = vis_w // divisor
+        aspect_h = vis_h // divisor
+        
+        # Suggest common presets for vertical videos
+        suggested_res = (vis_w, vis_h)
+        preset_name = f"{vis_w}x{vis_h}"
+        
+        if is_vertical:
+            # Common vertical presets
+            common_vertical = {
+                (1080, 1920): "Instagram/TikTok/YouTube Shorts (9:16)",
+                (1080, 1350): "Instagram Post (4:5)",
+                (720, 1280): "HD Vertical (9:16)",
+            }
+            # Check if it matches a common preset
+            if (vis_w, vis_h) in common_vertical:
+                preset_name = common_vertical[(vis_w, vis_h)]
+            # Fuzzy Match for 9:16
+            elif abs(vis_w/vis_h - 9/16) < 0.05:
+                 if abs(vis_w - 1080) < 200:
+                     suggested_res = (1080, 1920)
+                     preset_name = "Instagram/TikTok/YouTube Shorts (1080x1920)"
+        
+        msg.setText(f"El medio detectado es {aspect_str} ({vis_w}x{vis_h}).")
+        
+        # --- USER CHOICE STRATEGY ---
+        # Instead of just Yes/No, we give 3 robust options.
+        # 1. Match Detected
+        # 2. force Vertical (Shorts)
+        # 3. Keep current
+        
+        btn_match = msg.addButton(f"Ajustar a {vis_w}x{vis_h}", QMessageBox.YesRole)
+        
+        # Smart "Force Vertical" button logic
+        # If we detected Horizontal, offer Vertical. If detected Vertical, offer Horizontal?
+        # Usually the problem is False Horizontal (Metadata missing).
+        
+        # Calculate the "Inverted" resolution for the Force button
+        force_w, force_h = vis_w, vis_h
+        if vis_w > vis_h: # If detected landscape, offer portrait
+            force_w, force_h = vis_h, vis_w
+        
+        btn_force_vert = msg.addButton(f"Forzar Video Vertical (Shorts)", QMessageBox.ActionRole)
+        btn_keep = msg.addButton("Mantener Actual", QMessageBox.NoRole)
+        
+        msg.setDefaultButton(btn_match)
+        
+        # Icon Logic
+        msg.setWindowIcon(self.windowIcon())
+        logo_path = self.get_resource_path(os.path.join("src", "img", "logo.png"))
+        if os.path.exists(logo_path):
+            src_pix = QPixmap(logo_path).scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            msg.setIconPixmap(src_pix)
+        
+        msg.exec() 
+        clicked = msg.clickedButton()
+        
+        if clicked == btn_match:
+            # Apply detected
+            self.on_resolution_changed(suggested_res[0], suggested_res[1])
+        elif clicked == btn_force_vert:
+            # Apply FORCED VERTICAL (1080x1920 usually)
+            self.on_resolution_changed(force_w, force_h)
+            # If we detected landscape but user forced vertical, we must rotate the clip content
+            if vis_w > vis_h:
+                is_forced_vertical = True
+        else:
+            # Keep current (do nothing or default 1080p if first time)
+            if was_empty:
+                self.on_resolution_changed(1920, 1080)
+        return is_forced_vertical
+
+    def _make_import_clips(self, file_path, duration, width, height, rotation, start_frame,
+                           v_track, a_track, is_forced_vertical=False):
+        """
+        Builds the clips for one imported file (not yet added to the model):
+        video -> linked video + audio clips, audio or image -> a single clip.
+        """
+        from .models import TimelineClip
+        
+        file_name = os.path.basename(file_path)
+        kind = self._media_kind(file_path)
+        is_image = kind == "image"
         
         fps = self.get_fps()
         # duration and source_duration are passed from worker (in frames)
@@ -1202,17 +1104,7 @@ class RockyApp(QMainWindow):
            duration = int(30 * fps)
            source_duration = -1
 
-        if is_video:
-            # 1. Video Track
-            v_track = -1
-            if preferred_track_idx != -1 and preferred_track_idx < len(self.model.track_types):
-                if self.model.track_types[preferred_track_idx] == TrackType.VIDEO:
-                    v_track = preferred_track_idx
-            
-            if v_track == -1:
-                self.add_track(TrackType.VIDEO)
-                v_track = len(self.model.track_types) - 1
-            
+        if kind == "video":
             v_clip = TimelineClip(file_name, start_frame, duration, v_track)
             v_clip.file_path = file_path
             v_clip.source_duration_frames = source_duration
@@ -1223,11 +1115,6 @@ class RockyApp(QMainWindow):
             v_clip.source_rotation = rotation
             v_clip.source_fps = fps
             
-            # DEFERRED SOURCE LOADING: Avoid blocking UI thread
-            # We schedule the heavy load for the NEXT event loop cycle
-            if file_path not in self.media_source_cache:
-                QTimer.singleShot(0, lambda: self._instantiate_source(file_path))
-            
             # --- INITIAL TRANSFORMATION (Aspect Fit) ---
             # THE FIX: Do NOT swap width/height logic for the calculation of scale.
             # The engine now handles rotation (w,h) internally correctly.
@@ -1263,8 +1150,8 @@ class RockyApp(QMainWindow):
             # We want the content rectangle to fit inside the project rectangle
             # scaling uniformly.
             
-            scale_w = p_w / content_w
-            scale_h = p_h / content_h
+            scale_w = p_w / max(1, content_w)
+            scale_h = p_h / max(1, content_h)
             
             # Choose the smaller scale to ensure 'Fit Inside' (Letterboxing)
             final_scale = min(scale_w, scale_h)
@@ -1279,11 +1166,6 @@ class RockyApp(QMainWindow):
                 v_clip.transform.scale_x = 1.0
                 v_clip.transform.scale_y = 1.0
             
-            # 2. Audio Track
-            a_track = -1
-            self.add_track(TrackType.AUDIO)
-            a_track = len(self.model.track_types) - 1
-            
             a_clip = TimelineClip(f"[Audio] {file_name}", start_frame, duration, a_track)
             a_clip.file_path = file_path
             a_clip.source_duration_frames = source_duration
@@ -1291,51 +1173,28 @@ class RockyApp(QMainWindow):
             
             v_clip.linked_to = a_clip
             a_clip.linked_to = v_clip
-            
-            self.model.add_clip(v_clip)
-            self.model.add_clip(a_clip)
-            
-            # Trigger background workers (Async by nature)
-            self._start_waveform_analysis(a_clip)
-            self._start_thumbnail_analysis(v_clip)
-            self._trigger_proxy_generation(v_clip)
-            
-        else:
-            required_type = TrackType.AUDIO if is_audio else TrackType.VIDEO
-            t_idx = -1
-            if preferred_track_idx != -1 and preferred_track_idx < len(self.model.track_types):
-                if self.model.track_types[preferred_track_idx] == required_type:
-                    t_idx = preferred_track_idx
-            
-            if t_idx == -1:
-                self.add_track(required_type)
-                t_idx = len(self.model.track_types) - 1
-            
-            clip = TimelineClip(file_name, start_frame, duration, t_idx)
-            clip.file_path = file_path
-            clip.source_duration_frames = source_duration
-            clip.source_width = width
-            clip.source_height = height
-            clip.source_rotation = rotation
-            clip.source_fps = fps
-            
-            if file_path not in self.media_source_cache:
-                QTimer.singleShot(0, lambda: self._instantiate_source(file_path))
-                
-            self.model.add_clip(clip)
-            
-            if is_audio:
-                self._start_waveform_analysis(clip)
-            else:
-                self._start_thumbnail_analysis(clip)
-        
-        self.timeline_widget.update()
-        self.on_structure_changed()
-        
-        # Trigger cinematic "Zoom to Fit" animation on every import
-        QTimer.singleShot(100, lambda: self.timeline_widget.zoom_to_fit(animate=True))
-        self.status_label.setText(f"Importado: {file_name}")
-        
+            return [v_clip, a_clip]
+
+        t_idx = a_track if kind == "audio" else v_track
+        clip = TimelineClip(file_name, start_frame, duration, t_idx)
+        clip.file_path = file_path
+        clip.source_duration_frames = source_duration
+        clip.source_width = width
+        clip.source_height = height
+        clip.source_rotation = rotation
+        clip.source_fps = fps
+        return [clip]
+
+    def _start_clip_analysis(self, clip):
+        """Queues waveform (audio) or filmstrip + proxy (video) jobs for a new clip."""
+        from .models import TrackType
+        if self.model.track_types[clip.track_index] == TrackType.AUDIO:
+            self._start_waveform_analysis(clip)
+            return
+        self._start_thumbnail_analysis(clip)
+        if self._media_kind(clip.file_path) == "video" and preferences.get("proxy/auto"):
+            self._trigger_proxy_generation(clip)
+
     def _safe_remove_worker(self, worker):
         """Standardized safe removal of background threads."""
         if worker in self._active_workers:
@@ -1355,22 +1214,69 @@ class RockyApp(QMainWindow):
                 file_path += '.rocky'
             self.save_project(file_path)
 
+    AUTOSAVE_INTERVAL_MS = 120000
+
     def save_project(self, path):
-        try:
-            data = self.model.to_dict()
-            with open(path, 'w') as f:
-                json.dump(data, f, indent=4)
-            self.project_path = path
+        """
+        Saves the project in the binary .rocky format.
+        The snapshot is taken here (UI thread); encoding and the atomic
+        temp+rename write run in a ProjectSaveWorker.
+        """
+        if self._save_worker is not None:
+            # Guardado anterior todavía en curso: reintentamos al terminar
+            QTimer.singleShot(100, lambda: self.save_project(path))
+            return
+        snapshot = self.model.to_dict()
+        self.project_path = path
+        self.setWindowTitle(f"Rocky Video Editor Pro - {os.path.basename(path)}")
+        self.status_label.setText(f"Guardando proyecto: {os.path.basename(path)}...")
+        self._start_save_worker(snapshot, path, autosave=False)
+
+    def on_autosave(self):
+        if self._save_worker is not None or not self.model.clips:
+            return
+        snapshot = self.model.to_dict()
+        if snapshot == self._last_saved_snapshot:
+            return
+        self._start_save_worker(snapshot, project_io.autosave_path(self.project_path), autosave=True)
+
+    def _start_save_worker(self, snapshot, path, autosave):
+        worker = ProjectSaveWorker(snapshot, path, autosave)
+        worker.finished.connect(lambda p: self._on_project_saved(worker, p))
+        worker.error.connect(lambda msg: self._on_project_save_error(worker, msg))
+        self._save_worker = worker
+        self._active_workers.append(worker)
+        worker.start()
+
+    def _on_project_saved(self, worker, path):
+        self._last_saved_snapshot = worker.snapshot
+        if not worker.autosave:
             self.status_label.setText(f"Proyecto guardado: {os.path.basename(path)}")
-            # Optional: update window title
-            self.setWindowTitle(f"Rocky Video Editor Pro - {os.path.basename(path)}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error al guardar", f"No se pudo guardar el proyecto:\n{str(e)}")
+        self._save_worker = None
+        self._safe_remove_worker(worker)
+
+    def _on_project_save_error(self, worker, message):
+        self._save_worker = None
+        self._safe_remove_worker(worker)
+        if worker.autosave:
+            self.status_label.setText(f"Error en el autoguardado: {message}")
+        else:
+            QMessageBox.critical(self, "Error al guardar", f"No se pudo guardar el proyecto:\n{message}")
+
+    def on_export_json(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Exportar Proyecto JSON", "", "JSON (*.json)")
+        if file_path:
+            if not file_path.endswith('.json'):
+                file_path += '.json'
+            try:
+                project_io.export_json(self.model.to_dict(), file_path)
+                self.status_label.setText(f"Proyecto exportado: {os.path.basename(file_path)}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error al exportar", f"No se pudo exportar el proyecto:\n{str(e)}")
 
     def load_project(self, path):
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
+            data = project_io.load(path)
             
             from .models import TimelineModel
             new_model = TimelineModel.from_dict(data)
@@ -1378,6 +1284,12 @@ class RockyApp(QMainWindow):
             # Stop playback
             if self.model.blueline.playing:
                 self.toggle_play()
+
+            # Trabajos pendientes del proyecto anterior (los proxies se conservan:
+            # van a la caché compartida ~/.rocky/cache/proxies y sirven a
+            # cualquier proyecto que use el mismo medio)
+            for job_class in (JobClass.IMPORT, JobClass.WAVEFORM, JobClass.THUMBNAIL):
+                self.jobs.cancel_all(job_class)
                 
             # Replace model
             self.model = new_model
@@ -1388,7 +1300,9 @@ class RockyApp(QMainWindow):
             # Re-initialize workers or reconnect if needed
             self.audio_worker.model = new_model
             
-            self.project_path = path
+            # Los JSON se importan: el próximo "Guardar" pide ruta .rocky
+            self.project_path = path if not path.lower().endswith('.json') else None
+            self._last_saved_snapshot = data
             self.setWindowTitle(f"Rocky Video Editor Pro - {os.path.basename(path)}")
             
             # Rebuild and refresh
@@ -1396,6 +1310,7 @@ class RockyApp(QMainWindow):
             self.status_label.setText(f"Proyecto cargado: {os.path.basename(path)}")
             
             # Recalculate waveforms and thumbnails for loaded clips
+            auto_proxy = preferences.get("proxy/auto")
             for clip in self.model.clips:
                 if clip.file_path and os.path.exists(clip.file_path):
                     ext = clip.file_path.lower().split('.')[-1]
@@ -1404,7 +1319,8 @@ class RockyApp(QMainWindow):
                         self._start_waveform_analysis(clip)
                     else:
                         self._start_thumbnail_analysis(clip)
-                        self._trigger_proxy_generation(clip)
+                        if auto_proxy:
+                            self._trigger_proxy_generation(clip)
             
         except Exception as e:
             QMessageBox.critical(self, "Error al cargar", f"No se pudo cargar el proyecto:\n{str(e)}")
@@ -1450,8 +1366,14 @@ class RockyApp(QMainWindow):
         
         high_quality = config.get("high_quality", False)
         
+        # Snapshot desacoplado del modelo: el usuario puede seguir editando
+        # mientras los motores de exportación leen su propia copia.
+        model_snapshot = TimelineModel.from_dict(self.model.to_dict())
+
         # Crear y configurar Worker con la resolución elegida
-        self.render_worker = RenderWorker(self.engine, self.engine_lock, output_path, total_frames, active_fps, render_w, render_h, high_quality)
+        self.render_worker = RenderWorker(self.engine, self.engine_lock, output_path, total_frames, active_fps, render_w, render_h, high_quality,
+                                          model=model_snapshot, master_gain=self.get_master_gain(),
+                                          segments=default_segment_count() if config.get("segmented") else 1)
 
         self.render_worker.progress.connect(self.prog_dialog.setValue)
         self.render_worker.finished.connect(self._on_render_finished)
@@ -1472,6 +1394,69 @@ class RockyApp(QMainWindow):
         self.status_label.setText("Error en el render.")
         QMessageBox.critical(self, "Error de Render", f"Ocurrió un error al exportar:\n{message}")
 
+    def _prerender_target_range(self):
+        """Region under the playhead, else the span of the selected clips."""
+        playhead = self.model.blueline.playhead_frame
+        for region in self.model.regions:
+            if region.start_frame <= playhead < region.start_frame + region.duration_frames:
+                return int(region.start_frame), int(region.start_frame + region.duration_frames)
+        selected = [c for c in self.model.clips if c.selected]
+        if selected:
+            return (int(min(c.start_frame for c in selected)),
+                    int(max(c.start_frame + c.duration_frames for c in selected)))
+        return None
+
+    def on_prerender_selection(self):
+        """Renders the selected range in the background into the pre-render cache."""
+        target = self._prerender_target_range()
+        if target is None or target[1] <= target[0]:
+            QMessageBox.information(self, "Pre-renderizar",
+                                    "Selecciona clips o coloca el cursor dentro de una región.")
+            return
+
+        start_frame, end_frame = target
+        snapshot = TimelineModel.from_dict(self.model.to_dict())
+        fps, width, height = self.get_fps(), self.p_width, self.p_height
+
+        def make_worker():
+            worker = PrerenderWorker(snapshot, start_frame, end_frame, fps, width, height)
+            worker.progress.connect(lambda p: self.status_label.setText(f"Pre-renderizando... {p}%"))
+            return worker
+
+        self.jobs.submit(
+            JobClass.PRERENDER, (start_frame, end_frame), make_worker,
+            on_result=self._on_prerender_finished,
+            on_error=lambda msg: self.status_label.setText(f"Error en el pre-render: {msg}"))
+        self.status_label.setText(f"Pre-renderizando frames {start_frame}-{end_frame}...")
+
+    def _on_prerender_finished(self, entry):
+        self.prerender_cache.add(entry)
+        self.refresh_render_cache()
+        if entry in self.prerender_cache.entries:
+            self.status_label.setText(f"Pre-render listo: frames {entry.start_frame}-{entry.end_frame}")
+        else:
+            # El rango se editó mientras se renderizaba
+            self.status_label.setText("Pre-render descartado: el rango cambió durante el render")
+
+    TRACE_SECONDS = 5
+
+    def on_record_trace(self):
+        """Records a few seconds of engine/worker spans to a Chrome trace (Perfetto) file."""
+        try:
+            # Mismo camino que trace() del terminal: una sola grabación a la vez
+            tracing.record_for(self.TRACE_SECONDS, on_done=self.trace_saved.emit)
+        except RuntimeError:
+            self.status_label.setText("Ya se está grabando una traza...")
+            return
+        tracing.set_thread_name("UI")
+        self.status_label.setText(f"Grabando traza de rendimiento ({self.TRACE_SECONDS} s)...")
+
+    def _finish_trace(self, path):
+        if path:
+            self.status_label.setText(f"Traza guardada: {path} (ábrela en ui.perfetto.dev)")
+        else:
+            self.status_label.setText("Error guardando la traza (ver consola)")
+
     def on_settings(self):
         self.status_label.setText("Abriendo ajustes del proyecto...")
         dlg = SettingsDialog(self)
@@ -1488,6 +1473,9 @@ class RockyApp(QMainWindow):
             new_h = settings["height"]
             new_fps = settings["fps"]
             
+            # 0. Preferencias de la aplicación (proxies, visor)
+            preferences.set_many({k: v for k, v in settings.items() if "/" in k})
+            self._load_preview_preferences()
             
             # 1. Update Persistent State
             self.p_width = new_w
@@ -1575,6 +1563,14 @@ class RockyApp(QMainWindow):
             self.playback_start_frame = self.model.blueline.playhead_frame
             self.playback_start_audio_time = self.audio_player.get_processed_us()
             
+            # Ediciones que no reconstruyen el motor (p.ej. propiedades) también invalidan
+            self.refresh_render_cache()
+
+            # Cada reproducción arranca en la calidad preferida y se adapta
+            self.quality_governor.reset(active_fps, self.playback_rate)
+            self._preopen_preview_proxies()
+            self._apply_playback_quality()
+
             start_time = self.model.blueline.playhead_frame / active_fps
             self.audio_worker.start_playback(start_time, active_fps, self.playback_rate)
         else:
@@ -1586,6 +1582,7 @@ class RockyApp(QMainWindow):
             if hasattr(self, '_last_engine_w'):
                 delattr(self, '_last_engine_w')
             del locker
+            self._apply_playback_quality()
             
             # Forzar un último frame en alta resolución
             fps = self.get_fps()
@@ -1610,12 +1607,9 @@ class RockyApp(QMainWindow):
             active_fps = self.get_fps()
             
             # Use Audio Clock for accurate elapsed time
-            current_audio = self.audio_player.get_processed_us()
-            elapsed_us = current_audio - self.playback_start_audio_time
-            if elapsed_us < 0: elapsed_us = 0
-            elapsed_real_time = elapsed_us / 1_000_000.0
-            
-            current_frame = self.playback_start_frame + (elapsed_real_time * active_fps * self.playback_rate)
+            current_frame = playback_clock_frame(
+                self.playback_start_frame, self.playback_start_audio_time,
+                self.audio_player.get_processed_us(), active_fps, self.playback_rate)
             
             self.playback_start_frame = current_frame
             self.playback_start_audio_time = self.audio_player.get_processed_us()
@@ -1640,19 +1634,22 @@ class RockyApp(QMainWindow):
         if not self.model.blueline.playing:
             return
 
+        with tracing.span("playback_tick"):
+            self._playback_tick()
+
+    def _playback_tick(self):
         active_fps = self.get_fps()
         
         # RELOJ MAESTRO: Calculamos el tiempo transcurrido REAL basado en el AUDIO
         # Esto previene el desincronismo (Drift). Si el audio se adelanta/atrasa, el video lo sigue.
         try:
             current_audio_time = self.audio_player.get_processed_us()
-            elapsed_us = current_audio_time - self.playback_start_audio_time
-            if elapsed_us < 0: elapsed_us = 0 
-            elapsed_real_time = elapsed_us / 1_000_000.0
         except:
-             elapsed_real_time = 0
+             current_audio_time = self.playback_start_audio_time
              
-        current_frame = self.playback_start_frame + (elapsed_real_time * active_fps * self.playback_rate)
+        current_frame = playback_clock_frame(
+            self.playback_start_frame, self.playback_start_audio_time,
+            current_audio_time, active_fps, self.playback_rate)
 
         # 1. Synchronize UI (Playhead and Timeline)
         playhead_screen_x = None
@@ -1672,7 +1669,10 @@ class RockyApp(QMainWindow):
         
         # OPTIMIZACIÓN DE RESOLUCIÓN DINÁMICA:
         # Ajustamos el motor para renderizar exactamente lo que se ve en el visor.
-        if self.viewer_registry:
+        if hasattr(self.engine, "set_preview_scale"):
+            # Motor con escala de preview: lienzo = proyecto * escala (sin recortes)
+            self._update_preview_scale()
+        elif self.viewer_registry:
             v_size = self.viewer_registry[0].display_label.size()
             if not v_size.isEmpty():
                 # HW Optimization: Strides prefer multiples of 16
@@ -1752,15 +1752,114 @@ class RockyApp(QMainWindow):
         for sidebar in self.findChildren(SidebarPanel):
             sidebar.refresh_tracks()
 
+    def _load_preview_preferences(self):
+        """Applies Preferences > Visor to the playback quality governor."""
+        gov = self.quality_governor
+        gov.ceiling = level_for_label(preferences.get("preview/resolution"))
+        gov.adaptive = bool(preferences.get("preview/adaptive"))
+        gov.use_proxies = bool(preferences.get("preview/proxy_fallback"))
+        gov.level = max(gov.level, gov.ceiling)
+
+    def _on_frame_timing(self, timestamp, elapsed):
+        """evaluate() latency from the VideoWorker: feeds the governor while playing."""
+        if not self.model.blueline.playing:
+            return
+        if self.quality_governor.record(elapsed):
+            gov = self.quality_governor
+            print(f"Playback quality -> {gov.label} ({elapsed * 1000:.1f} ms / "
+                  f"{gov.budget_s * 1000:.1f} ms budget)")
+            self._apply_playback_quality()
+
+    def _apply_playback_quality(self):
+        """Pushes the governor level to the engine and viewers (full quality when paused)."""
+        playing = self.model.blueline.playing
+        gov = self.quality_governor
+        if hasattr(self.engine, "set_preview_scale"):
+            if playing:
+                self._update_preview_scale()
+            else:
+                locker = QMutexLocker(self.engine_lock)
+                self.engine.set_preview_scale(1.0)
+                self._preview_scale = 1.0
+                del locker
+        self._set_preview_proxies(playing and gov.proxies_active)
+
+        label = gov.label if playing else "Completa"
+        for viewer in self.viewer_registry:
+            if hasattr(viewer, "set_playback_quality"):
+                viewer.set_playback_quality(label, self._preview_proxies_on, playing)
+
+    def _update_preview_scale(self):
+        """Preview scale = governor level, never above what the viewer can show."""
+        scale = self.quality_governor.scale
+        if self.viewer_registry and self.p_width > 0 and self.p_height > 0:
+            label = self.viewer_registry[0].display_label
+            v_size = label.size()
+            if not v_size.isEmpty():
+                dpr = label.devicePixelRatioF()
+                fit = min(v_size.width() * dpr / self.p_width, v_size.height() * dpr / self.p_height)
+                scale = min(scale, max(0.05, fit))
+        # Debounce: cambiar el lienzo invalida el frame cacheado de cada fuente
+        if abs(scale - self._preview_scale) > 0.02:
+            locker = QMutexLocker(self.engine_lock)
+            self.engine.set_preview_scale(scale)
+            self._preview_scale = scale
+            del locker
+
+    def _set_preview_proxies(self, active):
+        """Swaps the video of clips with a ready proxy while playback is degraded."""
+        from .models import ProxyStatus
+        if active == self._preview_proxies_on:
+            return
+        # Con el proxy global activo los clips ya decodifican el proxy
+        if active and self.toolbar.btn_proxy.isChecked():
+            return
+        # Fuentes resueltas ANTES del lock: abrir un decoder bajo engine_lock
+        # bloquearía al VideoWorker justo cuando ya va tarde. Normalmente ya
+        # están abiertas (_preopen_preview_proxies al empezar a reproducir).
+        swaps = []
+        for clip, cpp_clip in self.clip_map.items():
+            if not hasattr(cpp_clip, "preview_source"):
+                break # .pyd sin preview_source
+            if active:
+                if clip.proxy_status == ProxyStatus.READY and clip.proxy_path:
+                    swaps.append((cpp_clip, self._instantiate_source(clip.proxy_path)))
+            elif cpp_clip.preview_source is not None:
+                swaps.append((cpp_clip, None))
+        if swaps:
+            locker = QMutexLocker(self.engine_lock)
+            for cpp_clip, source in swaps:
+                cpp_clip.preview_source = source
+            del locker
+        self._preview_proxies_on = active and bool(swaps)
+
+    def _preopen_preview_proxies(self):
+        """Opens ready proxies at playback start so a later downgrade is only a pointer swap."""
+        from .models import ProxyStatus
+        gov = self.quality_governor
+        if not (gov.adaptive and gov.use_proxies) or self.toolbar.btn_proxy.isChecked():
+            return
+        if not hasattr(rocky_core.Clip, "preview_source"):
+            return
+        for clip in self.clip_map:
+            if clip.proxy_status == ProxyStatus.READY and clip.proxy_path:
+                self._instantiate_source(clip.proxy_path) # Queda en media_source_cache
+
     def _broadcast_frame(self, frame_buffer):
         """Send rendered frame to all registered viewer panels."""
         is_playing = self.model.blueline.playing
-        for viewer in self.viewer_registry:
-            try:
-                viewer.display_frame(frame_buffer, fast_mode=is_playing)
-            except:
-                # Remove dead viewers
-                self.viewer_registry.remove(viewer)
+        with tracing.span("display_frame", viewers=len(self.viewer_registry)):
+            # Un solo envoltorio QImage (sin copia) compartido por todos los visores
+            shared = SharedFrame(frame_buffer) if frame_buffer is not None else None
+            for viewer in list(self.viewer_registry):
+                try:
+                    if shared is not None and hasattr(viewer, 'present'):
+                        viewer.present(shared, fast_mode=is_playing)
+                    else:
+                        viewer.display_frame(frame_buffer, fast_mode=is_playing)
+                except:
+                    # Remove dead viewers
+                    self.viewer_registry.remove(viewer)
 
     def register_viewer(self, viewer_panel):
         """Register a viewer panel to receive frame broadcasts and connect controls."""
@@ -2101,25 +2200,42 @@ class RockyApp(QMainWindow):
 
 
 
+    def _job_priority(self, clip):
+        """Clips inside the visible part of the timeline are processed first."""
+        try:
+            first, last = self.timeline_widget.visible_frame_range()
+        except Exception:
+            return PRIORITY_NORMAL
+        visible = clip.start_frame < last and clip.start_frame + clip.duration_frames > first
+        return PRIORITY_VISIBLE if visible else PRIORITY_NORMAL
+
+    def _on_jobs_progress(self, done, total):
+        if total > 1 and done < total:
+            self.status_label.setText(f"Procesando medios en segundo plano: {done}/{total}")
+
     def _start_waveform_analysis(self, clip):
-        """Launches a background thread to calculate the real audio waveform."""
+        """Queues the real audio waveform (one analysis per media file)."""
         clip.waveform_computing = True
-        worker = WaveformWorker(clip, clip.file_path)
-        worker.finished.connect(self.on_waveform_finished)
-        # Built-in finished for safe cleanup
-        worker.finished.connect(lambda: self._safe_remove_worker(worker))
-        self._active_workers.append(worker)
-        worker.start()
+        path = clip.file_path
+        self.jobs.submit(
+            JobClass.WAVEFORM, path, lambda: WaveformWorker(clip, path),
+            on_result=lambda _clip, peaks: self.on_waveform_finished(clip, peaks),
+            priority=self._job_priority(clip))
 
     def _start_thumbnail_analysis(self, clip):
-        """Launches a background thread to extract keyframe thumbnails."""
+        """Queues the keyframe filmstrip (one build per media file)."""
+        path = clip.file_path
+        strip = filmstrip.lookup(path)
+        if strip is not None:
+            # Ya generado en esta sesión (clip duplicado/reimportado)
+            self.on_thumbnails_finished(clip, strip.previews())
+            return
+
         clip.thumbnails_computing = True
-        worker = ThumbnailWorker(clip, clip.file_path)
-        worker.finished.connect(self.on_thumbnails_finished)
-        # Built-in finished for safe cleanup
-        worker.finished.connect(lambda: self._safe_remove_worker(worker))
-        self._active_workers.append(worker)
-        worker.start()
+        self.jobs.submit(
+            JobClass.THUMBNAIL, path, lambda: ThumbnailWorker(clip, path),
+            on_result=lambda _clip, thumbs: self.on_thumbnails_finished(clip, thumbs),
+            priority=self._job_priority(clip))
 
     def on_waveform_finished(self, clip, peaks):
         """Callback when the C++ engine finishes scanning the audio file."""
@@ -2151,12 +2267,25 @@ class RockyApp(QMainWindow):
         clip.proxy_status = ProxyStatus.GENERATING
         self.update_proxy_button_state()
         
-        worker = ProxyWorker(clip, clip.file_path)
-        worker.finished.connect(self._on_proxy_finished)
-        # Built-in finished for safe cleanup
-        worker.finished.connect(lambda: self._safe_remove_worker(worker))
-        self._active_workers.append(worker)
-        worker.start()
+        path = clip.file_path
+        profile = proxy_cache.ProxyProfile.from_preferences()
+        proxy_cache.queue().add(path, profile)
+        self.jobs.submit(
+            JobClass.PROXY, (path, profile.key()), lambda: ProxyWorker(clip, path, profile),
+            on_result=lambda _clip, proxy_path, success: self._on_proxy_finished(clip, proxy_path, success),
+            priority=self._job_priority(clip))
+
+    def _resume_proxy_queue(self):
+        """Re-queues proxies left unfinished by a previous session (lowest priority)."""
+        for path, profile in proxy_cache.queue().pending():
+            if not os.path.exists(path):
+                proxy_cache.queue().remove(path, profile)
+                continue
+            # Sin clip: si luego un clip pide el mismo proxy se une a este job
+            self.jobs.submit(
+                JobClass.PROXY, (path, profile.key()),
+                lambda p=path, pr=profile: ProxyWorker(None, p, pr),
+                priority=PRIORITY_BACKGROUND)
 
     def _on_proxy_finished(self, clip, proxy_path, success):
         """Callback when proxy generation completes."""
@@ -2252,63 +2381,17 @@ class RockyApp(QMainWindow):
         initial_gain = self.get_master_gain()
         self.engine.set_master_gain(initial_gain)
         
-        # 1. Sync Tracks
-        for track_type in self.model.track_types:
-            cpp_track_type = rocky_core.VIDEO if track_type == TrackType.VIDEO else rocky_core.AUDIO
-            self.engine.add_track(cpp_track_type)
-            
-        # 2. Sync Clips and Media Sources
+        # 1-4. Sync Tracks, Clips, Transforms, Effects and Fades
         use_proxies = self.toolbar.btn_proxy.isChecked()
+        self.clip_map = populate_engine(self.engine, self.model, active_fps, use_proxies,
+                                        source_factory=self._instantiate_source)
+        self._preview_proxies_on = False # Clips nuevos: sin preview_source
+        # clear() vacía también la caché de pre-render: re-registrar lo que siga siendo válido
+        self.refresh_render_cache()
 
-        for clip in self.model.clips:
-            from .models import ProxyStatus
-            
-            # Determine effective path
-            path_to_use = clip.file_path
-            if use_proxies and clip.proxy_status == ProxyStatus.READY and clip.proxy_path:
-                path_to_use = clip.proxy_path
-            
-            media_source = self._instantiate_source(path_to_use)
-            
-            cpp_clip = self.engine.add_clip(
-                clip.track_index,
-                clip.name,
-                int(clip.start_frame),
-                int(clip.duration_frames),
-                clip.source_offset_frames / active_fps,
-                media_source
-            )
-            self.clip_map[clip] = cpp_clip
-            
-            # 3. Surface extended properties
-            cpp_clip.opacity = clip.start_opacity
-            cpp_clip.transform.x = clip.transform.x
-            cpp_clip.transform.y = clip.transform.y
-            cpp_clip.transform.scale_x = clip.transform.scale_x
-            cpp_clip.transform.scale_y = clip.transform.scale_y
-            cpp_clip.transform.rotation = clip.transform.rotation
-            cpp_clip.transform.anchor_x = clip.transform.anchor_x
-            cpp_clip.transform.anchor_y = clip.transform.anchor_y
-
-            # 4. Sync Effects
-            if hasattr(clip, 'effects') and clip.effects:
-                cpp_effects_list = []
-                for eff in clip.effects:
-                    # Robust key check for plugin path
-                    path = eff.get('path') or eff.get('plugin_path') or ''
-                    name = eff.get('name', 'Unknown')
-                    enabled = eff.get('enabled', True)
-                    
-                    if path:
-                        c_eff = rocky_core.Effect(name, path)
-                        c_eff.enabled = enabled
-                        cpp_effects_list.append(c_eff)
-                
-                cpp_clip.effects = cpp_effects_list
-            cpp_clip.fade_in_frames = int(clip.fade_in_frames)
-            cpp_clip.fade_out_frames = int(clip.fade_out_frames)
-            cpp_clip.fade_in_type = rocky_core.FadeType(clip.fade_in_type.value)
-            cpp_clip.fade_out_type = rocky_core.FadeType(clip.fade_out_type.value)
+    def refresh_render_cache(self):
+        """Drops pre-rendered ranges whose clips changed and registers the rest in the engine."""
+        self.prerender_cache.apply(self.engine, self.model, self.get_fps(), self.p_width, self.p_height)
             
     def sync_clip_transform(self, clip):
         """Syncs the transform of a specific clip to the engine and refreshes UI."""
@@ -2321,6 +2404,7 @@ class RockyApp(QMainWindow):
             cpp_clip.transform.rotation = clip.transform.rotation
             cpp_clip.transform.anchor_x = clip.transform.anchor_x
             cpp_clip.transform.anchor_y = clip.transform.anchor_y
+            self.refresh_render_cache()
             
             # 1. Refresh global viewer (real-time feedback in main window)
             current_frame = self.model.blueline.playhead_frame
@@ -2352,24 +2436,7 @@ class RockyApp(QMainWindow):
 
     def _instantiate_source(self, path):
         """Helper to determine the correct C++ backend for a file path, using a cache."""
-        if not path or not os.path.exists(path):
-            return rocky_core.ColorSource(random.randint(50,200), 50, 100, 255)
-            
-        # Return from cache if we already opened this heavyweight file
-        if path in self.media_source_cache:
-            return self.media_source_cache[path]
-
-        lower_path = path.lower()
-        image_extensions = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp')
-        
-        source = None
-        if lower_path.endswith(image_extensions):
-            source = rocky_core.ImageSource(path)
-        else:
-            source = rocky_core.VideoSource(path)
-            
-        self.media_source_cache[path] = source
-        return source
+        return create_media_source(path, self.media_source_cache)
 
     def auto_scroll_playhead(self, abs_x):
         """Ensures the playhead remains visible within the active timeline's scroll area."""
@@ -2458,6 +2525,11 @@ class RockyApp(QMainWindow):
 def main():
     import signal
     import faulthandler
+    import multiprocessing
+
+    # Exportación por segmentos: los procesos hijos (spawn) del ejecutable
+    # congelado deben salir por aquí sin abrir la aplicación.
+    multiprocessing.freeze_support()
     
     # 1. Setup Standard Streams for Windowed Mode (No Console)
     # PyInstaller --noconsole/--windowed sets stdout/stderr to None
@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QFrame
 from PySide6.QtCore import Qt, QRect
 from PySide6.QtGui import QPainter, QPen, QColor, QFont
 
+from ..infrastructure import preferences
+
 class PreferencesDialog(QDialog):
     """
     macOS-style Preferences dialog with sidebar navigation.
@@ -368,23 +370,25 @@ class PreferencesDialog(QDialog):
         
         section, sec_layout = self._create_section("Flujo de Trabajo Proxy")
         
-        cb_auto = QCheckBox("Generar proxies automáticamente")
-        cb_auto.setChecked(True)
-        sec_layout.addWidget(cb_auto)
+        # Valores guardados (QSettings), no los del proyecto
+        self.proxy_auto_cb = QCheckBox("Generar proxies automáticamente")
+        self.proxy_auto_cb.setChecked(bool(preferences.get("proxy/auto")))
+        sec_layout.addWidget(self.proxy_auto_cb)
         
         grid = QGridLayout()
         grid.setSpacing(12)
         
         grid.addWidget(QLabel("Resolución:"), 0, 0)
-        res_combo = QComboBox()
-        res_combo.addItems(["360p", "540p", "720p"])
-        res_combo.setCurrentIndex(1)
-        grid.addWidget(res_combo, 0, 1)
+        self.proxy_res_combo = QComboBox()
+        self.proxy_res_combo.addItems(["360p", "540p", "720p"])
+        self.proxy_res_combo.setCurrentText(preferences.get("proxy/resolution"))
+        grid.addWidget(self.proxy_res_combo, 0, 1)
         
         grid.addWidget(QLabel("Codec:"), 1, 0)
-        codec_combo = QComboBox()
-        codec_combo.addItems(["H.264", "ProRes 422 Proxy"])
-        grid.addWidget(codec_combo, 1, 1)
+        self.proxy_codec_combo = QComboBox()
+        self.proxy_codec_combo.addItems(["H.264", "ProRes 422 Proxy", "Edición (MJPEG intra)"])
+        self.proxy_codec_combo.setCurrentText(preferences.get("proxy/codec"))
+        grid.addWidget(self.proxy_codec_combo, 1, 1)
         
         sec_layout.addLayout(grid)
         layout.addWidget(section)
@@ -404,12 +408,22 @@ class PreferencesDialog(QDialog):
         grid = QGridLayout()
         grid.setSpacing(12)
         
+        # Máxima calidad durante la reproducción (en pausa siempre es completa)
         grid.addWidget(QLabel("Resolución de Preview:"), 0, 0)
-        sc_combo = QComboBox()
-        sc_combo.addItems(["Completa", "1/2", "1/4", "1/8"])
-        grid.addWidget(sc_combo, 0, 1)
+        self.preview_res_combo = QComboBox()
+        self.preview_res_combo.addItems(["Completa", "1/2", "1/4", "1/8"])
+        self.preview_res_combo.setCurrentText(preferences.get("preview/resolution"))
+        grid.addWidget(self.preview_res_combo, 0, 1)
         
         sec_layout.addLayout(grid)
+        
+        self.preview_adaptive_cb = QCheckBox("Bajar la resolución si la reproducción no llega a tiempo")
+        self.preview_adaptive_cb.setChecked(bool(preferences.get("preview/adaptive")))
+        sec_layout.addWidget(self.preview_adaptive_cb)
+        
+        self.preview_proxy_cb = QCheckBox("Usar proxies mientras la calidad esté reducida")
+        self.preview_proxy_cb.setChecked(bool(preferences.get("preview/proxy_fallback")))
+        sec_layout.addWidget(self.preview_proxy_cb)
         layout.addWidget(section)
         layout.addStretch()
         
@@ -430,6 +444,14 @@ class PreferencesDialog(QDialog):
             "width": self.w_spin.value(),
             "height": self.h_spin.value(),
             "fps": fps,
+            # Proxies (preferencias de la aplicación, claves QSettings)
+            "proxy/auto": self.proxy_auto_cb.isChecked(),
+            "proxy/resolution": self.proxy_res_combo.currentText(),
+            "proxy/codec": self.proxy_codec_combo.currentText(),
+            # Visor
+            "preview/resolution": self.preview_res_combo.currentText(),
+            "preview/adaptive": self.preview_adaptive_cb.isChecked(),
+            "preview/proxy_fallback": self.preview_proxy_cb.isChecked(),
             # Audio
             # "sample_rate": ... (Not yet bound to member vars in _create_audio_page, but video is critical right now)
             # Viewer
@@ -26,6 +26,9 @@ class SimpleTimeline(QWidget):
     clip_proxy_toggled = Signal(object)
     clip_fx_toggled = Signal(object)
     selection_changed = Signal(list) # Emits list of selected TimelineClip objects
+
+    HANDLE_REACH_PX = 8      # Alcance de tiradores (fades/trim) fuera del clip
+    SNAP_DISTANCE_PX = 8     # Imán a bordes de clips y al cursor al arrastrar
     
     def __init__(self, model, parent=None):
         super().__init__(parent)
@@ -36,6 +39,7 @@ class SimpleTimeline(QWidget):
         self.mouse_x = -1
         self.mouse_y = -1
         self.dragging_clip = None
+        self.snap_enabled = True
         self.potential_drag_clip = None 
         self.potential_drag_start_pos = None 
         self.drag_start_x = 0
@@ -67,9 +71,10 @@ class SimpleTimeline(QWidget):
         # Initialize Painter
         self.painter = TimelinePainter(self)
         
-        # Repaint timer
+        # Repaint timer: solo repinta si la capa estática cambió (ediciones del
+        # modelo hechas desde fuera del widget, waveforms que llegan, ...)
         self.repaint_timer = QTimer(self)
-        self.repaint_timer.timeout.connect(self.update)
+        self.repaint_timer.timeout.connect(self._on_repaint_tick)
         self.repaint_timer.start(16)  # 60 FPS
         
         # Animations
@@ -177,10 +182,9 @@ class SimpleTimeline(QWidget):
             track_h = self.model.track_heights[click_track_idx]
             click_track_y = track_y_positions[click_track_idx]
             
-            for clip in self.model.clips:
-                if clip.track_index == click_track_idx:
-                    if self._check_clip_interactions(event, clip, click_track_y, track_h):
-                        return True
+            for clip in self._clips_near_x(click_track_idx, event.x(), self.HANDLE_REACH_PX):
+                if self._check_clip_interactions(event, clip, click_track_y, track_h):
+                    return True
         return False
 
     def _check_clip_interactions(self, event, clip, track_y, track_h):
@@ -309,51 +313,50 @@ class SimpleTimeline(QWidget):
                 break
         
         if hover_track_idx != -1:
-            for clip in self.model.clips:
-                if clip.track_index == hover_track_idx:
-                    clip_x = self.frameToProjectedX(clip.start_frame)
-                    clip_w = self.frameToProjectedX(clip.duration_frames)
-                    # SHARED DIMENSIONS
-                    cut_size = 10.0
-                    header_y = hover_track_y + 1
-                    triangle_size = 5.0
-                    gap = 1.5
-                    
-                    # Check fade handles
-                    if ((clip_x + gap <= event.x() <= clip_x + gap + triangle_size and 
-                         header_y + gap <= event.y() <= header_y + gap + triangle_size) or
-                        (clip_x + clip_w - gap - triangle_size <= event.x() <= clip_x + clip_w - gap and 
-                         header_y + gap <= event.y() <= header_y + gap + triangle_size)):
-                        self.setCursor(Qt.CursorShape.SizeHorCursor)
-                        cursor_set = True
-                        break
+            for clip in self._clips_near_x(hover_track_idx, event.x(), self.HANDLE_REACH_PX):
+                clip_x = self.frameToProjectedX(clip.start_frame)
+                clip_w = self.frameToProjectedX(clip.duration_frames)
+                # SHARED DIMENSIONS
+                cut_size = 10.0
+                header_y = hover_track_y + 1
+                triangle_size = 5.0
+                gap = 1.5
+                
+                # Check fade handles
+                if ((clip_x + gap <= event.x() <= clip_x + gap + triangle_size and 
+                     header_y + gap <= event.y() <= header_y + gap + triangle_size) or
+                    (clip_x + clip_w - gap - triangle_size <= event.x() <= clip_x + clip_w - gap and 
+                     header_y + gap <= event.y() <= header_y + gap + triangle_size)):
+                    self.setCursor(Qt.CursorShape.SizeHorCursor)
+                    cursor_set = True
+                    break
         
-                    # Check edges for Trim
-                    edge_margin = 6
-                    is_near_edge = abs(event.x() - clip_x) <= edge_margin or abs(event.x() - (clip_x + clip_w)) <= edge_margin
-                    
-                    track_h = self.model.track_heights[clip.track_index]
-                    if is_near_edge and (hover_track_y + cut_size <= event.y() <= hover_track_y + track_h):
-                        self.setCursor(Qt.CursorShape.SizeHorCursor)
+                # Check edges for Trim
+                edge_margin = 6
+                is_near_edge = abs(event.x() - clip_x) <= edge_margin or abs(event.x() - (clip_x + clip_w)) <= edge_margin
+                
+                track_h = self.model.track_heights[clip.track_index]
+                if is_near_edge and (hover_track_y + cut_size <= event.y() <= hover_track_y + track_h):
+                    self.setCursor(Qt.CursorShape.SizeHorCursor)
+                    cursor_set = True
+                    break
+                
+                # Check Opacity/Gain Handle (BLUE BAR ONLY)
+                opacity_level = getattr(clip, 'opacity_level', 1.0)
+                clip_h = track_h - 2
+                body_start_y = hover_track_y + 1
+                body_end_y = hover_track_y + 1 + clip_h
+                body_height = body_end_y - body_start_y
+                level_y = body_start_y + (1.0 - opacity_level) * body_height
+                
+                bar_w = min(clip_w * 0.4, 40)
+                center_x = clip_x + clip_w / 2
+                rect_blue_bar = QRectF(center_x - bar_w/2 - 2, level_y - 4, bar_w + 4, 8)
+                
+                if rect_blue_bar.contains(event.position()):
+                        self.setCursor(Qt.CursorShape.PointingHandCursor)
                         cursor_set = True
                         break
-                    
-                    # Check Opacity/Gain Handle (BLUE BAR ONLY)
-                    opacity_level = getattr(clip, 'opacity_level', 1.0)
-                    clip_h = track_h - 2
-                    body_start_y = hover_track_y + 1
-                    body_end_y = hover_track_y + 1 + clip_h
-                    body_height = body_end_y - body_start_y
-                    level_y = body_start_y + (1.0 - opacity_level) * body_height
-                    
-                    bar_w = min(clip_w * 0.4, 40)
-                    center_x = clip_x + clip_w / 2
-                    rect_blue_bar = QRectF(center_x - bar_w/2 - 2, level_y - 4, bar_w + 4, 8)
-                    
-                    if rect_blue_bar.contains(event.position()):
-                            self.setCursor(Qt.CursorShape.PointingHandCursor)
-                            cursor_set = True
-                            break
         
         if not cursor_set:
             self.setCursor(Qt.CursorShape.ArrowCursor)
@@ -457,9 +460,32 @@ class SimpleTimeline(QWidget):
         clip.fade_out_frames = max(0, min(clip.duration_frames, int(dist_frames)))
         self.update()
 
+    def _snap_frame(self, clip, start_frame):
+        """
+        Snaps the start or end of `clip` (placed at start_frame) to the nearest
+        clip edge or the playhead within SNAP_DISTANCE_PX. O(tracks * log n).
+        """
+        if not self.snap_enabled:
+            return start_frame
+        max_dist = self.screenXToFrame(self.SNAP_DISTANCE_PX)
+        playhead = self.model.blueline.playhead_frame
+        best_start, best_dist = None, max_dist
+        for edge_offset in (0, clip.duration_frames):
+            target = start_frame + edge_offset
+            for edge in (self.model.nearest_edge(target, exclude=clip), playhead):
+                if edge is None:
+                    continue
+                dist = abs(edge - target)
+                if dist <= best_dist:
+                    best_start, best_dist = edge - edge_offset, dist
+        if best_start is None:
+            return start_frame
+        return max(0, int(round(best_start)))
+
     def _drag_clip_move(self, event):
         new_x = event.x() - self.drag_offset_x
         new_frame = max(0, int(self.screenXToFrame(new_x)))
+        new_frame = self._snap_frame(self.dragging_clip, new_frame)
         self.dragging_clip.start_frame = new_frame
         
         # Track detection
@@ -506,7 +532,9 @@ class SimpleTimeline(QWidget):
 
     def _handle_auto_crossfade(self, dropped_clip):
         """Check for clip overlaps and apply crossfades."""
-        track_clips = [c for c in self.model.clips if c.track_index == dropped_clip.track_index and c != dropped_clip]
+        track_clips = [c for c in self.model.clips_on_track(dropped_clip.track_index, dropped_clip.start_frame,
+                                                            dropped_clip.start_frame + dropped_clip.duration_frames)
+                       if c is not dropped_clip]
         
         for other in track_clips:
             start_a = dropped_clip.start_frame
@@ -599,12 +627,14 @@ class SimpleTimeline(QWidget):
             current_y += height
         
         app = self.window()
-        if hasattr(app, "import_media"):
-            for url in urls:
-                path = url.toLocalFile()
-                if path:
-                    app.import_media(path, start_frame, track_idx)
-                    start_frame += 150
+        paths = [url.toLocalFile() for url in urls if url.toLocalFile()]
+        if len(paths) > 1 and hasattr(app, "import_media_batch"):
+            # Un solo trabajo de importación y una sola sincronización del motor
+            app.import_media_batch(paths, start_frame, track_idx)
+        elif hasattr(app, "import_media"):
+            for path in paths:
+                app.import_media(path, start_frame, track_idx)
+                start_frame += 150
         self.update()
 
     def _handle_effect_drop(self, event):
@@ -651,14 +681,15 @@ class SimpleTimeline(QWidget):
         if track_idx == -1: return None
         
         TOLERANCE_X = 2
-        for clip in self.model.clips:
-            if clip.track_index == track_idx:
-                clip_x = self.frameToProjectedX(clip.start_frame)
-                clip_w = self.frameToProjectedX(clip.duration_frames)
-                if clip_x - TOLERANCE_X <= x <= clip_x + clip_w + TOLERANCE_X:
-                    return clip
-        
-        return None
+        # O(log n) via el índice de intervalos. Con solapes gana el que empieza
+        # más tarde: es el que el painter dibuja encima.
+        candidates = self._clips_near_x(track_idx, x, TOLERANCE_X)
+        return candidates[-1] if candidates else None
+
+    def _clips_near_x(self, track_idx, x, reach_px):
+        """Clips of a track whose [start, end] lies within reach_px of screen x."""
+        return self.model.clips_on_track(track_idx, self.screenXToFrame(x - reach_px),
+                                         self.screenXToFrame(x + reach_px))
     
     def timeToProjectedX(self, time_seconds):
         return time_seconds * self.pixels_per_second
@@ -672,6 +703,11 @@ class SimpleTimeline(QWidget):
     def screenXToFrame(self, screen_x):
         return (screen_x / self.pixels_per_second) * self.get_fps()
 
+    def visible_frame_range(self):
+        """(first, last) frame visible in the scroll area."""
+        rect = self.painter.visible_rect()
+        return self.screenXToFrame(rect.left()), self.screenXToFrame(rect.right() + 1)
+
     def timeToScreen(self, time_in_seconds):
         """DEPRECATED: Use timeToProjectedX for clarity."""
         return self.timeToProjectedX(time_in_seconds)
@@ -686,12 +722,18 @@ class SimpleTimeline(QWidget):
         self.update_playhead_position(frame, forced=True)
     
     def update_playhead_position(self, frame_index, forced=True):
+        old_rect = self.painter.playhead_rect(self.model.blueline.playhead_frame)
         self.model.blueline.set_playhead_frame(frame_index)
         time_seconds = frame_index / self.get_fps()
         tc = self.model.format_timecode(frame_index, self.get_fps())
         self.time_updated.emit(time_seconds, int(frame_index), tc, forced)
-        self.update()
+        # Dirty rect: franja del playhead anterior + la del nuevo (el resto sale de la caché)
+        self.update(old_rect.united(self.painter.playhead_rect(self.model.blueline.playhead_frame)))
         return self.frameToProjectedX(frame_index)
+
+    def _on_repaint_tick(self):
+        if self.isVisible() and self.painter.static_layer_dirty():
+            self.update()
     
     def get_scroll_area_context(self):
         from PySide6.QtWidgets import QScrollArea
@@ -3,11 +3,12 @@ Timeline Painter - Handles all visual rendering for the SimpleTimeline widget.
 Extracted for optimization and separation of concerns.
 """
 
-from PySide6.QtCore import Qt, QRectF, QPointF, QLineF
-from PySide6.QtGui import QPainter, QColor, QPen, QImage, QPainterPath
+from PySide6.QtCore import Qt, QRect, QRectF, QPointF, QLineF
+from PySide6.QtGui import QPainter, QColor, QPen, QImage, QPainterPath, QPixmap
 import math
 from ..models import FadeType, TrackType, ProxyStatus
 from .. import design_tokens as dt
+from ...infrastructure import filmstrip
 
 class TimelinePainter:
     """
@@ -52,6 +53,19 @@ class TimelinePainter:
         self.img_px = QImage(os.path.join(base_img_path, "px.png"))
         self.img_inf = QImage(os.path.join(base_img_path, "inf.png"))
 
+        # OPTIMIZACIÓN: capa estática (grid + pistas + clips) cacheada en un
+        # QPixmap del área visible. Durante la reproducción solo se vuelve a
+        # pintar el playhead sobre el blit de la caché.
+        self._static_cache = None
+        self._static_key = None
+        self._static_rect = QRect()
+        self._global_proxy_on = False
+
+    def visible_rect(self):
+        """Part of the timeline visible in its scroll area (widget coordinates)."""
+        rect = self.timeline.visibleRegion().boundingRect()
+        return rect if not rect.isEmpty() else self.timeline.rect()
+
     def paint(self, event):
         """Main paint method called from SimpleTimeline.paintEvent."""
         painter = QPainter(self.timeline)
@@ -59,31 +73,102 @@ class TimelinePainter:
         if not painter.isActive():
             return
         
-        # Visible region for culling
-        visible_rect = event.rect()
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
         try:
-            # 1. BACKGROUND
-            painter.fillRect(visible_rect, self.COLOR_BG)
-            
-            # 2. GRID
-            self._draw_grid(painter, visible_rect)
-            
-            # 3. TRACK DIVIDERS
-            self._draw_tracks(painter)
-            
-            # 4. CLIPS (Culling enabled)
-            self._draw_clips(painter, visible_rect)
-            
-            # 5. PLAYHEAD
-            self._draw_playhead(painter)
-            
+            self.render_cached(painter, self.visible_rect())
         except Exception as e:
             print(f"Paint Error: {e}")
         finally:
             painter.end()
 
+    def static_key(self, visible_rect):
+        """
+        Everything the static layer depends on. layout_revision alone is not
+        enough (drags, trims, fades and async waveforms edit clips in place),
+        so the state of the visible clips is part of the key; they come from
+        the interval index, so this stays cheap next to actually drawing.
+        """
+        tl = self.timeline
+        model = self.model
+        clips = tuple(
+            (id(c), c.start_frame, c.duration_frames, c.track_index, c.selected, c.name,
+             c.fade_in_frames, c.fade_in_type, c.fade_out_frames, c.fade_out_type,
+             c.opacity_level, c.proxy_status, c.use_proxy, c.is_fx_active, c.waveform_computing,
+             id(c.waveform), len(c.waveform), id(c.thumbnails), len(c.thumbnails))
+            for c in self._visible_clips(visible_rect, tl._get_track_y_positions()))
+        return (visible_rect.getRect(), tl.width(), tl.height(), tl.devicePixelRatioF(),
+                tl.pixels_per_second, tl.get_fps(), model.layout_revision,
+                tuple(model.track_heights), tuple(model.track_types),
+                self._read_global_proxy(), clips)
+
+    def render_cached(self, painter, visible_rect):
+        """
+        Blits the cached static layer for visible_rect (re-rendering it only if
+        static_key changed) and draws the playhead on top. The painter's clip
+        (the paint event region) limits the blit to the dirty area.
+        """
+        key = self.static_key(visible_rect)
+        if key != self._static_key or self._static_cache is None:
+            dpr = self.timeline.devicePixelRatioF()
+            cache = QPixmap(max(1, int(visible_rect.width() * dpr)), max(1, int(visible_rect.height() * dpr)))
+            cache.setDevicePixelRatio(dpr)
+            cache_painter = QPainter(cache)
+            try:
+                cache_painter.translate(-visible_rect.x(), -visible_rect.y())
+                self.render_static(cache_painter, visible_rect)
+            finally:
+                cache_painter.end()
+            self._static_cache, self._static_key = cache, key
+            self._static_rect = QRect(visible_rect)
+
+        painter.drawPixmap(self._static_rect.topLeft(), self._static_cache)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._draw_playhead(painter)
+
+    def static_layer_dirty(self):
+        """True if the next paint would have to re-render the static layer."""
+        return self._static_cache is None or self.static_key(self.visible_rect()) != self._static_key
+
+    def render(self, painter, visible_rect):
+        """
+        Draws the timeline region `visible_rect` (widget coordinates) with an
+        already active painter, without the cache. Lets benchmarks render into
+        an offscreen QImage.
+        """
+        self._read_global_proxy()
+        self.render_static(painter, visible_rect)
+        self._draw_playhead(painter)
+
+    def render_static(self, painter, visible_rect):
+        """Background, grid, track dividers and clips (everything but the playhead)."""
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # 1. BACKGROUND
+        painter.fillRect(visible_rect, self.COLOR_BG)
+        
+        # 2. GRID
+        self._draw_grid(painter, visible_rect)
+        
+        # 3. TRACK DIVIDERS
+        self._draw_tracks(painter)
+        
+        # 4. CLIPS (Culling enabled)
+        self._draw_clips(painter, visible_rect)
+
+    def _read_global_proxy(self):
+        """Reads the toolbar proxy toggle once per paint (used by the PX buttons)."""
+        self._global_proxy_on = False
+        try:
+            main_window = self.timeline.window()
+            if hasattr(main_window, 'toolbar'):
+                self._global_proxy_on = main_window.toolbar.btn_proxy.isChecked()
+        except: pass
+        return self._global_proxy_on
+
+    def playhead_rect(self, frame):
+        """Widget area covered by the playhead at `frame` (for dirty-rect updates)."""
+        x = self.timeline.frameToProjectedX(frame)
+        return QRect(int(math.floor(x)) - 3, 0, 7, self.timeline.height())
+
     def _draw_grid(self, painter, rect):
         """[VEGAS REDESIGN] Draw vertical grid lines based on adaptive subdivisions."""
         pps = self.timeline.pixels_per_second
@@ -133,6 +218,21 @@ class TimelinePainter:
             if current_y < total_height:
                 painter.drawLine(0, current_y, width, current_y)
 
+    def _visible_clips(self, visible_rect, track_y_positions):
+        """
+        CULLING: only the clips inside the visible time window of the tracks
+        crossing visible_rect, straight from the model's interval index
+        (no projection of off-screen clips). Per track, ordered by start.
+        """
+        first_frame = self.timeline.screenXToFrame(visible_rect.left())
+        last_frame = self.timeline.screenXToFrame(visible_rect.right())
+        index = self.model.index
+        for track_idx, track_y in enumerate(track_y_positions):
+            track_h = self.model.track_heights[track_idx]
+            if track_y + track_h < visible_rect.top() or track_y > visible_rect.bottom():
+                continue
+            yield from index.overlapping(track_idx, first_frame, last_frame)
+
     def _draw_clips(self, painter, visible_rect):
         """[VEGAS REDESIGN] Deterministic clip drawing with floating point precision."""
         
@@ -143,18 +243,11 @@ class TimelinePainter:
         
         track_y_positions = self.timeline._get_track_y_positions()
         
-        for clip in self.model.clips:
-            if clip.track_index >= len(track_y_positions):
-                continue
-            
+        for clip in self._visible_clips(visible_rect, track_y_positions):
             # [VEGAS PRINCIPLE] Precision Projection
             clip_x = self.timeline.frameToProjectedX(clip.start_frame)
             clip_w = self.timeline.frameToProjectedX(clip.duration_frames)
             
-            # CULLING (Precision Check)
-            if clip_x + clip_w < visible_rect.left() or clip_x > visible_rect.right():
-                continue
-            
             track_y = track_y_positions[clip.track_index]
             track_h = self.model.track_heights[clip.track_index]
             clip_h = track_h - 2
@@ -340,12 +433,7 @@ class TimelinePainter:
         
         # 1. Determine State for PX
         p_status = getattr(clip, 'proxy_status', ProxyStatus.NONE)
-        global_proxy_on = False
-        try:
-            main_window = self.timeline.window()
-            if hasattr(main_window, 'toolbar'):
-                global_proxy_on = main_window.toolbar.btn_proxy.isChecked()
-        except: pass
+        global_proxy_on = self._global_proxy_on
 
         px_active = (p_status == ProxyStatus.READY and getattr(clip, 'use_proxy', False) and global_proxy_on)
         
@@ -441,30 +529,27 @@ class TimelinePainter:
                 painter.drawLine(QLineF(px, mid_y_r - line_h_r, px, mid_y_r + line_h_r))
 
     def _draw_thumbnail(self, painter, clip, x, y, w, h, visible_rect):
-        """Draws thumbnails with viewport culling."""
-        if not clip.thumbnails: return
-        
-        thumb_h = h
-        thumb_w = int(thumb_h * 1.77)
-        
-        # Only draw if the thumbnail position overlaps with viewport
-        # Start thumb
-        if x + thumb_w > visible_rect.left() and x < visible_rect.right():
-             self._paint_thumb(painter, clip.thumbnails[0], x, y, thumb_w, thumb_h)
-        
-        # End thumb
-        end_x = x + w - thumb_w
-        if end_x + thumb_w > visible_rect.left() and end_x < visible_rect.right() and w > thumb_w * 2:
-             self._paint_thumb(painter, clip.thumbnails[2], end_x, y, thumb_w, thumb_h)
+        """
+        Filmstrip: one keyframe thumbnail per thumbnail width on screen, so the
+        density follows the zoom. Only the slots in the visible part of the
+        clip are drawn, and their atlases are loaded on first use.
+        """
+        strip = filmstrip.lookup(clip.file_path)
+        if strip is None or h <= 0: return
 
-    def _paint_thumb(self, painter, thumb_data, x, y, w, h):
-        """Internal helper for pixel data painting."""
-        try:
-            height, width, channel = thumb_data.shape
-            bytes_per_line = 3 * width
-            q_img = QImage(thumb_data.data, width, height, bytes_per_line, QImage.Format_RGB888)
-            painter.drawImage(QRectF(x, y, w, h), q_img)
-        except: pass
+        thumb_w = h * strip.thumb_w / strip.thumb_h
+        pps = self.timeline.pixels_per_second
+        offset_s = clip.source_offset_frames / self.timeline.get_fps()
+
+        left = max(x, visible_rect.left())
+        right = min(x + w, visible_rect.right() + 1)
+        slot_x = x + ((left - x) // thumb_w) * thumb_w
+        while slot_x < right:
+            # Tiempo de fuente del borde izquierdo de la ranura
+            atlas, src = strip.tile(strip.nearest_index(offset_s + (slot_x - x) / pps))
+            if atlas is None: return
+            painter.drawImage(QRectF(slot_x, y, thumb_w, h), atlas, QRectF(src))
+            slot_x += thumb_w
 
     def _draw_playhead(self, painter):
         """Draw playhead using absolute time projection."""
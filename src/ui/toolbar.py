@@ -245,6 +245,7 @@ class RockyToolbar(QFrame):
         self.action_open = btn_archivo.add_action("Abrir")
         self.action_save = btn_archivo.add_action("Guardar")
         self.action_save_as = btn_archivo.add_action("Guardar como...")
+        self.action_export_json = btn_archivo.add_action("Exportar proyecto JSON...")
         layout.addWidget(btn_archivo)
 
         # 2. EDITAR
@@ -262,6 +263,8 @@ class RockyToolbar(QFrame):
         # 3. PROCESAR
         btn_procesar = ToolbarMenuButton("Procesar", self)
         self.action_render = btn_procesar.add_action("Renderizar")
+        self.action_prerender = btn_procesar.add_action("Pre-renderizar selección", shortcut="Shift+R")
+        self.action_trace = btn_procesar.add_action("Grabar traza de rendimiento (5 s)")
         layout.addWidget(btn_procesar)
 
         # 4. VENTANA
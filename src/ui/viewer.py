@@ -1,6 +1,74 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QPushButton, QSlider, QSizePolicy
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QColor, QFont, QPainter, QPen, QImage, QPixmap
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QColor, QFont, QPainter, QPen, QImage
+
+
+class SharedFrame:
+    """
+    One engine frame wrapped once for every viewer: the QImage points at the
+    NumPy buffer (no copy) and this object keeps that buffer alive while any
+    viewer still shows it.
+    """
+    __slots__ = ("buffer", "image")
+
+    def __init__(self, frame_buffer):
+        height, width, channels = frame_buffer.shape
+        self.buffer = frame_buffer
+        self.image = QImage(frame_buffer.data, width, height, channels * width,
+                            QImage.Format.Format_RGBA8888)
+
+
+class FrameView(QWidget):
+    """
+    Rendering surface: paints the current SharedFrame with a single
+    drawImage into the aspect-fit rect. Replaces QLabel.setPixmap, which
+    needed a QPixmap conversion plus a scaled() copy on every frame. The
+    engine already renders at about viewer size (preview scale), so the
+    draw is close to 1:1.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._frame = None
+        self._fast = False
+        # Pintamos cada píxel (imagen + bandas negras): Qt no borra el fondo
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setMinimumSize(1, 1)
+
+    def set_frame(self, frame, fast_mode=False):
+        self._frame = frame
+        self._fast = fast_mode
+        self.update()
+
+    def target_rect(self):
+        """Aspect-fit rect of the current frame, centered in the widget."""
+        if self._frame is None:
+            return QRect()
+        img_w, img_h = self._frame.image.width(), self._frame.image.height()
+        if img_w <= 0 or img_h <= 0:
+            return QRect()
+        scale = min(self.width() / img_w, self.height() / img_h)
+        w, h = max(1, round(img_w * scale)), max(1, round(img_h * scale))
+        return QRect((self.width() - w) // 2, (self.height() - h) // 2, w, h)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        target = self.target_rect()
+        if target.isEmpty():
+            painter.fillRect(self.rect(), Qt.GlobalColor.black)
+            painter.end()
+            return
+        # Solo las bandas: el área de la imagen la cubre drawImage
+        black = Qt.GlobalColor.black
+        painter.fillRect(0, 0, self.width(), target.top(), black)
+        painter.fillRect(0, target.bottom() + 1, self.width(), self.height() - target.bottom() - 1, black)
+        painter.fillRect(0, target.top(), target.left(), target.height(), black)
+        painter.fillRect(target.right() + 1, target.top(), self.width() - target.right() - 1, target.height(), black)
+        if not self._fast:
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawImage(target, self._frame.image)
+        painter.end()
+
 
 class ViewerPanel(QWidget):
     """
@@ -60,14 +128,9 @@ class ViewerPanel(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(0)
         
-        self.display_label = QLabel()
-        self.display_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.display_label.setStyleSheet("background-color: black;")
-        # CRITICAL FIX: Allow the label to expand to fill available space
+        # CRITICAL FIX: The surface expands to fill available space
         # This ensures vertical videos scale properly to fill the viewer
-        self.display_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.display_label.setScaledContents(False)  # We handle scaling manually
-        self.display_label.setMinimumSize(1, 1)  # Allow shrinking
+        self.display_label = FrameView()
         
         layout.addWidget(self.display_label, stretch=1)
         return container
@@ -187,6 +250,11 @@ class ViewerPanel(QWidget):
         row1.addWidget(self.lbl_format)
         row1.addStretch()
         
+        # Nivel de calidad de la preview (lo ajusta el gobernador al reproducir)
+        self.lbl_quality = QLabel("Preview: Completa")
+        self.lbl_quality.setStyleSheet("color: #6272a4; font-family: 'Inter'; font-size: 10px;")
+        row1.addWidget(self.lbl_quality)
+        
         # Performance metadata
         row2 = QHBoxLayout()
         lbl_engine = QLabel("Engine: Rocky Core C++ (Hardware Accelerated)")
@@ -212,9 +280,19 @@ class ViewerPanel(QWidget):
         if hasattr(self, 'lbl_format'):
             self.lbl_format.setText(f"Proyecto: {width}x{height} ({aspect_w}:{aspect_h} - {format_type})")
 
+    def set_playback_quality(self, level_label, using_proxies=False, degraded_playback=False):
+        """Shows the current preview level (e.g. "1/2 · Proxy") next to the project format."""
+        text = f"Preview: {level_label}"
+        if using_proxies:
+            text += " · Proxy"
+        # Ámbar mientras la reproducción va por debajo de calidad completa
+        color = "#ffb86c" if degraded_playback and (level_label != "Completa" or using_proxies) else "#6272a4"
+        self.lbl_quality.setText(text)
+        self.lbl_quality.setStyleSheet(f"color: {color}; font-family: 'Inter'; font-size: 10px;")
+
     def display_frame(self, frame_buffer, fast_mode=False):
         """
-        Efficiently converts project RAW buffers into QPixmap for presentation.
+        Shows a RAW engine buffer (numpy array (Height, Width, 4) RGBA).
         CRITICAL: Vertical videos MUST fill the entire height of the viewer.
         
         :param frame_buffer: A numpy array (Height, Width, 4) in RGBA format.
@@ -222,34 +300,11 @@ class ViewerPanel(QWidget):
         """
         if frame_buffer is None:
             return
-
         try:
-            height, width, channels = frame_buffer.shape
-            bytes_per_line = channels * width
-            
-            # Create QImage directly from buffer memory (No-copy)
-            image = QImage(frame_buffer.data, width, height, bytes_per_line, QImage.Format.Format_RGBA8888)
-            
-            # Conversion stage: QImage -> QPixmap is fast on most platforms
-            pixmap = QPixmap.fromImage(image)
-            
-            label_size = self.display_label.size()
-            if not label_size.isEmpty():
-                # CHOOSE TRANSFORMATION MODE: 
-                # Smooth is for high-quality static viewing.
-                # Fast is for fluid playback.
-                transform_mode = Qt.TransformationMode.FastTransformation if fast_mode else Qt.TransformationMode.SmoothTransformation
-                
-                # CRITICAL FIX: Scale to fill the ENTIRE label size
-                # Qt will maintain aspect ratio and fit it within these bounds
-                scaled_pixmap = pixmap.scaled(
-                    label_size.width(),
-                    label_size.height(),
-                    Qt.AspectRatioMode.KeepAspectRatio, 
-                    transform_mode
-                )
-                
-                self.display_label.setPixmap(scaled_pixmap)
+            self.present(SharedFrame(frame_buffer), fast_mode)
         except Exception as e:
             print(f"Viewer Error: Failed to render frame: {e}")
 
+    def present(self, frame, fast_mode=False):
+        """Shows a SharedFrame (wrapped once by RockyApp for all viewers)."""
+        self.display_label.set_frame(frame, fast_mode)